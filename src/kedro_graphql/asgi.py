@@ -1,10 +1,11 @@
 from fastapi import FastAPI
 from strawberry.fastapi import GraphQLRouter
 
-from .backends import init_backend
+from .backends import CachedBackend, init_async_backend, init_backend
 from .celeryapp import celery_app
 from .config import config
 from .decorators import RESOLVER_PLUGINS, TYPE_PLUGINS, discover_plugins
+from .events import PipelineChangeWatcher
 from .models import PipelineTemplates
 from .schema import build_schema
 
@@ -20,8 +21,8 @@ class KedroGraphQL(FastAPI):
         self.kedro_parameters = self.kedro_context.config_loader["parameters"]
         from kedro.framework.project import pipelines
         self.kedro_pipelines = pipelines
-        self.kedro_pipelines_index = PipelineTemplates._build_pipeline_index(
-            self.kedro_pipelines, self.kedro_catalog, self.kedro_parameters)
+        self._kedro_pipelines_index = None
+        self.refresh_pipelines_index()
 
         self.config = config
 
@@ -31,15 +32,36 @@ class KedroGraphQL(FastAPI):
         discover_plugins(self.config)
         self.schema = build_schema(self.type_plugins)
         self.backend = init_backend(self.config)
+        self.async_backend = init_async_backend(self.config, self.backend)
         self.graphql_app = GraphQLRouter(self.schema)
         self.include_router(self.graphql_app, prefix="/graphql")
         self.add_websocket_route("/graphql", self.graphql_app)
         self.celery_app = celery_app(self.config, self.backend)
+        # the cache invalidations of the workers arrive on another connection,
+        # drop a changed pipeline before waking up the resolvers reading it
+        cache = self.backend.cache if isinstance(self.backend, CachedBackend) else None
+        self.pipeline_watcher = PipelineChangeWatcher(
+            broker_url=self.config["KEDRO_GRAPHQL_BROKER"],
+            on_change=(lambda id: cache.invalidate(id=id, publish=False)) if cache else None)
 
         @self.on_event("startup")
-        def startup_backend():
+        async def startup_backend():
             self.backend.startup()
+            await self.async_backend.startup()
 
         @self.on_event("shutdown")
-        def shutdown_backend():
+        async def shutdown_backend():
+            await self.pipeline_watcher.close()
+            await self.async_backend.shutdown()
             self.backend.shutdown()
+
+    def refresh_pipelines_index(self):
+        """Rebuild the PipelineTemplates of the project e.g. after the pipeline registry changed."""
+        self._kedro_pipelines_index = PipelineTemplates._build_pipeline_index(
+            self.kedro_pipelines, self.kedro_catalog, self.kedro_parameters)
+        return self._kedro_pipelines_index
+
+    @property
+    def kedro_pipelines_index(self):
+        """The PipelineTemplates of the project, built at startup with their metadata computed once."""
+        return self._kedro_pipelines_index
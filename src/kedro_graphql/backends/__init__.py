@@ -1,9 +1,78 @@
+import inspect
+import json
 from importlib import import_module
 
+from .base import AsyncBackendAdapter
+from .cache import AsyncCachedBackend, CachedBackend, PipelineCache
+
+
+def _backend_kwargs(config, backend):
+    """Keyword arguments to create a backend from the config.
+
+    The MongoDB options are only passed to backends accepting them, the
+    KEDRO_GRAPHQL_BACKEND_KWARGS JSON object is passed to any backend and
+    takes precedence e.g. '{"uri": "sqlite:///pipelines.db"}'.
+    """
+    kwargs = {"uri": config.get("MONGO_URI"), "db": config.get("MONGO_DB_NAME")}
+    if config.get("KEDRO_GRAPHQL_MONGO_INDEXES"):
+        kwargs["indexes"] = config["KEDRO_GRAPHQL_MONGO_INDEXES"]
+    if config.get("KEDRO_GRAPHQL_ARCHIVE_AFTER_DAYS"):
+        kwargs["archive_after_days"] = float(config["KEDRO_GRAPHQL_ARCHIVE_AFTER_DAYS"])
+    parameters = inspect.signature(backend).parameters
+    if not any(p.kind == p.VAR_KEYWORD for p in parameters.values()):
+        kwargs = {k: v for k, v in kwargs.items() if k in parameters}
+    if config.get("KEDRO_GRAPHQL_BACKEND_KWARGS"):
+        kwargs.update(json.loads(config["KEDRO_GRAPHQL_BACKEND_KWARGS"]))
+    return kwargs
+
+
+def _cache(config):
+    """The PipelineCache configured with KEDRO_GRAPHQL_BACKEND_CACHE, or None.
+
+    The option is a JSON object of PipelineCache keyword arguments e.g.
+    '{"maxsize": 1024, "ttl": 5}', or "true" for the defaults.
+    """
+    options = json.loads(config.get("KEDRO_GRAPHQL_BACKEND_CACHE") or "null")
+    if not options:
+        return None
+    return PipelineCache(broker_url=config.get("KEDRO_GRAPHQL_BROKER"),
+                         **(options if isinstance(options, dict) else {}))
+
 
 def init_backend(config):
     backend_module, backend_class = config["KEDRO_GRAPHQL_BACKEND"].rsplit(".", 1)
-    backend_kwargs = {"uri": config.get("MONGO_URI"), "db": config.get("MONGO_DB_NAME")}
     backend_module = import_module(backend_module)
     backend = getattr(backend_module, backend_class)
-    return backend(**backend_kwargs)
+    backend = backend(**_backend_kwargs(config, backend))
+    cache = _cache(config)
+    return CachedBackend(backend, cache) if cache else backend
+
+
+# native async counterparts of synchronous backends, used when
+# KEDRO_GRAPHQL_ASYNC_BACKEND is not set
+ASYNC_BACKENDS = {
+    "kedro_graphql.backends.mongodb.MongoBackend": "kedro_graphql.backends.mongodb.AsyncMongoBackend",
+}
+
+
+def init_async_backend(config, backend=None):
+    """Create the backend awaited by the GraphQL resolvers.
+
+    If KEDRO_GRAPHQL_ASYNC_BACKEND is not set, it is derived from
+    KEDRO_GRAPHQL_BACKEND so the resolvers use the same store as the workers:
+    the native async counterpart of the backend in ASYNC_BACKENDS if there is
+    one, otherwise the synchronous backend wrapped in an AsyncBackendAdapter
+    that runs each call in a worker thread.  If the synchronous backend is a
+    CachedBackend, the async backend shares its cache.
+    """
+    async_backend_path = (config.get("KEDRO_GRAPHQL_ASYNC_BACKEND")
+                          or ASYNC_BACKENDS.get(config.get("KEDRO_GRAPHQL_BACKEND")))
+    if not async_backend_path:
+        return AsyncBackendAdapter(backend=backend or init_backend(config))
+
+    backend_module, backend_class = async_backend_path.rsplit(".", 1)
+    backend_module = import_module(backend_module)
+    async_backend = getattr(backend_module, backend_class)
+    async_backend = async_backend(**_backend_kwargs(config, async_backend))
+    cache = backend.cache if isinstance(backend, CachedBackend) else _cache(config)
+    return AsyncCachedBackend(async_backend, cache) if cache else async_backend
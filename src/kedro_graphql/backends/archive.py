@@ -0,0 +1,86 @@
+import heapq
+from datetime import datetime, timedelta
+
+from celery.states import READY_STATES
+
+ARCHIVE_PREFIX = "pipelines_archive_"
+
+
+def archive_partition(created_at):
+    """
+    Name of the monthly archive partition of a pipeline.
+
+    Args:
+        created_at (str | datetime): creation time of the pipeline.
+
+    Returns:
+        str: e.g. "pipelines_archive_2025_03"
+    """
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+    return ARCHIVE_PREFIX + created_at[:7].replace("-", "_")
+
+
+def archive_cutoff(older_than_days):
+    """Creation time, in the stored isoformat, before which runs are archived."""
+    return (datetime.now() - timedelta(days=float(older_than_days))).isoformat()
+
+
+def is_terminal(doc):
+    """True if the latest status of a stored pipeline is a celery READY_STATE."""
+    status = doc.get("status") or []
+    return bool(status) and status[-1].get("state") in READY_STATES
+
+
+class _SortValue:
+    """Orders values like MongoDB does for a single sort key, null first."""
+
+    __slots__ = ("value", "direction")
+
+    def __init__(self, value, direction):
+        self.value = value
+        self.direction = direction
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+    def __lt__(self, other):
+        if self.value == other.value:
+            return False
+        if self.value is None:
+            lt = True
+        elif other.value is None:
+            lt = False
+        else:
+            lt = self.value < other.value
+        return lt if self.direction == 1 else not lt
+
+
+def _value(doc, key):
+    for part in key.split("."):
+        doc = doc.get(part) if isinstance(doc, dict) else None
+    return doc
+
+
+def merge_sorted(pages, sort, limit):
+    """
+    Merge pages of raw documents, each already sorted by sort, into one page.
+
+    Used to list the hot collection and the archive partitions as if they
+    were a single collection.
+
+    Args:
+        pages (list): lists of raw documents.
+        sort (list): parsed sort e.g. [('created_at', -1), ('_id', -1)]
+        limit (int): maximum number of documents to return.
+
+    Returns:
+        list: the first limit documents in sort order.
+    """
+    def key(doc):
+        return tuple(_SortValue(_value(doc, k), d) for k, d in sort)
+
+    merged = heapq.merge(*pages, key=key)
+    if limit is None:
+        return list(merged)
+    return [doc for _, doc in zip(range(limit), merged)]
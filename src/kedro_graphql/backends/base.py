@@ -1,7 +1,54 @@
 import abc
+import asyncio
+import functools
 import uuid
+from typing import List, Union
 
-from kedro_graphql.models import Pipeline
+from kedro_graphql.models import Pipeline, PipelineFilterInput, PipelineLineageEntry, PipelineStatus
+
+# Children listed per pipeline by the default BaseBackend.lineage
+LINEAGE_CHILDREN_LIMIT = 10000
+
+
+def group_children(parents: List[str], children: List[Pipeline], limit: int = None):
+    """Group pipelines listed for several parents by parent, in the order of parents.
+
+    Args:
+        parents (List[str]): ids of the parent pipelines.
+        children (List[Pipeline]): their children, ordered by id.
+        limit (int): maximum number of children kept per parent, all of them if None.
+
+    Returns:
+        List[List[Pipeline]]: the children of each parent.
+    """
+    grouped = {str(p): [] for p in parents}
+    for c in children:
+        group = grouped.get(str(c.parent))
+        if group is not None and (limit is None or len(group) < limit):
+            group.append(c)
+    return [grouped[str(p)] for p in parents]
+
+
+def status_position(index: int, size: int, id=None) -> int:
+    """Position of the PipelineStatus at index, negative from the end, of a pipeline with size statuses.
+
+    Raises:
+        ValueError: the pipeline has no status at index.
+    """
+    position = index if index >= 0 else size + index
+    if not 0 <= position < size:
+        raise ValueError(f"Pipeline {id} has no status at index {index}")
+    return position
+
+
+class PipelineConflictError(Exception):
+    """Raised when a write is based on a version of a pipeline that is no longer current."""
+
+    def __init__(self, id=None, version=None):
+        self.id = id
+        self.version = version
+        self.message = f"Pipeline {id} was modified since version {version}, read it again and retry"
+        super().__init__(self.message)
 
 
 class BaseBackend(metaclass=abc.ABCMeta):
@@ -17,13 +64,24 @@ class BaseBackend(metaclass=abc.ABCMeta):
         raise NotImplementedError
 
     @abc.abstractmethod
-    def read(self, id: uuid.UUID = None, task_id: str = None):
-        """Load a pipeline by id"""
+    def read(self, id: uuid.UUID = None, task_id: str = None, projection: dict = None, archived: bool = False):
+        """Load a pipeline by id, optionally only the fields in projection
+
+        If archived is True and the pipeline is not found, the archive is searched too.
+        """
         raise NotImplementedError
 
     @abc.abstractmethod
-    def list(self, cursor: uuid.UUID = None, limit: int = None, filter: str = None, sort: str = None):
-        """List pipelines using cursor pagination"""
+    def list(self, cursor: Union[uuid.UUID, dict] = None, limit: int = None,
+             filter: Union[str, PipelineFilterInput] = None, sort: str = None,
+             projection: dict = None, archived: bool = False):
+        """List pipelines using cursor pagination, optionally only the fields in projection
+
+        The cursor is either the values of the sort keys of the last pipeline of
+        the previous page, see kedro_graphql.backends.pagination, or a pipeline id.
+        The filter is either a PipelineFilterInput or a backend specific query string.
+        If archived is True archived pipelines are listed too.
+        """
         raise NotImplementedError
 
     @abc.abstractmethod
@@ -33,10 +91,389 @@ class BaseBackend(metaclass=abc.ABCMeta):
 
     @abc.abstractmethod
     def update(self, pipeline: Pipeline):
-        """Update a pipeline"""
+        """Update a pipeline if it was not modified since it was read
+
+        The write only succeeds if the stored version equals pipeline.version,
+        the stored version is then incremented.
+
+        Raises:
+            PipelineConflictError: the pipeline was modified since pipeline.version.
+        """
         raise NotImplementedError
 
     @abc.abstractmethod
     def delete(self, id: uuid.UUID = None):
         """Delete a pipeline"""
         raise NotImplementedError
+
+    def create_many(self, pipelines: List[Pipeline]):
+        """Save pipelines
+
+        This default implementation calls create for each pipeline, backends
+        should override it with a single bulk write.
+
+        Returns:
+            List[Pipeline]: the saved pipelines in input order.
+        """
+        return [self.create(p) for p in pipelines]
+
+    def read_many(self, ids: List[uuid.UUID], projection: dict = None):
+        """Load pipelines by id, optionally only the fields in projection
+
+        Returns:
+            List[Optional[Pipeline]]: the pipelines in input order, None for ids that do not exist.
+        """
+        return [self.read(id=id, projection=projection) for id in ids]
+
+    def update_many(self, pipelines: List[Pipeline]):
+        """Update pipelines that were not modified since they were read, see update
+
+        Pipelines that were not modified are updated even if others were.
+
+        Returns:
+            List[Optional[Pipeline]]: the updated pipelines in input order, None for pipelines that do not exist.
+
+        Raises:
+            PipelineConflictError: for the first pipeline that was modified since it was read.
+        """
+        results = []
+        conflict = None
+        for p in pipelines:
+            try:
+                results.append(self.update(p))
+            except PipelineConflictError as e:
+                conflict = conflict or e
+                results.append(None)
+        if conflict:
+            raise conflict
+        return results
+
+    def delete_many(self, ids: List[uuid.UUID]):
+        """Delete pipelines
+
+        Returns:
+            List[uuid.UUID]: the ids.
+        """
+        return [self.delete(id=id) for id in ids]
+
+    def count(self, filter: Union[str, PipelineFilterInput] = None, archived: bool = False):
+        """Count the pipelines matching a filter"""
+        raise NotImplementedError
+
+    def replace(self, pipeline: Pipeline):
+        """Insert or replace a pipeline keeping its id and version
+
+        Used to mirror pipelines written to another backend, see RedisBackend.
+        """
+        raise NotImplementedError
+
+    def explain(self, cursor: Union[uuid.UUID, dict] = None, limit: int = None,
+                filter: Union[str, PipelineFilterInput] = None, sort: str = None):
+        """Explain how the backend executes the list call with the same arguments
+
+        Returns:
+            PipelinesQueryPlan: the indexes used and the documents examined versus returned.
+        """
+        raise NotImplementedError
+
+    def archive(self, older_than_days: float = None):
+        """Move pipelines in a terminal state created more than older_than_days ago
+        out of the working set into the archive
+
+        Archived pipelines are only returned by read, list and count when
+        called with archived=True.
+
+        Returns:
+            int: number of pipelines archived.
+        """
+        raise NotImplementedError
+
+    def aggregate(self, filter: Union[str, PipelineFilterInput] = None, group_by: List[str] = None):
+        """Compute run statistics of the pipelines matching a filter
+
+        Args:
+            filter (Union[str, PipelineFilterInput]): filter in the same format as BaseBackend.list.
+            group_by (List[str]): any of "name", "state", "tag" and "day".
+
+        Returns:
+            List[PipelineStats]: statistics of each group.
+        """
+        raise NotImplementedError
+
+    def lineage(self, id: uuid.UUID = None, direction: str = "ancestors", max_depth: int = None,
+                projection: dict = None):
+        """Follow the parent links of a pipeline
+
+        This default implementation reads one level of the lineage per call,
+        backends should override it with a single recursive query.
+
+        Args:
+            id (uuid.UUID): id of the pipeline the lineage starts from.
+            direction (str): "ancestors" for its parent, the parent of its parent and so on,
+                "descendants" for its children, their children and so on.
+            max_depth (int): number of parent links to follow, all of them if None.
+            projection (dict): fields of the pipelines to load, see read.
+
+        Returns:
+            List[PipelineLineageEntry]: the pipelines ordered by depth and id.
+        """
+        if direction not in ("ancestors", "descendants"):
+            raise ValueError(f"direction must be 'ancestors' or 'descendants', not {direction}")
+        projection = {**projection, "parent": 1} if projection else None
+        start = self.read(id=id, projection={"name": 1, "parent": 1})
+        frontier = [start] if start is not None else []
+        seen = {str(id)}
+        entries = []
+        depth = 0
+        while frontier and (max_depth is None or depth < max_depth):
+            depth += 1
+            if direction == "ancestors":
+                level = self.read_many([str(p.parent) for p in frontier if p.parent is not None], projection=projection)
+            else:
+                level = [c for children in self.list_children([str(p.id) for p in frontier],
+                                                              limit=LINEAGE_CHILDREN_LIMIT, projection=projection)
+                         for c in children]
+            # a pipeline seen at a lower depth ends a cycle of parent links
+            frontier = sorted((p for p in level if p is not None and str(p.id) not in seen), key=lambda p: str(p.id))
+            seen.update(str(p.id) for p in frontier)
+            entries.extend(PipelineLineageEntry(depth=depth, pipeline=p) for p in frontier)
+        return entries
+
+    def list_children(self, parents: List[str], limit: int = None, projection: dict = None):
+        """List the children of several pipelines
+
+        This default implementation lists the children of each parent with
+        one call, backends should override it with a single query.
+
+        Args:
+            parents (List[str]): ids of the parent pipelines.
+            limit (int): maximum number of children of each parent, all of them if None.
+            projection (dict): fields of the pipelines to load, see read.
+
+        Returns:
+            List[List[Pipeline]]: the children of each parent ordered by id, in input order.
+        """
+        return [self.list(limit=limit or LINEAGE_CHILDREN_LIMIT, filter=PipelineFilterInput(parent=str(p)),
+                          sort="[('_id', 1)]", projection=projection) for p in parents]
+
+    def update_status(self, id: uuid.UUID = None, fields: dict = None, index: int = -1,
+                      return_pipeline: bool = False, version: int = None):
+        """Update fields of a single PipelineStatus of a pipeline.
+
+        This default implementation reads and rewrites the whole pipeline,
+        backends should override it with an atomic partial update.
+
+        Args:
+            id (uuid.UUID): id of the pipeline.
+            fields (dict): PipelineStatus field names and their new values e.g. {"state": State.STARTED}.
+            index (int): position of the status in Pipeline.status, defaults to the latest attempt.
+            return_pipeline (bool): read back and return the updated pipeline.
+            version (int): only update the pipeline if it is at this version.
+
+        Returns:
+            Optional[Pipeline]: the updated pipeline if return_pipeline is True.
+
+        Raises:
+            PipelineConflictError: version is set and the pipeline was modified since.
+            ValueError: the pipeline has no status at index.
+        """
+        p = self.read(id=id)
+        if version is not None and p.version != version:
+            raise PipelineConflictError(id=id, version=version)
+        status = p.status[status_position(index, len(p.status or []), id)]
+        for k, v in (fields or {}).items():
+            setattr(status, k, v)
+        p = self.update(p)
+        return p if return_pipeline else None
+
+    def append_status(self, id: uuid.UUID = None, status: PipelineStatus = None,
+                      return_pipeline: bool = False, version: int = None):
+        """Append a PipelineStatus for a new run attempt of a pipeline.
+
+        Args:
+            id (uuid.UUID): id of the pipeline.
+            status (PipelineStatus): status of the new attempt.
+            return_pipeline (bool): read back and return the updated pipeline.
+            version (int): only update the pipeline if it is at this version.
+
+        Returns:
+            Optional[Pipeline]: the updated pipeline if return_pipeline is True.
+
+        Raises:
+            PipelineConflictError: version is set and the pipeline was modified since.
+        """
+        p = self.read(id=id)
+        if version is not None and p.version != version:
+            raise PipelineConflictError(id=id, version=version)
+        p.status.append(status)
+        p = self.update(p)
+        return p if return_pipeline else None
+
+
+class AsyncBaseBackend(metaclass=abc.ABCMeta):
+    """Async sibling of BaseBackend used by the GraphQL resolvers so that
+    database calls never block the event loop.
+    """
+
+    @abc.abstractmethod
+    async def startup(self, **kwargs):
+        """Startup hook."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def shutdown(self, **kwargs):
+        """Shutdown hook."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def read(self, id: uuid.UUID = None, task_id: str = None, projection: dict = None, archived: bool = False):
+        """Load a pipeline by id, optionally only the fields in projection
+
+        If archived is True and the pipeline is not found, the archive is searched too.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def list(self, cursor: Union[uuid.UUID, dict] = None, limit: int = None,
+                   filter: Union[str, PipelineFilterInput] = None, sort: str = None,
+                   projection: dict = None, archived: bool = False):
+        """List pipelines using cursor pagination, optionally only the fields in projection
+
+        The cursor is either the values of the sort keys of the last pipeline of
+        the previous page, see kedro_graphql.backends.pagination, or a pipeline id.
+        The filter is either a PipelineFilterInput or a backend specific query string.
+        If archived is True archived pipelines are listed too.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def create(self, pipeline: Pipeline):
+        """Save a pipeline"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def update(self, pipeline: Pipeline):
+        """Update a pipeline if it was not modified since it was read
+
+        The write only succeeds if the stored version equals pipeline.version,
+        the stored version is then incremented.
+
+        Raises:
+            PipelineConflictError: the pipeline was modified since pipeline.version.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def delete(self, id: uuid.UUID = None):
+        """Delete a pipeline"""
+        raise NotImplementedError
+
+    async def create_many(self, pipelines: List[Pipeline]):
+        """Save pipelines, see BaseBackend.create_many"""
+        return [await self.create(p) for p in pipelines]
+
+    async def read_many(self, ids: List[uuid.UUID], projection: dict = None):
+        """Load pipelines by id, see BaseBackend.read_many"""
+        return [await self.read(id=id, projection=projection) for id in ids]
+
+    async def update_many(self, pipelines: List[Pipeline]):
+        """Update pipelines, see BaseBackend.update_many"""
+        results = []
+        conflict = None
+        for p in pipelines:
+            try:
+                results.append(await self.update(p))
+            except PipelineConflictError as e:
+                conflict = conflict or e
+                results.append(None)
+        if conflict:
+            raise conflict
+        return results
+
+    async def delete_many(self, ids: List[uuid.UUID]):
+        """Delete pipelines, see BaseBackend.delete_many"""
+        return [await self.delete(id=id) for id in ids]
+
+    async def list_children(self, parents: List[str], limit: int = None, projection: dict = None):
+        """List the children of several pipelines, see BaseBackend.list_children"""
+        return [await self.list(limit=limit or LINEAGE_CHILDREN_LIMIT, filter=PipelineFilterInput(parent=str(p)),
+                                sort="[('_id', 1)]", projection=projection) for p in parents]
+
+
+class AsyncBackendAdapter(AsyncBaseBackend):
+    """Exposes a synchronous BaseBackend through the AsyncBaseBackend interface
+    by running each call in a worker thread.
+
+    Any other public method of the wrapped backend is also made awaitable, so
+    backend specific extensions remain reachable from async code.
+
+    Example usage:
+
+        backend = AsyncBackendAdapter(MongoBackend(uri=..., db=...))
+        p = await backend.read(id=id)
+    """
+
+    def __init__(self, backend: BaseBackend = None):
+        self.backend = backend
+
+    async def _run(self, method, *args, **kwargs):
+        return await asyncio.to_thread(method, *args, **kwargs)
+
+    def __getattr__(self, name):
+        attr = getattr(self.backend, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def wrapper(*args, **kwargs):
+            return await self._run(attr, *args, **kwargs)
+
+        return wrapper
+
+    async def startup(self, **kwargs):
+        """Startup hook."""
+        return await self._run(self.backend.startup, **kwargs)
+
+    async def shutdown(self, **kwargs):
+        """Shutdown hook."""
+        return await self._run(self.backend.shutdown, **kwargs)
+
+    async def read(self, *args, **kwargs):
+        """Load a pipeline by id"""
+        return await self._run(self.backend.read, *args, **kwargs)
+
+    async def list(self, *args, **kwargs):
+        """List pipelines using cursor pagination"""
+        return await self._run(self.backend.list, *args, **kwargs)
+
+    async def create(self, *args, **kwargs):
+        """Save a pipeline"""
+        return await self._run(self.backend.create, *args, **kwargs)
+
+    async def update(self, *args, **kwargs):
+        """Update a pipeline"""
+        return await self._run(self.backend.update, *args, **kwargs)
+
+    async def delete(self, *args, **kwargs):
+        """Delete a pipeline"""
+        return await self._run(self.backend.delete, *args, **kwargs)
+
+    async def create_many(self, *args, **kwargs):
+        """Save pipelines"""
+        return await self._run(self.backend.create_many, *args, **kwargs)
+
+    async def read_many(self, *args, **kwargs):
+        """Load pipelines by id"""
+        return await self._run(self.backend.read_many, *args, **kwargs)
+
+    async def update_many(self, *args, **kwargs):
+        """Update pipelines"""
+        return await self._run(self.backend.update_many, *args, **kwargs)
+
+    async def delete_many(self, *args, **kwargs):
+        """Delete pipelines"""
+        return await self._run(self.backend.delete_many, *args, **kwargs)
+
+    async def list_children(self, *args, **kwargs):
+        """List the children of several pipelines"""
+        return await self._run(self.backend.list_children, *args, **kwargs)
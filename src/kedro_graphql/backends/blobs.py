@@ -0,0 +1,68 @@
+import hashlib
+import zlib
+
+# PipelineStatus fields holding task diagnostics, e.g. task_kwargs embeds the
+# data catalog and parameters of the run and task_einfo a full traceback.
+BLOB_FIELDS = ("task_args", "task_kwargs", "task_request", "task_exception",
+               "task_traceback", "task_einfo", "task_result")
+
+# Values of BLOB_FIELDS of at least this many characters are stored out of line.
+BLOB_THRESHOLD = 1024
+
+
+def split_blobs(status, threshold=BLOB_THRESHOLD):
+    """
+    Move the large diagnostic fields of an encoded PipelineStatus, or of the
+    fields of a status update, into compressed blobs and reference them by id
+    instead e.g. {"task_kwargs": {"blob": "9f86d0..."}}.
+
+    The id is a hash of the value, so identical values e.g. the task_kwargs
+    of a retry are only stored once.
+
+    Args:
+        status (dict): an encoded PipelineStatus, modified in place.
+        threshold (int): minimum length of a value stored out of line.
+
+    Returns:
+        list: the blob documents, {"_id": ..., "data": <zlib compressed value>, "size": ...}.
+    """
+    blobs = []
+    for field in BLOB_FIELDS:
+        value = status.get(field)
+        if isinstance(value, str) and len(value) >= threshold:
+            data = value.encode()
+            id = hashlib.sha256(data).hexdigest()
+            blobs.append({"_id": id, "data": zlib.compress(data), "size": len(data)})
+            status[field] = {"blob": id}
+    return blobs
+
+
+def _is_ref(value):
+    return isinstance(value, dict) and "blob" in value
+
+
+def blob_refs(raws):
+    """Ids of the blobs referenced by the status entries of raw pipelines."""
+    return {v["blob"] for r in raws if r for s in r.get("status") or [] if isinstance(s, dict)
+            for v in s.values() if _is_ref(v)}
+
+
+def decode_blob(blob):
+    return zlib.decompress(blob["data"]).decode()
+
+
+def join_blobs(raws, values):
+    """
+    Replace the blob references of raw pipelines with their values.
+
+    Args:
+        raws (list): raw pipelines, modified in place.
+        values (dict): the decoded values by blob id, a missing blob decodes to None.
+    """
+    for r in raws:
+        for s in (r or {}).get("status") or []:
+            if isinstance(s, dict):
+                for k, v in s.items():
+                    if _is_ref(v):
+                        s[k] = values.get(v["blob"])
+    return raws
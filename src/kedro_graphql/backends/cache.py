@@ -0,0 +1,442 @@
+import copy
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import redis
+
+from kedro_graphql.logs.logger import logger
+from kedro_graphql.models import Pipeline
+
+from .base import AsyncBaseBackend, BaseBackend
+
+CACHE_CHANNEL = "kedro_graphql:cache:invalidate"
+
+
+def _cacheable(projection):
+    """A cached pipeline answers reads without a projection or with an inclusion projection."""
+    return not projection or not any(isinstance(v, dict) for v in projection.values())
+
+
+class PipelineCache:
+    """Bounded LRU cache of pipelines keyed by id, and by task_id, with a TTL.
+
+    Invalidations are published on a Redis channel so that the caches of
+    every API process and worker sharing the broker drop a pipeline as soon
+    as one of them writes it.  The TTL bounds staleness if a message is lost.
+
+    Example usage:
+
+        cache = PipelineCache(maxsize=1024, ttl=5.0, broker_url="redis://localhost")
+        backend = CachedBackend(MongoBackend(uri=..., db=...), cache)
+    """
+
+    def __init__(self, maxsize=1024, ttl=5.0, broker_url=None):
+        """
+        Kwargs:
+            maxsize (int): maximum number of cached pipelines.
+            ttl (float): seconds a cached pipeline is served for.
+            broker_url (str): URI of the redis broker e.g. "redis://localhost",
+                invalidations are only local if it is not set.
+        """
+        self.maxsize = int(maxsize)
+        self.ttl = float(ttl)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._task_ids = {}
+        # incremented on every invalidation, a read that started before an
+        # invalidation must not cache what it read
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._origin = uuid.uuid4().hex
+        self._connection = redis.Redis.from_url(broker_url) if broker_url else None
+        self._listener = None
+        self._listener_pid = None
+
+    def start(self):
+        """
+        Subscribe to the invalidations published by other processes.
+
+        A process forked after the subscription, e.g. a celery worker child,
+        does not inherit the listener thread and subscribes again.
+        """
+        if self._connection is None or self._listener_pid == os.getpid():
+            return
+        try:
+            pubsub = self._connection.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{CACHE_CHANNEL: self._on_message})
+            self._listener = pubsub.run_in_thread(sleep_time=0.5, daemon=True)
+            self._listener_pid = os.getpid()
+        except redis.RedisError as e:
+            logger.warning(f"Could not subscribe to cache invalidations, entries expire after {self.ttl}s: {e}")
+
+    def stop(self):
+        if self._listener is not None:
+            # the thread closes its subscription once it notices it was stopped
+            self._listener.stop()
+            self._listener.join(timeout=1.0)
+            self._listener = None
+            self._listener_pid = None
+        if self._connection is not None:
+            self._connection.close()
+
+    def _on_message(self, message):
+        data = json.loads(message["data"])
+        if data["origin"] != self._origin:
+            self.invalidate(id=data["id"], publish=False)
+
+    @property
+    def generation(self):
+        return self._generation
+
+    def get(self, id=None, task_id=None):
+        """Return a copy of a cached pipeline, or None."""
+        with self._lock:
+            key = str(id) if id else self._task_ids.get(task_id)
+            entry = self._entries.get(key) if key else None
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            pipeline = entry[1]
+        return copy.deepcopy(pipeline)
+
+    def put(self, pipeline: Pipeline, generation=None):
+        """
+        Cache a copy of a pipeline.
+
+        Kwargs:
+            generation (int): the generation when the read of the pipeline
+                started, it is not cached if an invalidation happened since.
+        """
+        if pipeline is None or self.maxsize <= 0:
+            return
+        pipeline = copy.deepcopy(pipeline)
+        key = str(pipeline.id)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl, pipeline)
+            for s in pipeline.status or []:
+                if s.task_id:
+                    self._task_ids[s.task_id] = key
+            while len(self._entries) > self.maxsize:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            for s in entry[1].status or []:
+                if self._task_ids.get(s.task_id) == key:
+                    del self._task_ids[s.task_id]
+
+    def invalidate(self, id=None, publish=True):
+        """
+        Drop a pipeline, or every pipeline if id is None, from this cache and,
+        if publish is True, from the caches of the other processes.
+        """
+        with self._lock:
+            self._generation += 1
+            self.invalidations += 1
+            if id is None:
+                self._entries.clear()
+                self._task_ids.clear()
+            else:
+                self._drop(str(id))
+        if publish and self._connection is not None:
+            try:
+                self._connection.publish(CACHE_CHANNEL, json.dumps({"id": str(id) if id is not None else None,
+                                                                    "origin": self._origin}))
+            except redis.RedisError as e:
+                logger.warning(f"Could not publish cache invalidation of pipeline {id}: {e}")
+
+    def stats(self):
+        """Counters of the cache e.g. {"hits": 10, "misses": 2, "invalidations": 1, "size": 2}"""
+        return {"hits": self.hits, "misses": self.misses, "invalidations": self.invalidations,
+                "size": len(self._entries)}
+
+
+class CachedBackend(BaseBackend):
+    """Read-through cache in front of a BaseBackend.
+
+    Reads by id or task_id are served from a PipelineCache, every write
+    through this backend invalidates the pipeline it changed.  Any other
+    method of the wrapped backend is reachable unchanged.
+    """
+
+    def __init__(self, backend: BaseBackend = None, cache: PipelineCache = None):
+        self.backend = backend
+        self.cache = cache or PipelineCache()
+
+    def __getattr__(self, name):
+        return getattr(self.backend, name)
+
+    def startup(self, **kwargs):
+        """Startup hook."""
+        self.cache.start()
+        return self.backend.startup(**kwargs)
+
+    def shutdown(self, **kwargs):
+        """Shutdown hook."""
+        self.cache.stop()
+        return self.backend.shutdown(**kwargs)
+
+    def cache_stats(self):
+        """Hit, miss and invalidation counters of the cache"""
+        return self.cache.stats()
+
+    def read(self, id=None, task_id=None, projection=None, archived=False):
+        """Load a pipeline from the cache, or the whole pipeline from the backend on a miss"""
+        if not _cacheable(projection):
+            return self.backend.read(id=id, task_id=task_id, projection=projection, archived=archived)
+        p = self.cache.get(id=id, task_id=task_id)
+        if p is None:
+            generation = self.cache.generation
+            # the whole pipeline answers later reads with any inclusion projection
+            p = self.backend.read(id=id, task_id=task_id, archived=archived)
+            if not archived:
+                self.cache.put(p, generation=generation)
+        return p
+
+    def list(self, *args, **kwargs):
+        """List pipelines, always from the backend"""
+        return self.backend.list(*args, **kwargs)
+
+    def list_children(self, *args, **kwargs):
+        """List the children of pipelines, always from the backend"""
+        return self.backend.list_children(*args, **kwargs)
+
+    def create(self, pipeline):
+        """Save a pipeline"""
+        return self.backend.create(pipeline)
+
+    def update(self, pipeline):
+        """Update a pipeline and invalidate it"""
+        try:
+            return self.backend.update(pipeline)
+        finally:
+            self.cache.invalidate(id=pipeline.id)
+
+    def update_status(self, id=None, *args, **kwargs):
+        """Update a PipelineStatus and invalidate the pipeline"""
+        try:
+            return self.backend.update_status(id, *args, **kwargs)
+        finally:
+            self.cache.invalidate(id=id)
+
+    def append_status(self, id=None, *args, **kwargs):
+        """Append a PipelineStatus and invalidate the pipeline"""
+        try:
+            return self.backend.append_status(id, *args, **kwargs)
+        finally:
+            self.cache.invalidate(id=id)
+
+    def replace(self, pipeline):
+        """Replace a pipeline and invalidate it"""
+        try:
+            return self.backend.replace(pipeline)
+        finally:
+            self.cache.invalidate(id=pipeline.id)
+
+    def delete(self, id=None):
+        """Delete a pipeline and invalidate it"""
+        try:
+            return self.backend.delete(id=id)
+        finally:
+            self.cache.invalidate(id=id)
+
+    def read_many(self, ids, projection=None):
+        """Load pipelines from the cache, and the whole misses from the backend in one call"""
+        cached = [self.cache.get(id=id) if _cacheable(projection) else None for id in ids]
+        missing = [id for id, p in zip(ids, cached) if p is None]
+        if missing:
+            generation = self.cache.generation
+            if _cacheable(projection):
+                loaded = self.backend.read_many(missing)
+                for p in loaded:
+                    self.cache.put(p, generation=generation)
+            else:
+                loaded = self.backend.read_many(missing, projection=projection)
+            loaded = iter(loaded)
+            cached = [p if p is not None else next(loaded) for p in cached]
+        return cached
+
+    def create_many(self, pipelines):
+        """Save pipelines"""
+        return self.backend.create_many(pipelines)
+
+    def update_many(self, pipelines):
+        """Update pipelines and invalidate them"""
+        try:
+            return self.backend.update_many(pipelines)
+        finally:
+            for p in pipelines:
+                self.cache.invalidate(id=p.id)
+
+    def delete_many(self, ids):
+        """Delete pipelines and invalidate them"""
+        try:
+            return self.backend.delete_many(ids)
+        finally:
+            for id in ids:
+                self.cache.invalidate(id=id)
+
+    def archive(self, *args, **kwargs):
+        """Archive pipelines and invalidate the whole cache"""
+        try:
+            return self.backend.archive(*args, **kwargs)
+        finally:
+            self.cache.invalidate()
+
+    def count(self, *args, **kwargs):
+        return self.backend.count(*args, **kwargs)
+
+    def explain(self, *args, **kwargs):
+        return self.backend.explain(*args, **kwargs)
+
+    def aggregate(self, *args, **kwargs):
+        return self.backend.aggregate(*args, **kwargs)
+
+    def lineage(self, *args, **kwargs):
+        return self.backend.lineage(*args, **kwargs)
+
+
+class AsyncCachedBackend(AsyncBaseBackend):
+    """Read-through cache in front of an AsyncBaseBackend, see CachedBackend.
+
+    Share the PipelineCache of the CachedBackend of the same process so that
+    writes through either backend invalidate reads from both.
+    """
+
+    def __init__(self, backend: AsyncBaseBackend = None, cache: PipelineCache = None):
+        self.backend = backend
+        self.cache = cache or PipelineCache()
+
+    def __getattr__(self, name):
+        return getattr(self.backend, name)
+
+    async def startup(self, **kwargs):
+        """Startup hook."""
+        self.cache.start()
+        return await self.backend.startup(**kwargs)
+
+    async def shutdown(self, **kwargs):
+        """Shutdown hook."""
+        self.cache.stop()
+        return await self.backend.shutdown(**kwargs)
+
+    def cache_stats(self):
+        """Hit, miss and invalidation counters of the cache"""
+        return self.cache.stats()
+
+    async def read(self, id=None, task_id=None, projection=None, archived=False):
+        """Load a pipeline from the cache, or the whole pipeline from the backend on a miss"""
+        if not _cacheable(projection):
+            return await self.backend.read(id=id, task_id=task_id, projection=projection, archived=archived)
+        p = self.cache.get(id=id, task_id=task_id)
+        if p is None:
+            generation = self.cache.generation
+            # the whole pipeline answers later reads with any inclusion projection
+            p = await self.backend.read(id=id, task_id=task_id, archived=archived)
+            if not archived:
+                self.cache.put(p, generation=generation)
+        return p
+
+    async def list(self, *args, **kwargs):
+        """List pipelines, always from the backend"""
+        return await self.backend.list(*args, **kwargs)
+
+    async def list_children(self, *args, **kwargs):
+        """List the children of pipelines, always from the backend"""
+        return await self.backend.list_children(*args, **kwargs)
+
+    async def create(self, pipeline):
+        """Save a pipeline"""
+        return await self.backend.create(pipeline)
+
+    async def update(self, pipeline):
+        """Update a pipeline and invalidate it"""
+        try:
+            return await self.backend.update(pipeline)
+        finally:
+            self.cache.invalidate(id=pipeline.id)
+
+    async def update_status(self, id=None, *args, **kwargs):
+        """Update a PipelineStatus and invalidate the pipeline"""
+        try:
+            return await self.backend.update_status(id, *args, **kwargs)
+        finally:
+            self.cache.invalidate(id=id)
+
+    async def append_status(self, id=None, *args, **kwargs):
+        """Append a PipelineStatus and invalidate the pipeline"""
+        try:
+            return await self.backend.append_status(id, *args, **kwargs)
+        finally:
+            self.cache.invalidate(id=id)
+
+    async def replace(self, pipeline):
+        """Replace a pipeline and invalidate it"""
+        try:
+            return await self.backend.replace(pipeline)
+        finally:
+            self.cache.invalidate(id=pipeline.id)
+
+    async def delete(self, id=None):
+        """Delete a pipeline and invalidate it"""
+        try:
+            return await self.backend.delete(id=id)
+        finally:
+            self.cache.invalidate(id=id)
+
+    async def read_many(self, ids, projection=None):
+        """Load pipelines from the cache, and the whole misses from the backend in one call"""
+        cached = [self.cache.get(id=id) if _cacheable(projection) else None for id in ids]
+        missing = [id for id, p in zip(ids, cached) if p is None]
+        if missing:
+            generation = self.cache.generation
+            if _cacheable(projection):
+                loaded = await self.backend.read_many(missing)
+                for p in loaded:
+                    self.cache.put(p, generation=generation)
+            else:
+                loaded = await self.backend.read_many(missing, projection=projection)
+            loaded = iter(loaded)
+            cached = [p if p is not None else next(loaded) for p in cached]
+        return cached
+
+    async def create_many(self, pipelines):
+        """Save pipelines"""
+        return await self.backend.create_many(pipelines)
+
+    async def update_many(self, pipelines):
+        """Update pipelines and invalidate them"""
+        try:
+            return await self.backend.update_many(pipelines)
+        finally:
+            for p in pipelines:
+                self.cache.invalidate(id=p.id)
+
+    async def delete_many(self, ids):
+        """Delete pipelines and invalidate them"""
+        try:
+            return await self.backend.delete_many(ids)
+        finally:
+            for id in ids:
+                self.cache.invalidate(id=id)
+
+    async def archive(self, *args, **kwargs):
+        """Archive pipelines and invalidate the whole cache"""
+        try:
+            return await self.backend.archive(*args, **kwargs)
+        finally:
+            self.cache.invalidate()
@@ -1,93 +1,851 @@
-import ast
+import asyncio
 import json
 import uuid
 
 from bson.objectid import ObjectId
-from pymongo import MongoClient
+from celery.states import FAILURE, READY_STATES
+from fastapi.encoders import jsonable_encoder
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import DeleteOne, IndexModel, MongoClient, ReplaceOne, ReturnDocument, UpdateOne
+from pymongo.errors import OperationFailure
 
-from kedro_graphql.models import Pipeline
+from kedro_graphql.logs.logger import logger
+from kedro_graphql.models import (
+    LazyPipeline,
+    Pipeline,
+    PipelineFilterInput,
+    PipelineLineageEntry,
+    PipelineStats,
+    PipelineStatus,
+    PipelinesQueryPlan,
+)
 
-from .base import BaseBackend
+from .archive import ARCHIVE_PREFIX, archive_cutoff, archive_partition, is_terminal, merge_sorted
+from .base import AsyncBackendAdapter, BaseBackend, PipelineConflictError, group_children, status_position
+from .blobs import BLOB_THRESHOLD, blob_refs, decode_blob, join_blobs, split_blobs
+from .pagination import keyset_query, parse_sort
+from .snapshots import SnapshotCache, split_snapshot
+
+# Indexes provisioned on the "pipelines" collection at startup.
+# Additional indexes can be declared with the KEDRO_GRAPHQL_MONGO_INDEXES
+# config e.g. '[{"keys": [["status.runner", 1]], "name": "status_runner"}]'
+PIPELINE_INDEXES = [
+    {"keys": [("status.task_id", 1)], "name": "status_task_id"},
+    {"keys": [("name", 1), ("created_at", -1)], "name": "name_created_at"},
+    {"keys": [("created_at", -1), ("_id", -1)], "name": "created_at_id"},
+    {"keys": [("tags.key", 1), ("tags.value", 1)], "name": "tags_key_value"},
+    {"keys": [("status.state", 1), ("created_at", -1)], "name": "status_state_created_at"},
+    {"keys": [("parent", 1)], "name": "parent"},
+    {"keys": [("id", 1)], "name": "id"},
+]
+
+# Indexes provisioned on each monthly archive partition, enough for read by
+# id or task_id and for listing by creation time.
+ARCHIVE_INDEXES = [
+    {"keys": [("status.task_id", 1)], "name": "status_task_id"},
+    {"keys": [("created_at", -1), ("_id", -1)], "name": "created_at_id"},
+]
+
+SNAPSHOTS = "pipeline_snapshots"
+
+BLOBS = "pipeline_blobs"
+
+# The ids of the blobs stored by a process are remembered to skip rewriting
+# them, the set is cleared when it grows past this size
+BLOBS_SAVED_MAX = 10000
+
+
+def _index_models(indexes):
+    """Convert index declarations into pymongo IndexModel objects."""
+    models = []
+    for i in indexes:
+        options = {k: v for k, v in i.items() if k != "keys"}
+        models.append(IndexModel([tuple(k) for k in i["keys"]], **options))
+    return models
+
+
+def _keyset_value(key, value):
+    return ObjectId(value) if key == "_id" and value is not None else value
+
+
+def _filter_query(filter=None):
+    """
+    Compile a PipelineFilterInput, or a raw JSON query string, into a query.
+
+    Every condition of a PipelineFilterInput maps onto one of PIPELINE_INDEXES.
+    The state of the latest status cannot be indexed, so "status.state" first
+    narrows the candidates to pipelines that were in the state at some point
+    and $expr only checks the last element of those.
+    """
+    if not filter:
+        return {}
+    if not isinstance(filter, PipelineFilterInput):
+        return json.loads(filter)
+
+    query = {}
+    if filter.name is not None:
+        query["name"] = filter.name
+    if filter.state is not None:
+        query["status.state"] = filter.state.value
+        query["$expr"] = {"$eq": [{"$arrayElemAt": ["$status.state", -1]}, filter.state.value]}
+    if filter.tags:
+        query["$and"] = [{"tags": {"$elemMatch": {"key": t.key, "value": t.value}}} for t in filter.tags]
+    created_after, created_before = filter.created_bounds()
+    if created_after is not None or created_before is not None:
+        query["created_at"] = {}
+        if created_after is not None:
+            query["created_at"]["$gte"] = created_after
+        if created_before is not None:
+            query["created_at"]["$lt"] = created_before
+    if filter.parent is not None:
+        query["parent"] = filter.parent
+    return query
+
+
+def _list_query(cursor=None, filter="", sort=None):
+    """
+    Build the query for a page of pipelines.
+
+    A dict cursor holds the sort key values of the last pipeline of the previous
+    page and selects the pipelines strictly after it in sort order.  Any other
+    cursor is treated as a pipeline id and selects pipelines with an id greater
+    than or equal to it.
+    """
+    query = _filter_query(filter)
+
+    if isinstance(cursor, dict):
+        keyset = keyset_query(sort, cursor, convert=_keyset_value)
+        query = {"$and": [query, keyset]} if query else keyset
+    elif cursor is not None:
+        query = {**query, '_id': {'$gte': ObjectId(cursor)}}
+    return query
+
+
+def _versioned(id, version=None):
+    """
+    Match a pipeline by id and, if given, by version.
+
+    Documents written before versioning was introduced have no version field
+    and match version 0.
+    """
+    query = {"_id": ObjectId(id)}
+    if version is not None:
+        query["version"] = {"$in": [0, None]} if version == 0 else version
+    return query
+
+
+def _read_query(id: uuid.UUID = None, task_id: str = None):
+    if task_id:
+        return {"status": {"$elemMatch": {"task_id": task_id}}}
+    else:
+        return {"_id": ObjectId(id)}
+
+
+def _status_update(fields: dict, index: int = -1):
+    """Build an update setting fields of the PipelineStatus at index.
+
+    Non-negative indexes map to a plain $set on "status.<index>.<field>".
+    Negative indexes, e.g. the latest attempt, cannot be addressed with dot
+    notation so an update pipeline rebuilds the array around the merged status.
+    """
+    fields = jsonable_encoder(fields)
+    if index >= 0:
+        return {"$set": {f"status.{index}.{k}": v for k, v in fields.items()}, "$inc": {"version": 1}}
+
+    position = {"$add": [{"$size": "$status"}, index]}
+    merged = {"$mergeObjects": [{"$arrayElemAt": ["$status", index]},
+                                {k: {"$literal": v} for k, v in fields.items()}]}
+    before = {"$cond": [{"$gt": [position, 0]}, {"$slice": ["$status", position]}, []]}
+    after = {"$slice": ["$status", index + 1]} if index < -1 else []
+    return [{"$set": {"status": {"$concatArrays": [before, [merged], after]},
+                      "version": {"$add": [{"$ifNull": ["$version", 0]}, 1]}}}]
+
+
+STATS_PERCENTILES = {"duration_p50": 0.5, "duration_p95": 0.95, "duration_p99": 0.99}
+
+STATS_GROUP_BY = {
+    "name": "$name",
+    "state": "$latest.state",
+    "tag": {"$concat": ["$tags.key", "=", "$tags.value"]},
+    "day": {"$substrBytes": ["$created_at", 0, 10]},
+}
+
+
+def _to_date(field):
+    # datetimes are stored as isoformat strings, $dateFromString parses up to milliseconds
+    return {"$dateFromString": {"dateString": {"$substrBytes": [field, 0, 23]}, "onError": None, "onNull": None}}
+
+
+def _stats_pipeline(filter="", group_by=None):
+    """
+    Build an aggregation pipeline computing run statistics per group.
+
+    Durations are finished_at - started_at of the latest PipelineStatus in
+    seconds.  Percentiles use the nearest lower rank of the durations sorted
+    before grouping, so only the percentile values leave the server and
+    MongoDB 4.2 is sufficient.
+    """
+    group_by = group_by or []
+    unknown = set(group_by) - set(STATS_GROUP_BY)
+    if unknown:
+        raise ValueError(f"Invalid group_by {sorted(unknown)}, must be one of {list(STATS_GROUP_BY)}")
+    group = {k: STATS_GROUP_BY[k] for k in group_by}
+
+    pipeline = [{"$match": _list_query(filter=filter)}] if filter else []
+    if "tag" in group_by:
+        pipeline.append({"$unwind": "$tags"})
+    pipeline.extend([
+        {"$project": {"name": 1, "tags": 1, "created_at": 1,
+                      "latest": {"$arrayElemAt": ["$status", -1]}}},
+        {"$facet": {
+            "states": [
+                {"$group": {"_id": {"group": group, "state": "$latest.state"}, "count": {"$sum": 1}}},
+            ],
+            "durations": [
+                {"$addFields": {"duration": {"$divide": [
+                    {"$subtract": [_to_date("$latest.finished_at"), _to_date("$latest.started_at")]}, 1000]}}},
+                {"$match": {"duration": {"$ne": None}}},
+                {"$sort": {"duration": 1}},
+                {"$group": {"_id": group, "durations": {"$push": "$duration"}}},
+                {"$project": {k: {"$arrayElemAt": ["$durations", {"$toInt": {"$floor": {"$multiply": [
+                    p, {"$subtract": [{"$size": "$durations"}, 1]}]}}}]}
+                    for k, p in STATS_PERCENTILES.items()}},
+            ],
+        }},
+    ])
+    return pipeline
+
+
+def _decode_stats(r):
+    """Combine the facets of the stats aggregation into PipelineStats."""
+    groups = {}
+    for s in r["states"]:
+        key = tuple(sorted((s["_id"].get("group") or {}).items()))
+        stats = groups.setdefault(key, {"count": 0, "state_counts": {}})
+        stats["count"] += s["count"]
+        stats["state_counts"][s["_id"].get("state") or "NONE"] = s["count"]
+
+    results = []
+    for key, stats in groups.items():
+        percentiles = next((d for d in r["durations"] if tuple(sorted((d["_id"] or {}).items())) == key), {})
+        finished = sum(v for k, v in stats["state_counts"].items() if k in READY_STATES)
+        results.append(PipelineStats(group=dict(key),
+                                     count=stats["count"],
+                                     state_counts=stats["state_counts"],
+                                     failure_rate=stats["state_counts"].get(FAILURE, 0) / finished if finished else None,
+                                     **{k: percentiles.get(k) for k in STATS_PERCENTILES}))
+    return results
+
+
+def _with_sort_keys(projection, sort):
+    """Make sure an inclusion projection returns the keys needed to merge pages."""
+    if projection and any(v == 1 for v in projection.values()):
+        return {**projection, **{k: 1 for k, _ in sort}}
+    return projection
+
+
+def _plan_indexes(plan):
+    """Names of the indexes used by the stages of a query plan."""
+    if isinstance(plan, list):
+        return [i for p in plan for i in _plan_indexes(p)]
+    if not isinstance(plan, dict):
+        return []
+    names = [plan["indexName"]] if plan.get("indexName") else []
+    return names + [i for k, v in plan.items() if k != "indexName" for i in _plan_indexes(v)]
+
+
+def _decode_explain(query, raw):
+    stats = raw.get("executionStats", {})
+    plan = raw.get("queryPlanner", {}).get("winningPlan", {})
+    return PipelinesQueryPlan(query=json.loads(json.dumps(query, default=str)),
+                              indexes=list(dict.fromkeys(_plan_indexes(plan))),
+                              keys_examined=stats.get("totalKeysExamined"),
+                              docs_examined=stats.get("totalDocsExamined"),
+                              returned=stats.get("nReturned"),
+                              execution_time_ms=stats.get("executionTimeMillis"),
+                              plan=json.loads(json.dumps(plan, default=str)))
+
+
+def _decode(r):
+    if r:
+        r["id"] = str(r["_id"])
+        return LazyPipeline(r)
+    else:
+        return None
+
+
+def _new_document(pipeline):
+    """
+    Encode a new pipeline with its ObjectId.  The id is also stored as a
+    string, the type of parent, so that $graphLookup can follow parent links.
+    """
+    values = pipeline.encode()
+    values["_id"] = ObjectId()
+    values["id"] = str(values["_id"])
+    values["version"] = 0
+    return values
+
+
+# Sets the string id of documents written before it was stored
+BACKFILL_ID = [{"$set": {"id": {"$toString": "$_id"}}}]
+
+
+def _lineage_pipeline(id, direction="ancestors", max_depth=None, projection=None):
+    """
+    Aggregation pipeline returning the ancestors or the descendants of a
+    pipeline, nearest first, each with its "depth" (1 for the parent or the
+    children) using $graphLookup on the "id" and "parent" indexes.
+    """
+    if direction == "ancestors":
+        lookup = {"startWith": "$parent", "connectFromField": "parent", "connectToField": "id"}
+    elif direction == "descendants":
+        lookup = {"startWith": "$id", "connectFromField": "id", "connectToField": "parent"}
+    else:
+        raise ValueError(f"direction must be 'ancestors' or 'descendants', not {direction}")
+    if max_depth is not None:
+        lookup["maxDepth"] = max_depth - 1
+    stages = [{"$match": {"_id": ObjectId(id)}},
+              {"$graphLookup": {"from": "pipelines", "as": "lineage", "depthField": "depth", **lookup}},
+              {"$unwind": "$lineage"},
+              {"$replaceRoot": {"newRoot": "$lineage"}},
+              # the pipeline itself if parent links form a cycle
+              {"$match": {"_id": {"$ne": ObjectId(id)}}},
+              {"$sort": {"depth": 1, "_id": 1}}]
+    if projection:
+        stages.append({"$project": {**projection, "depth": 1}})
+    return stages
+
+
+def _decode_lineage(raws, pipelines):
+    return [PipelineLineageEntry(depth=r["depth"] + 1, pipeline=p) for r, p in zip(raws, pipelines)]
+
+
+def _ordered(ids, raws):
+    """Order raw pipelines like ids, None for ids that were not found."""
+    by_id = {str(r["_id"]): r for r in raws}
+    return [by_id.get(str(id)) for id in ids]
+
+
+def _same_values(a, b):
+    """True if two pipelines have the same values, ignoring their id and version."""
+    return {**a.encode(), "id": None, "version": None} == {**b.encode(), "id": None, "version": None}
+
+
+def _ids_query(ids):
+    return {"_id": {"$in": [ObjectId(id) for id in ids]}}
+
+
+def _children_find(parents, projection=None):
+    """The query and projection listing the children of parents ordered by id."""
+    return {"parent": {"$in": [str(p) for p in parents]}}, _with_sort_keys(projection, [("parent", 1)])
+
+
+def _split_status(values, threshold=BLOB_THRESHOLD):
+    """Move the large diagnostic fields of the status entries of an encoded pipeline into blobs"""
+    return [b for s in values.get("status") or [] for b in split_blobs(s, threshold)]
+
+
+def _blob_updates(blobs):
+    return [UpdateOne({"_id": b["_id"]}, {"$setOnInsert": {"data": b["data"], "size": b["size"]}}, upsert=True)
+            for b in blobs]
+
+
+def _snapshot_update(values, snapshot):
+    update = {"$set": values, "$inc": {"version": 1}}
+    if snapshot is not None:
+        # documents written before snapshots were introduced embed them
+        update["$unset"] = {"describe": "", "nodes": ""}
+    return update
 
 
 class MongoBackend(BaseBackend):
 
-    def __init__(self, uri=None, db=None):
+    def __init__(self, uri=None, db=None, indexes=None, archive_after_days=None, blob_threshold=BLOB_THRESHOLD):
         self.client = MongoClient(uri)
         self.db = self.client[db]
+        if isinstance(indexes, str):
+            indexes = json.loads(indexes)
+        self.indexes = _index_models(PIPELINE_INDEXES + (indexes or []))
+        self.archive_after_days = archive_after_days
+        self.snapshots = SnapshotCache()
+        self.blob_threshold = blob_threshold
+        self.saved_blobs = set()
 
     def startup(self, **kwargs):
         """Startup hook."""
         print("Connected to the MongoDB database!")
+        self.create_indexes()
+        backfilled = self.db["pipelines"].update_many({"id": {"$exists": False}}, BACKFILL_ID).modified_count
+        if backfilled:
+            logger.info(f"Stored the string id of {backfilled} pipelines")
+        missing = self.index_report(usage=False)["missing"]
+        if missing:
+            logger.warning(f"Missing indexes on the pipelines collection: {missing}")
+
+    def create_indexes(self):
+        """Create the declared indexes on the pipelines collection.
+
+        Indexes that already exist are left untouched.  An index conflicting
+        with an existing one (e.g. same keys, different name) is logged and
+        skipped so that startup is not blocked.
+
+        Returns:
+            list: names of the indexes created or already present.
+        """
+        created = []
+        for model in self.indexes:
+            try:
+                created.extend(self.db["pipelines"].create_indexes([model]))
+            except OperationFailure as e:
+                logger.warning(f"Could not create index {model.document['name']}: {e}")
+        return created
+
+    def index_report(self, usage=True):
+        """Report declared indexes that are missing and indexes that are unused.
+
+        Kwargs:
+            usage (bool): collect per index usage with $indexStats, counters
+                are reset when the mongod process restarts.
+
+        Returns:
+            dict: e.g.
+
+                {"missing": ["status_task_id"],
+                 "unused": ["name_created_at"],
+                 "usage": {"_id_": 1520, "name_created_at": 0}}
+        """
+        existing = self.db["pipelines"].index_information()
+        report = {"missing": [m.document["name"] for m in self.indexes if m.document["name"] not in existing],
+                  "unused": [],
+                  "usage": {}}
+        if usage:
+            for stats in self.db["pipelines"].aggregate([{"$indexStats": {}}]):
+                report["usage"][stats["name"]] = stats["accesses"]["ops"]
+            report["unused"] = [name for name, ops in report["usage"].items() if ops == 0 and name != "_id_"]
+        return report
 
     def shutdown(self, **kwargs):
         """Shutdown hook."""
         self.client.close()
 
-    def list(self, cursor: uuid.UUID = None, limit=10, filter="", sort=""):
-        query = {'_id': {'$gte': ObjectId(cursor)}}
-        if len(filter) > 0:
-            filter = json.loads(filter)
-            query.update(filter)
+    def list(self, cursor=None, limit=10, filter="", sort="", projection=None, archived=False):
+        """List pipelines using keyset pagination, optionally including archived pipelines"""
+        sort = parse_sort(sort)
+        query = _list_query(cursor=cursor, filter=filter, sort=sort)
+        if not archived:
+            raw = self.db["pipelines"].find(query, projection).sort(sort).limit(limit)
+            return self._decode_all(raw)
 
-        if sort:
-            try:
-                sort = ast.literal_eval(sort)
-                # Validate that sort is a list of tuples like [('created_at', -1)]
-                if isinstance(sort, list) and all(isinstance(i, tuple) and len(i) == 2 for i in sort):
-                    raw = self.db["pipelines"].find(query).sort(sort).limit(limit)
-                else:
-                    raise ValueError("Sort parameter should be a list of tuples like [('field', order)]")
-            except (ValueError, SyntaxError) as e:
-                raise ValueError(f"Invalid sort parameter format: {e}")
-        else:
-            raw = self.db["pipelines"].find(query).limit(limit)
-
-        results = []
-        for r in raw:
-            r["id"] = str(r["_id"])
-            p = Pipeline.decode(r)
-            results.append(p)
-        return results
-
-    def read(self, id: uuid.UUID = None, task_id: str = None):
-        """Load a pipeline by id or task_id"""
-        if task_id:
-            r = self.db["pipelines"].find_one({"status": {"$elemMatch": {"task_id": task_id}}})
-        else:
-            r = self.db["pipelines"].find_one({"_id": ObjectId(id)})
-
-        if r:
-            r["id"] = str(r["_id"])
-            p = Pipeline.decode(r)
-            return p
-        else:
-            return None
+        # each collection returns its own first page, the merged page is the
+        # first limit pipelines across all of them
+        projection = _with_sort_keys(projection, sort)
+        pages = [list(self.db[c].find(query, projection).sort(sort).limit(limit))
+                 for c in ["pipelines"] + self.archive_collections()]
+        return self._decode_all(merge_sorted(pages, sort, limit))
+
+    def read(self, id: uuid.UUID = None, task_id: str = None, projection=None, archived=False):
+        """Load a pipeline by id or task_id, optionally falling back to the archive"""
+        query = _read_query(id=id, task_id=task_id)
+        r = self.db["pipelines"].find_one(query, projection)
+        if r is None and archived:
+            for c in self.archive_collections():
+                r = self.db[c].find_one(query, projection)
+                if r is not None:
+                    break
+        return self._decode_all([r])[0]
+
+    def _decode_all(self, raws):
+        """Decode raw pipelines, loading the snapshots they reference that are not cached and
+        the blobs they reference in one query each"""
+        raws = list(raws)
+        missing = self.snapshots.missing(raws)
+        if missing:
+            for snapshot in self.db[SNAPSHOTS].find({"_id": {"$in": list(missing)}}):
+                self.snapshots.add(snapshot)
+        refs = blob_refs(raws)
+        if refs:
+            join_blobs(raws, {b["_id"]: decode_blob(b) for b in self.db[BLOBS].find({"_id": {"$in": list(refs)}})})
+        return [self.snapshots.apply(_decode(r), r) for r in raws]
+
+    def _save_blobs(self, blobs):
+        """Store blobs unless this process already stored them"""
+        blobs = [b for b in blobs if b["_id"] not in self.saved_blobs]
+        if not blobs:
+            return
+        self.db[BLOBS].bulk_write(_blob_updates(blobs), ordered=False)
+        if len(self.saved_blobs) > BLOBS_SAVED_MAX:
+            self.saved_blobs.clear()
+        self.saved_blobs.update(b["_id"] for b in blobs)
+
+    def _save_snapshot(self, snapshot):
+        """Store a snapshot unless this process already stored it"""
+        if snapshot is None or snapshot["_id"] in self.snapshots.saved:
+            return
+        self.db[SNAPSHOTS].update_one({"_id": snapshot["_id"]},
+                                      {"$setOnInsert": {k: v for k, v in snapshot.items() if k != "_id"}},
+                                      upsert=True)
+        self.snapshots.saved.add(snapshot["_id"])
+        self.snapshots.add(snapshot)
+
+    def explain(self, cursor=None, limit=10, filter="", sort=""):
+        """Explain the query plan of the list call with the same arguments"""
+        sort = parse_sort(sort)
+        query = _list_query(cursor=cursor, filter=filter, sort=sort)
+        raw = self.db.command("explain", {"find": "pipelines", "filter": query, "sort": dict(sort), "limit": limit},
+                              verbosity="executionStats")
+        return _decode_explain(query, raw)
+
+    def lineage(self, id, direction="ancestors", max_depth=None, projection=None):
+        """Follow the parent links of a pipeline with a single $graphLookup aggregation"""
+        raws = list(self.db["pipelines"].aggregate(_lineage_pipeline(id, direction, max_depth, projection)))
+        return _decode_lineage(raws, self._decode_all(raws))
+
+    def list_children(self, parents, limit=None, projection=None):
+        """List the children of several pipelines with a single $in query"""
+        query, projection = _children_find(parents, projection)
+        raw = self.db["pipelines"].find(query, projection).sort([("_id", 1)])
+        return group_children(parents, self._decode_all(raw), limit)
+
+    def archive_collections(self):
+        """Names of the monthly archive partitions, most recent first."""
+        return sorted((c for c in self.db.list_collection_names() if c.startswith(ARCHIVE_PREFIX)), reverse=True)
+
+    def archive(self, older_than_days=None, batch_size=1000):
+        """Move pipelines in a terminal state into monthly archive partitions.
+
+        Pipelines created more than older_than_days ago whose latest status is
+        a celery READY_STATE are copied into "pipelines_archive_YYYY_MM" by
+        created_at and then removed from the "pipelines" collection.  A pipeline
+        whose status changed while it was being copied (e.g. a retry) is kept
+        in "pipelines" and its archived copy is dropped, so the operation is
+        safe to run concurrently with workers and to re-run after a failure.
+
+        Kwargs:
+            older_than_days (float): defaults to the archive_after_days option.
+            batch_size (int): number of pipelines moved per round trip.
+
+        Returns:
+            int: number of pipelines archived.
+        """
+        older_than_days = older_than_days if older_than_days is not None else self.archive_after_days
+        if older_than_days is None:
+            raise ValueError("older_than_days is required when archive_after_days is not configured")
+
+        query = {"created_at": {"$lt": archive_cutoff(older_than_days)},
+                 "status.state": {"$in": list(READY_STATES)}}
+        candidates = [r["_id"] for r in self.db["pipelines"].find(query, {"status.state": 1})
+                      if is_terminal(r)]
+
+        archived = 0
+        indexed = set()
+        for i in range(0, len(candidates), batch_size):
+            docs = list(self.db["pipelines"].find({"_id": {"$in": candidates[i:i + batch_size]}}))
+            partitions = {}
+            for r in docs:
+                if is_terminal(r):
+                    partitions.setdefault(archive_partition(r["created_at"]), []).append(r)
+
+            for name, batch in partitions.items():
+                if name not in indexed:
+                    self.db[name].create_indexes(_index_models(ARCHIVE_INDEXES))
+                    indexed.add(name)
+                self.db[name].bulk_write([ReplaceOne({"_id": r["_id"]}, r, upsert=True) for r in batch],
+                                         ordered=False)
+                self.db["pipelines"].bulk_write([DeleteOne({"_id": r["_id"], "status": r["status"]})
+                                                 for r in batch], ordered=False)
+                ids = [r["_id"] for r in batch]
+                changed = [r["_id"] for r in self.db["pipelines"].find({"_id": {"$in": ids}}, {"_id": 1})]
+                if changed:
+                    self.db[name].delete_many({"_id": {"$in": changed}})
+                archived += len(ids) - len(changed)
+
+        logger.info(f"Archived {archived} pipelines older than {older_than_days} days")
+        return archived
 
     def create(self, pipeline: Pipeline):
         """Save a pipeline"""
-        values = pipeline.encode()
-        values.pop("id")  # we dont have an id yet, we will get it after insert
-        created = self.db["pipelines"].insert_one(values)
-        created = self.db["pipelines"].find_one({"_id": created.inserted_id})
-        created["id"] = str(created["_id"])
-        p = Pipeline.decode(created)
-        return p
+        return self.create_many([pipeline])[0]
 
     def update(self, pipeline: Pipeline = None):
-        """Update a pipeline"""
-        id = ObjectId(pipeline.id)
-        filter = {'_id': id}
+        """Update a pipeline if its version is unchanged"""
         values = pipeline.encode()
         values.pop("id")  # we dont want to update the id
-        newvalues = {"$set": values}
-        self.db["pipelines"].update_one(filter, newvalues)
+        values.pop("version")
+        snapshot = split_snapshot(values)
+        self._save_snapshot(snapshot)
+        self._save_blobs(_split_status(values, self.blob_threshold))
+        r = self.db["pipelines"].find_one_and_update(_versioned(pipeline.id, pipeline.version),
+                                                     _snapshot_update(values, snapshot),
+                                                     return_document=ReturnDocument.AFTER)
+        if r is None:
+            self._check_conflict(pipeline.id, pipeline.version)
+        return self._decode_all([r])[0]
+
+    def create_many(self, pipelines):
+        """Save pipelines with a single insert_many"""
+        values = [_new_document(p) for p in pipelines]
+        for v in values:
+            self._save_snapshot(split_snapshot(v))
+            self._save_blobs(_split_status(v, self.blob_threshold))
+        if values:
+            self.db["pipelines"].insert_many(values)
+        return self._decode_all(values)
+
+    def read_many(self, ids, projection=None):
+        """Load pipelines by id with a single $in query"""
+        raw = self.db["pipelines"].find(_ids_query(ids), projection)
+        return self._decode_all(_ordered(ids, raw))
+
+    def update_many(self, pipelines):
+        """Update pipelines whose version is unchanged with a single bulk_write"""
+        ops = []
+        for p in pipelines:
+            values = p.encode()
+            values.pop("id")
+            values.pop("version")
+            snapshot = split_snapshot(values)
+            self._save_snapshot(snapshot)
+            self._save_blobs(_split_status(values, self.blob_threshold))
+            ops.append(UpdateOne(_versioned(p.id, p.version), _snapshot_update(values, snapshot)))
+        if not ops:
+            return []
+        result = self.db["pipelines"].bulk_write(ops, ordered=False)
+        updated = self.read_many([p.id for p in pipelines])
+        if result.matched_count < len(ops):
+            # bulk_write does not report which updates matched, a pipeline was
+            # written if it is at the next version with the values we wrote
+            updated = [u if u is not None and u.version == p.version + 1 and _same_values(p, u) else None
+                       for p, u in zip(pipelines, updated)]
+            conflict = next((p for p, u in zip(pipelines, updated)
+                             if u is None and self.db["pipelines"].count_documents({"_id": ObjectId(p.id)}, limit=1)),
+                            None)
+            if conflict is not None:
+                raise PipelineConflictError(id=conflict.id, version=conflict.version)
+        return updated
 
-        p = self.read(id=id)
+    def delete_many(self, ids):
+        """Delete pipelines with a single $in query"""
+        self.db["pipelines"].delete_many(_ids_query(ids))
+        return list(ids)
 
-        return p
+    def replace(self, pipeline: Pipeline):
+        """Insert or replace a pipeline keeping its id and version"""
+        values = pipeline.encode()
+        id = values["id"] = str(values["id"])
+        self._save_snapshot(split_snapshot(values))
+        self._save_blobs(_split_status(values, self.blob_threshold))
+        self.db["pipelines"].replace_one({"_id": ObjectId(id)}, values, upsert=True)
+
+    def _check_conflict(self, id, version, index=None):
+        """
+        Raise PipelineConflictError if a conditional write missed an existing pipeline,
+        or ValueError if index is set and the pipeline has no status at index.
+        """
+        if index is not None:
+            r = self.db["pipelines"].find_one({"_id": ObjectId(id)}, {"status.state": 1})
+            if r is not None:
+                status_position(index, len(r.get("status") or []), id)
+        if version is not None and self.db["pipelines"].count_documents({"_id": ObjectId(id)}, limit=1):
+            raise PipelineConflictError(id=id, version=version)
 
     def delete(self, id: uuid.UUID = None):
         """Delete a pipeline using id"""
         self.db["pipelines"].delete_one({"_id": ObjectId(id)})
         return id
+
+    def count(self, filter="", archived=False):
+        """Count the pipelines matching a filter, optionally including archived pipelines"""
+        collections = ["pipelines"] + (self.archive_collections() if archived else [])
+        return sum(self.db[c].count_documents(_list_query(filter=filter)) for c in collections)
+
+    def aggregate(self, filter="", group_by=None):
+        """Compute run statistics of the pipelines matching a filter"""
+        raw = self.db["pipelines"].aggregate(_stats_pipeline(filter=filter, group_by=group_by))
+        return _decode_stats(raw.next())
+
+    def update_status(self, id: uuid.UUID = None, fields: dict = None, index: int = -1,
+                      return_pipeline: bool = False, version: int = None):
+        """Atomically update fields of a single PipelineStatus"""
+        fields = dict(fields or {})
+        self._save_blobs(split_blobs(fields, self.blob_threshold))
+        return self._write(id, _status_update(fields, index=index), return_pipeline, version, index=index)
+
+    def append_status(self, id: uuid.UUID = None, status: PipelineStatus = None,
+                      return_pipeline: bool = False, version: int = None):
+        """Atomically append a PipelineStatus for a new run attempt"""
+        status = jsonable_encoder(status)
+        self._save_blobs(split_blobs(status, self.blob_threshold))
+        update = {"$push": {"status": status}, "$inc": {"version": 1}}
+        return self._write(id, update, return_pipeline, version)
+
+    def _write(self, id, update, return_pipeline=False, version=None, index=None):
+        """Apply a partial update, conditional on version if it is set and on the status at index if it is set"""
+        query = _versioned(id, version)
+        if index is not None:
+            # a negative index needs at least -index statuses
+            query[f"status.{index if index >= 0 else -index - 1}"] = {"$exists": True}
+        if return_pipeline:
+            r = self.db["pipelines"].find_one_and_update(query, update, return_document=ReturnDocument.AFTER)
+            if r is None:
+                self._check_conflict(id, version, index)
+            return self._decode_all([r])[0]
+        if not self.db["pipelines"].update_one(query, update).matched_count:
+            self._check_conflict(id, version, index)
+
+
+class AsyncMongoBackend(AsyncBackendAdapter):
+    """MongoDB backend built on motor for use inside the ASGI event loop.
+
+    The motor client is bound to the event loop it is first used on, so a new
+    client is created whenever the running loop changes (e.g. between tests).
+    Methods that are not implemented natively here are delegated to a
+    synchronous MongoBackend running in a worker thread.
+    """
+
+    def __init__(self, uri=None, db=None, indexes=None, archive_after_days=None, blob_threshold=BLOB_THRESHOLD):
+        super().__init__(backend=MongoBackend(uri=uri, db=db, indexes=indexes,
+                                              archive_after_days=archive_after_days,
+                                              blob_threshold=blob_threshold))
+        self.uri = uri
+        self.db_name = db
+        self.snapshots = self.backend.snapshots
+        self.client = None
+        self._loop = None
+
+    @property
+    def db(self):
+        loop = asyncio.get_running_loop()
+        if self.client is None or self._loop is not loop:
+            if self.client is not None:
+                self.client.close()
+            self.client = AsyncIOMotorClient(self.uri)
+            self._loop = loop
+        return self.client[self.db_name]
+
+    async def startup(self, **kwargs):
+        """Startup hook."""
+        await self.db.command("ping")
+        print("Connected to the MongoDB database (async)!")
+
+    async def shutdown(self, **kwargs):
+        """Shutdown hook."""
+        if self.client is not None:
+            self.client.close()
+        self.backend.shutdown()
+
+    async def list(self, cursor=None, limit=10, filter="", sort="", projection=None, archived=False):
+        """List pipelines using keyset pagination, optionally including archived pipelines"""
+        if archived:
+            return await self._run(self.backend.list, cursor=cursor, limit=limit, filter=filter, sort=sort,
+                                   projection=projection, archived=True)
+        sort = parse_sort(sort)
+        query = _list_query(cursor=cursor, filter=filter, sort=sort)
+        raw = self.db["pipelines"].find(query, projection).sort(sort).limit(limit)
+
+        return await self._decode_all([r async for r in raw])
+
+    async def read(self, id: uuid.UUID = None, task_id: str = None, projection=None, archived=False):
+        """Load a pipeline by id or task_id, optionally falling back to the archive"""
+        r = await self.db["pipelines"].find_one(_read_query(id=id, task_id=task_id), projection)
+        if r is None and archived:
+            return await self._run(self.backend.read, id=id, task_id=task_id, projection=projection, archived=True)
+        return (await self._decode_all([r]))[0]
+
+    async def _decode_all(self, raws):
+        """Decode raw pipelines, loading the snapshots they reference that are not cached and
+        the blobs they reference in one query each"""
+        missing = self.snapshots.missing(raws)
+        if missing:
+            async for snapshot in self.db[SNAPSHOTS].find({"_id": {"$in": list(missing)}}):
+                self.snapshots.add(snapshot)
+        refs = blob_refs(raws)
+        if refs:
+            join_blobs(raws, {b["_id"]: decode_blob(b) async for b in self.db[BLOBS].find({"_id": {"$in": list(refs)}})})
+        return [self.snapshots.apply(_decode(r), r) for r in raws]
+
+    async def _save_blobs(self, blobs):
+        """Store blobs unless this process already stored them"""
+        saved = self.backend.saved_blobs
+        blobs = [b for b in blobs if b["_id"] not in saved]
+        if not blobs:
+            return
+        await self.db[BLOBS].bulk_write(_blob_updates(blobs), ordered=False)
+        if len(saved) > BLOBS_SAVED_MAX:
+            saved.clear()
+        saved.update(b["_id"] for b in blobs)
+
+    async def _save_snapshot(self, snapshot):
+        """Store a snapshot unless this process already stored it"""
+        if snapshot is None or snapshot["_id"] in self.snapshots.saved:
+            return
+        await self.db[SNAPSHOTS].update_one({"_id": snapshot["_id"]},
+                                            {"$setOnInsert": {k: v for k, v in snapshot.items() if k != "_id"}},
+                                            upsert=True)
+        self.snapshots.saved.add(snapshot["_id"])
+        self.snapshots.add(snapshot)
+
+    async def create(self, pipeline: Pipeline):
+        """Save a pipeline"""
+        return (await self.create_many([pipeline]))[0]
+
+    async def update(self, pipeline: Pipeline = None):
+        """Update a pipeline if its version is unchanged"""
+        values = pipeline.encode()
+        values.pop("id")  # we dont want to update the id
+        values.pop("version")
+        snapshot = split_snapshot(values)
+        await self._save_snapshot(snapshot)
+        await self._save_blobs(_split_status(values, self.backend.blob_threshold))
+        r = await self.db["pipelines"].find_one_and_update(_versioned(pipeline.id, pipeline.version),
+                                                           _snapshot_update(values, snapshot),
+                                                           return_document=ReturnDocument.AFTER)
+        if r is None and await self.db["pipelines"].count_documents({"_id": ObjectId(pipeline.id)}, limit=1):
+            raise PipelineConflictError(id=pipeline.id, version=pipeline.version)
+        return (await self._decode_all([r]))[0]
+
+    async def delete(self, id: uuid.UUID = None):
+        """Delete a pipeline using id"""
+        await self.db["pipelines"].delete_one({"_id": ObjectId(id)})
+        return id
+
+    async def create_many(self, pipelines):
+        """Save pipelines with a single insert_many"""
+        values = [_new_document(p) for p in pipelines]
+        for v in values:
+            await self._save_snapshot(split_snapshot(v))
+            await self._save_blobs(_split_status(v, self.backend.blob_threshold))
+        if values:
+            await self.db["pipelines"].insert_many(values)
+        return await self._decode_all(values)
+
+    async def read_many(self, ids, projection=None):
+        """Load pipelines by id with a single $in query"""
+        raw = self.db["pipelines"].find(_ids_query(ids), projection)
+        return await self._decode_all(_ordered(ids, [r async for r in raw]))
+
+    async def lineage(self, id, direction="ancestors", max_depth=None, projection=None):
+        """Follow the parent links of a pipeline with a single $graphLookup aggregation"""
+        raws = await self.db["pipelines"].aggregate(_lineage_pipeline(id, direction, max_depth, projection)).to_list(None)
+        return _decode_lineage(raws, await self._decode_all(raws))
+
+    async def list_children(self, parents, limit=None, projection=None):
+        """List the children of several pipelines with a single $in query"""
+        query, projection = _children_find(parents, projection)
+        raw = self.db["pipelines"].find(query, projection).sort([("_id", 1)])
+        return group_children(parents, await self._decode_all([r async for r in raw]), limit)
+
+    async def delete_many(self, ids):
+        """Delete pipelines with a single $in query"""
+        await self.db["pipelines"].delete_many(_ids_query(ids))
+        return list(ids)
+
+    async def count(self, filter="", archived=False):
+        """Count the pipelines matching a filter, optionally including archived pipelines"""
+        if archived:
+            return await self._run(self.backend.count, filter=filter, archived=True)
+        return await self.db["pipelines"].count_documents(_list_query(filter=filter))
+
+    async def aggregate(self, filter="", group_by=None):
+        """Compute run statistics of the pipelines matching a filter"""
+        raw = self.db["pipelines"].aggregate(_stats_pipeline(filter=filter, group_by=group_by))
+        return _decode_stats((await raw.to_list(length=1))[0])
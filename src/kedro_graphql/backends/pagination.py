@@ -0,0 +1,99 @@
+import ast
+from datetime import datetime
+
+
+def parse_sort(sort=""):
+    """
+    Parse a sort string like "[('created_at', -1)]" into a list of tuples.
+
+    The "_id" field is appended as a tie-breaker, using the direction of the
+    last sort key, so that the sort order is total and can be used for keyset
+    pagination.  An empty sort string sorts by "_id" ascending.
+    """
+    if sort:
+        try:
+            sort = ast.literal_eval(sort)
+        except (ValueError, SyntaxError) as e:
+            raise ValueError(f"Invalid sort parameter format: {e}")
+        # Validate that sort is a list of tuples like [('created_at', -1)]
+        if not (isinstance(sort, list) and all(isinstance(i, tuple) and len(i) == 2 for i in sort)):
+            raise ValueError("Invalid sort parameter format: Sort parameter should be a list of tuples like "
+                             "[('field', order)]")
+        if not all(i[1] in (1, -1) for i in sort):
+            raise ValueError("Invalid sort parameter format: order must be 1 or -1")
+    else:
+        sort = []
+
+    if "_id" not in [k for k, _ in sort]:
+        sort.append(("_id", sort[-1][1] if sort else 1))
+    return sort
+
+
+def cursor_values(pipeline, sort):
+    """
+    Returns the values of the sort keys of a pipeline, in their stored format,
+    for use as a keyset pagination cursor.
+
+    Args:
+        pipeline (Pipeline): the last pipeline of a page.
+        sort (list): parsed sort e.g. [('created_at', -1), ('_id', -1)]
+
+    Returns:
+        dict: e.g. {"created_at": "2025-03-01T12:00:00", "_id": "67c2f0..."}
+    """
+    values = {}
+    for key, _ in sort:
+        if key == "_id":
+            values[key] = str(pipeline.id)
+            continue
+        value = pipeline
+        for part in key.split("."):
+            value = value.get(part) if isinstance(value, dict) else getattr(value, part, None)
+            if isinstance(value, list):
+                raise ValueError(f"Cursor pagination is not supported when sorting on array field '{key}'")
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif hasattr(value, "value"):  # enums
+            value = value.value
+        values[key] = value
+    return values
+
+
+def keyset_query(sort, cursor: dict, convert=None):
+    """
+    Build a query matching documents strictly after the cursor in sort order.
+
+    For a sort of [(k1, d1), (k2, d2)] the query is
+
+        {"$or": [{k1: {op1: v1}},
+                 {k1: v1, k2: {op2: v2}}]}
+
+    where op is "$gt" for ascending and "$lt" for descending keys, so each page
+    is a single range scan of an index on the sort keys.  Null and missing
+    values sort before any other value, so a descending key also matches them
+    after a non-null cursor value, e.g. {"$or": [{k1: {"$lt": v1}}, {k1: None}]}.
+
+    Args:
+        sort (list): parsed sort e.g. [('created_at', -1), ('_id', -1)]
+        cursor (dict): values of the sort keys of the last document of the previous page.
+        convert (callable): optional function (key, value) -> value applied to cursor values.
+
+    Returns:
+        dict: query
+    """
+    convert = convert or (lambda k, v: v)
+    branches = []
+    for i, (key, direction) in enumerate(sort):
+        branch = {k: convert(k, cursor.get(k)) for k, _ in sort[:i]}
+        value = convert(key, cursor.get(key))
+        if value is None:
+            # null sorts before any other value
+            if direction == -1:
+                continue
+            branch[key] = {"$ne": None}
+        elif direction == 1:
+            branch[key] = {"$gt": value}
+        else:
+            branch["$or"] = [{key: {"$lt": value}}, {key: None}]
+        branches.append(branch)
+    return {"$or": branches} if branches else {"_id": {"$exists": False}}
@@ -0,0 +1,60 @@
+import hashlib
+import json
+
+from kedro_graphql.models import Node
+
+
+def split_snapshot(values):
+    """
+    Move the template snapshot, i.e. describe and nodes, out of an encoded
+    pipeline and reference it by id instead.
+
+    Runs of the same template share an identical snapshot, so it only needs
+    to be stored once.  The id is a hash of the pipeline name, the
+    pipeline_version and the snapshot content.
+
+    Args:
+        values (dict): an encoded pipeline, see Pipeline.encode.
+
+    Returns:
+        dict: the snapshot document, None if the pipeline has no snapshot.
+    """
+    describe = values.pop("describe", None)
+    nodes = values.pop("nodes", None)
+    if describe is None and not nodes:
+        return None
+    snapshot = {"name": values.get("name"),
+                "pipeline_version": values.get("pipeline_version"),
+                "describe": describe,
+                "nodes": nodes}
+    snapshot["_id"] = hashlib.sha256(json.dumps(snapshot, sort_keys=True, default=str).encode()).hexdigest()
+    values["snapshot"] = snapshot["_id"]
+    return snapshot
+
+
+class SnapshotCache:
+    """In memory cache of decoded snapshots.
+
+    Snapshots are immutable, so entries never need to be invalidated and
+    their number is bounded by the number of template versions.
+    """
+
+    def __init__(self):
+        self.saved = set()
+        self.decoded = {}
+
+    def missing(self, raws):
+        """Ids of the snapshots referenced by raw pipelines that are not cached yet."""
+        return {r["snapshot"] for r in raws if r and r.get("snapshot") and r["snapshot"] not in self.decoded}
+
+    def add(self, snapshot):
+        self.decoded[snapshot["_id"]] = (snapshot.get("describe"),
+                                         [Node(**n) for n in snapshot.get("nodes") or []])
+
+    def apply(self, pipeline, raw):
+        """Set describe and nodes of a decoded pipeline from its snapshot."""
+        if pipeline is not None and raw.get("snapshot") in self.decoded:
+            describe, nodes = self.decoded[raw["snapshot"]]
+            pipeline.describe = describe
+            pipeline.nodes = list(nodes)
+        return pipeline
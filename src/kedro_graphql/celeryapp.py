@@ -1,6 +1,8 @@
-from celery import Celery
+from celery import Celery, current_app
 from celery import signals
 
+from .backends.cache import CachedBackend
+
 
 def celery_app(config, backend):
     app = Celery()
@@ -27,3 +29,14 @@ def on_setup_logging(**kwargs):
     #  Disable Celery logging configuration so logs are captured in info.log and error.log
     # https://docs.celeryq.dev/en/latest/userguide/tasks.html#logging
     pass
+
+
+@signals.worker_init.connect
+@signals.worker_process_init.connect
+def on_worker_init(sender=None, **kwargs):
+    # the cache of a worker must hear about the writes of the API and of the
+    # other workers, worker_process_init is sent in each child of a prefork pool
+    app = getattr(sender, "app", None) or current_app
+    backend = getattr(app, "kedro_graphql_backend", None)
+    if isinstance(backend, CachedBackend):
+        backend.cache.start()
@@ -53,7 +53,22 @@ def commands():
 @click.option(
     "--backend",
     default=config["KEDRO_GRAPHQL_BACKEND"],
-    help="The only supported value for this option is 'kedro_graphql.backends.mongodb.MongoBackend'"
+    help="Backend import path e.g. 'kedro_graphql.backends.mongodb.MongoBackend' or 'kedro_graphql.backends.sql.SQLBackend'"
+)
+@click.option(
+    "--async-backend",
+    default=config["KEDRO_GRAPHQL_ASYNC_BACKEND"],
+    help="Async backend used by the GraphQL resolvers, derived from --backend by default e.g. 'kedro_graphql.backends.mongodb.AsyncMongoBackend'"
+)
+@click.option(
+    "--backend-kwargs",
+    default=config["KEDRO_GRAPHQL_BACKEND_KWARGS"],
+    help="JSON object of keyword arguments for the backends e.g. '{\"uri\": \"sqlite:///pipelines.db\"}'"
+)
+@click.option(
+    "--backend-cache",
+    default=config["KEDRO_GRAPHQL_BACKEND_CACHE"],
+    help="Cache pipeline reads, JSON object of cache options e.g. '{\"maxsize\": 1024, \"ttl\": 5}' or 'true'"
 )
 @click.option(
     "--broker",
@@ -92,6 +107,22 @@ def commands():
     default=config["MONGO_DB_NAME"],
     help="Name to use for collection in mongo e.g. 'pipelines'"
 )
+@click.option(
+    "--mongo-indexes",
+    default=config["KEDRO_GRAPHQL_MONGO_INDEXES"],
+    help="JSON list of additional indexes for the pipelines collection e.g. '[{\"keys\": [[\"status.runner\", 1]], \"name\": \"status_runner\"}]'"
+)
+@click.option(
+    "--archive-after-days",
+    default=config["KEDRO_GRAPHQL_ARCHIVE_AFTER_DAYS"],
+    help="Age in days after which pipelines in a terminal state are moved to the archive by --archive"
+)
+@click.option(
+    "--archive",
+    is_flag=True,
+    default=False,
+    help="Archive pipelines older than --archive-after-days and exit."
+)
 @click.option(
     "--runner",
     default=config["KEDRO_GRAPHQL_RUNNER"],
@@ -127,16 +158,21 @@ def commands():
     default=False,
     help="Start a celery worker."
 )
-def gql(metadata, app, backend, broker, celery_result_backend, conf_source,
-        env, imports, mongo_uri, mongo_db_name, runner, log_tmp_dir, log_path_prefix, reload, reload_path, worker):
+def gql(metadata, app, backend, async_backend, backend_kwargs, backend_cache, broker, celery_result_backend, conf_source,
+        env, imports, mongo_uri, mongo_db_name, mongo_indexes, archive_after_days, archive, runner, log_tmp_dir, log_path_prefix, reload, reload_path, worker):
     """Commands for working with kedro-graphql."""
 
     config.update({
         "MONGO_URI": mongo_uri,
         "MONGO_DB_NAME": mongo_db_name,
+        "KEDRO_GRAPHQL_MONGO_INDEXES": mongo_indexes,
+        "KEDRO_GRAPHQL_ARCHIVE_AFTER_DAYS": archive_after_days,
         "KEDRO_GRAPHQL_IMPORTS": imports,
         "KEDRO_GRAPHQL_APP": app,
         "KEDRO_GRAPHQL_BACKEND": backend,
+        "KEDRO_GRAPHQL_ASYNC_BACKEND": async_backend,
+        "KEDRO_GRAPHQL_BACKEND_KWARGS": backend_kwargs,
+        "KEDRO_GRAPHQL_BACKEND_CACHE": backend_cache,
         "KEDRO_GRAPHQL_BROKER": broker,
         "KEDRO_GRAPHQL_CELERY_RESULT_BACKEND": celery_result_backend,
         "KEDRO_GRAPHQL_RUNNER": runner,
@@ -148,6 +184,13 @@ def gql(metadata, app, backend, broker, celery_result_backend, conf_source,
         "KEDRO_PROJECT_NAME": metadata.package_name
     })
 
+    if archive:
+        from .backends import init_backend
+        backend = init_backend(config)
+        backend.archive()
+        backend.shutdown()
+        return
+
     if not reload_path:
         reload_path = metadata.project_path.joinpath("src")
 
@@ -1,4 +1,6 @@
 import asyncio
+import contextlib
+import json
 import logging
 import time
 from queue import Empty as QueueEmptyException
@@ -6,10 +8,147 @@ from queue import Queue
 from threading import Thread
 from typing import AsyncGenerator
 
+import redis
+import redis.asyncio as redis_asyncio
 from celery.states import READY_STATES
 
 logger = logging.getLogger("kedro-graphql")
 
+PIPELINE_CHANNEL_PREFIX = "kedro_graphql:pipeline:"
+
+
+class PipelineChangePublisher:
+    """Publishes a notification on a Redis channel per pipeline whenever a
+    worker changes the pipeline, see PipelineChangeWatcher.
+    """
+
+    def __init__(self, broker_url=None):
+        """
+        Kwargs:
+            broker_url (str): URI of the redis broker e.g. "redis://localhost".
+        """
+        self.connection = redis.Redis.from_url(broker_url)
+
+    def publish(self, id, fields=None):
+        """
+        Notify watchers that a pipeline changed.  Errors are logged and not
+        raised, watchers fall back to polling if a notification is lost.
+
+        Args:
+            id (str): id of the pipeline.
+            fields (Iterable[str]): names of the changed PipelineStatus fields.
+        """
+        try:
+            self.connection.publish(PIPELINE_CHANNEL_PREFIX + str(id),
+                                    json.dumps({"id": str(id), "fields": sorted(fields or [])}))
+        except redis.RedisError as e:
+            logger.warning(f"Could not publish change of pipeline {id}: {e}")
+
+    def close(self):
+        self.connection.close()
+
+
+class PipelineChangeWatcher:
+    """Wakes up coroutines waiting for changes of a pipeline.
+
+    A single pattern subscription per process receives the notifications of
+    PipelineChangePublisher and fans them out to every local waiter, so the
+    number of open subscriptions does not add load on the broker or the
+    backend.
+
+    Example usage:
+
+        async with watcher.watch(id) as changed:
+            p = await backend.read(id=id)
+            while not p.status[-1].task_id:
+                await changed.wait()
+                p = await backend.read(id=id)
+    """
+
+    def __init__(self, broker_url=None, fallback_interval=5.0, on_change=None):
+        """
+        Kwargs:
+            broker_url (str): URI of the redis broker e.g. "redis://localhost".
+            fallback_interval (float): maximum seconds a waiter sleeps without
+                a notification, bounds the delay if a notification is lost.
+            on_change (callable): called with the id of a changed pipeline
+                before its waiters are woken up e.g. to drop it from a cache
+                so that the waiters do not read the stale pipeline again.
+        """
+        self.broker_url = broker_url
+        self.fallback_interval = fallback_interval
+        self.on_change = on_change
+        self._waiters = {}
+        self._listener = None
+
+    def _start_listener(self):
+        loop = asyncio.get_running_loop()
+        if self._listener is None or self._listener.done() or self._listener.get_loop() is not loop:
+            self._listener = loop.create_task(self._listen())
+
+    async def _listen(self):
+        connection = redis_asyncio.from_url(self.broker_url)
+        pubsub = connection.pubsub()
+        try:
+            await pubsub.psubscribe(PIPELINE_CHANNEL_PREFIX + "*")
+            async for message in pubsub.listen():
+                if message["type"] != "pmessage":
+                    continue
+                id = message["channel"].decode()[len(PIPELINE_CHANNEL_PREFIX):]
+                if self.on_change is not None and id in self._waiters:
+                    self.on_change(id)
+                for changed in self._waiters.get(id, ()):
+                    changed.set()
+        except redis.RedisError as e:
+            logger.warning(f"Pipeline change listener stopped, falling back to polling: {e}")
+        finally:
+            await pubsub.aclose()
+            await connection.aclose()
+
+    @contextlib.asynccontextmanager
+    async def watch(self, id):
+        """
+        Register interest in the changes of a pipeline.  Register before
+        reading the pipeline so that no change is missed in between.
+
+        Args:
+            id (str): id of the pipeline.
+
+        Yields:
+            PipelineChanges: await PipelineChanges.wait() for the next change.
+        """
+        self._start_listener()
+        changed = PipelineChanges(self.fallback_interval)
+        self._waiters.setdefault(str(id), set()).add(changed)
+        try:
+            yield changed
+        finally:
+            waiters = self._waiters.get(str(id), set())
+            waiters.discard(changed)
+            if not waiters:
+                self._waiters.pop(str(id), None)
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError, RuntimeError):
+                await self._listener
+            self._listener = None
+
+
+class PipelineChanges(asyncio.Event):
+    """Set by PipelineChangeWatcher when the watched pipeline changes."""
+
+    def __init__(self, fallback_interval):
+        super().__init__()
+        self.fallback_interval = fallback_interval
+
+    async def wait(self):
+        """Wait for the next change or at most fallback_interval seconds."""
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(super().wait(), self.fallback_interval)
+        self.clear()
+
 
 class PipelineEventMonitor:
     def __init__(self, app=None, task_id=None, timeout=1):
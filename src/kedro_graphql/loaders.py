@@ -0,0 +1,59 @@
+from strawberry.dataloader import DataLoader
+from strawberry.types import Info
+
+
+def pipeline_loader(info: Info) -> DataLoader:
+    """
+    The DataLoader of pipelines by id of the current GraphQL request, created on first use.
+
+    All the ids loaded while resolving one level of a query are read with a
+    single call to the backend's read_many, and each pipeline is only read
+    once per request.
+
+    :param info: The Info of the resolver.
+
+    :return: A DataLoader resolving an id to a Pipeline, or None if it does not exist.
+    """
+    context = info.context
+    if "pipeline_loader" not in context:
+        backend = context["request"].app.async_backend
+
+        async def load(ids):
+            return await backend.read_many(ids)
+
+        context["pipeline_loader"] = DataLoader(load_fn=load)
+    return context["pipeline_loader"]
+
+
+def children_loader(info: Info) -> DataLoader:
+    """
+    The DataLoader of the child pipelines by (parent id, limit) of the current
+    GraphQL request, created on first use.
+
+    The children of all the parents resolved at one level of a query are
+    listed with a single call to the backend's list_children.  They are listed
+    once per request and added to pipeline_loader, so resolving them again by
+    id does not read them again.
+
+    :param info: The Info of the resolver.
+
+    :return: A DataLoader resolving a (parent id, limit) key to the list of children.
+    """
+    context = info.context
+    if "children_loader" not in context:
+        backend = context["request"].app.async_backend
+        pipelines = pipeline_loader(info)
+
+        async def load(keys):
+            # the children of every parent of the batch are listed with a
+            # single backend query, each key then keeps its own limit
+            parents = list(dict.fromkeys(parent for parent, _ in keys))
+            listed = await backend.list_children(parents, limit=max(limit for _, limit in keys))
+            children = dict(zip(parents, listed))
+            for group in listed:
+                for child in group:
+                    pipelines.prime(str(child.id), child)
+            return [children[parent][:limit] for parent, limit in keys]
+
+        context["children_loader"] = DataLoader(load_fn=load)
+    return context["children_loader"]
@@ -1,8 +1,12 @@
 import json
 import uuid
-from copy import deepcopy
+from bisect import bisect_left
+from collections.abc import Mapping
+from dataclasses import fields
 from datetime import datetime
 from enum import Enum
+from functools import cached_property
+from types import MappingProxyType
 from typing import List, Optional
 
 import boto3
@@ -12,9 +16,11 @@ from bson.objectid import ObjectId
 from fastapi.encoders import jsonable_encoder
 from kedro.io import AbstractDataset
 from strawberry.scalars import JSON
+from strawberry.types import Info
 from strawberry.utils.str_converters import to_camel_case, to_snake_case
 
 from .config import config as CONFIG
+from .loaders import children_loader, pipeline_loader
 from .utils import parse_s3_filepath
 
 
@@ -23,11 +29,55 @@ def mark_deprecated(default=None):
     return strawberry.field(default=default, deprecation_reason="see " + str(CONFIG["KEDRO_GRAPHQL_DEPRECATIONS_DOCS"]))
 
 
+def _isoformat(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _fromisoformat(value):
+    return datetime.fromisoformat(value) if value else None
+
+
+def _local_naive(value):
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone().replace(tzinfo=None)
+    return value
+
+
+def _enum_value(value):
+    return value.value if isinstance(value, Enum) else value
+
+
 @strawberry.type
 class Tag:
     key: str
     value: str
 
+    def encode(self) -> dict:
+        return {"key": self.key, "value": self.value}
+
+
+def _encode(item):
+    """Encode an object with its encode method.  Items that are already
+    encoded, e.g. assigned from a jsonable_encoder'd input, are kept as they
+    are and other objects, e.g. inputs, fall back to jsonable_encoder."""
+    if isinstance(item, dict):
+        return item
+    encode = getattr(item, "encode", None)
+    return encode() if encode is not None else jsonable_encoder(item)
+
+
+def _encode_all(items):
+    return [_encode(i) for i in items] if items is not None else None
+
+
+def _copy_json(value):
+    """Copy parsed JSON, faster than copy.deepcopy as it only holds mappings, lists and scalars."""
+    if isinstance(value, Mapping):
+        return {k: _copy_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_copy_json(v) for v in value]
+    return value
+
 
 @strawberry.input
 class TagInput:
@@ -62,6 +112,12 @@ class Parameter:
         else:
             return Parameter(**input_dict)
 
+    def encode(self) -> dict:
+        """
+        Returns a dict of the parameter for storage, the inverse of decode.
+        """
+        return {"name": self.name, "value": self.value, "type": _enum_value(self.type)}
+
     def serialize(self) -> dict:
         """
         Returns serializable dict in format compatible with kedro.
@@ -110,6 +166,13 @@ class ParameterInput:
         return params
 
 
+@strawberry.input(description="Values of a parameter to sweep over.")
+class ParameterGridInput:
+    name: str
+    values: List[str]
+    type: Optional[ParameterType] = ParameterType.STRING
+
+
 @strawberry.input
 class CredentialSetInput:
     name: str
@@ -179,7 +242,7 @@ class DataSet:
                 }
         """
 
-        bucket_name, s3_key = parse_s3_filepath(self.config)
+        bucket_name, s3_key = parse_s3_filepath(self.parsed_config())
 
         try:
             s3_client = boto3.client('s3')
@@ -205,7 +268,7 @@ class DataSet:
             Example: https://your-bucket-name.s3.amazonaws.com/your-object-key?AWSAccessKeyId=your-access-key-id&Signature=your-signature&x-amz-security-token=your-security-token&Expires=expiration-time
         """
 
-        bucket_name, s3_key = parse_s3_filepath(self.config)
+        bucket_name, s3_key = parse_s3_filepath(self.parsed_config())
 
         try:
             s3_client = boto3.client('s3')
@@ -228,17 +291,44 @@ class DataSet:
     @strawberry.field
     def exists(self) -> bool:
         if self.config:
-            return AbstractDataset.from_config(self.name, json.loads(self.config)).exists()
+            return AbstractDataset.from_config(self.name, self.serialize()[self.name]).exists()
         else:
             return False
 
+    @staticmethod
+    def from_config(name: str, config: dict, tags: Optional[List[Tag]] = None) -> "DataSet":
+        """
+        Return a new DataSet from a kedro dataset config, the config does not
+        need to be parsed again.  A copy of the config is kept, changes to it
+        by the caller do not reach the DataSet.
+        """
+        d = DataSet(name=name, config=json.dumps(config), tags=tags)
+        d._parsed_config = (d.config, _copy_json(config))
+        return d
+
+    def parsed_config(self) -> Optional[Mapping]:
+        """
+        Returns a read-only view of the config parsed from its JSON string.  It
+        is parsed on first use and kept until the config is replaced.
+        """
+        parsed = self.__dict__.get("_parsed_config")
+        if parsed is None or parsed[0] is not self.config:
+            parsed = (self.config, json.loads(self.config) if self.config else None)
+            self._parsed_config = parsed
+        return MappingProxyType(parsed[1]) if parsed[1] is not None else None
+
     def serialize(self) -> dict:
         """
-        Returns serializable dict in format compatible with kedro.
+        Returns serializable dict in format compatible with kedro, with a copy
+        of the parsed config the caller may modify.
         """
-        temp = self.__dict__.copy()
-        temp.pop("name")
-        return {self.name: json.loads(temp['config'])}
+        return {self.name: _copy_json(self.parsed_config())}
+
+    def encode(self) -> dict:
+        """
+        Returns a dict of the dataset for storage, the inverse of decode.
+        """
+        return {"name": self.name, "config": self.config, "tags": _encode_all(self.tags)}
 
     @staticmethod
     def decode(payload):
@@ -314,6 +404,73 @@ class Node:
     outputs: List[str]
     tags: List[str]
 
+    def encode(self) -> dict:
+        return {"name": self.name, "inputs": list(self.inputs), "outputs": list(self.outputs), "tags": list(self.tags)}
+
+
+class PipelineTemplateMetadata:
+    """
+    The describe, nodes, parameters, inputs and outputs of a pipeline template,
+    each computed once from the kedro pipeline and served by the
+    PipelineTemplate resolvers.  The values are tuples and are not modified
+    after they are built.
+
+    A value that cannot be computed e.g. the parameters of a pipeline with a
+    params: input missing from the parameters is not cached, it raises
+    whenever it is resolved.
+    """
+
+    # the values computed up front by compute
+    FIELDS = ("describe", "nodes", "parameters", "inputs", "outputs")
+
+    def __init__(self, kedro_pipeline, kedro_catalog, kedro_parameters):
+        self.kedro_pipeline = kedro_pipeline
+        self.kedro_catalog = kedro_catalog
+        self.kedro_parameters = kedro_parameters
+
+    def compute(self):
+        """Compute every value that can be computed up front."""
+        for field in self.FIELDS:
+            try:
+                getattr(self, field)
+            except KeyError:
+                pass
+        return self
+
+    @cached_property
+    def describe(self):
+        return self.kedro_pipeline.describe()
+
+    @cached_property
+    def nodes(self):
+        return tuple(Node(name=n.name, inputs=list(n.inputs), outputs=list(n.outputs), tags=list(n.tags))
+                     for n in self.kedro_pipeline.nodes)
+
+    @cached_property
+    def parameters(self):
+        # keep track of parameters to avoid returning duplicates
+        params = {}
+        for n in self.kedro_pipeline.all_inputs():
+            if n.startswith("params:"):
+                name = n.split("params:")[1]
+                value = self.kedro_parameters[name]
+                if not params.get(name, False):
+                    params[name] = value
+            elif n == "parameters":
+                for k, v in self.kedro_parameters.items():
+                    if not params.get(k, False):
+                        params[k] = v
+        return tuple(Parameter(name=k, value=v) for k, v in params.items())
+
+    @cached_property
+    def inputs(self):
+        return tuple(DataSet.from_config(n, self.kedro_catalog[n]) for n in self.kedro_pipeline.all_inputs()
+                     if not n.startswith("params:") and n != "parameters")
+
+    @cached_property
+    def outputs(self):
+        return tuple(DataSet.from_config(n, self.kedro_catalog[n]) for n in self.kedro_pipeline.all_outputs())
+
 
 @strawberry.type(description="PipelineTemplates are definitions of Pipelines.  They represent the supported interface for executing a Pipeline.")
 class PipelineTemplate:
@@ -322,51 +479,34 @@ class PipelineTemplate:
     kedro_pipelines: strawberry.Private[dict]
     kedro_catalog: strawberry.Private[dict]
     kedro_parameters: strawberry.Private[dict]
+    metadata: strawberry.Private[Optional[PipelineTemplateMetadata]] = None
+
+    def get_metadata(self) -> PipelineTemplateMetadata:
+        """The metadata of the template, built on first use unless the index computed it."""
+        if self.metadata is None:
+            self.metadata = PipelineTemplateMetadata(self.kedro_pipelines[self.name],
+                                                     self.kedro_catalog, self.kedro_parameters)
+        return self.metadata
 
     @strawberry.field
     def describe(self) -> str:
-        return self.kedro_pipelines[self.name].describe()
+        return self.get_metadata().describe
 
     @strawberry.field
     def nodes(self) -> List[Node]:
-        nodes = self.kedro_pipelines[self.name].nodes
-
-        return [Node(name=n.name, inputs=n.inputs, outputs=n.outputs, tags=n.tags) for n in nodes]
+        return self.get_metadata().nodes
 
     @strawberry.field
     def parameters(self) -> List[Parameter]:
-        # keep track of parameters to avoid returning duplicates
-        params = {}
-        for n in self.kedro_pipelines[self.name].all_inputs():
-            if n.startswith("params:"):
-                name = n.split("params:")[1]
-                value = self.kedro_parameters[name]
-                if not params.get(name, False):
-                    params[name] = value
-            elif n == "parameters":
-                for k, v in self.kedro_parameters.items():
-                    if not params.get(k, False):
-                        params[k] = v
-        return [Parameter(name=k, value=v) for k, v in params.items()]
+        return self.get_metadata().parameters
 
     @strawberry.field
     def inputs(self) -> List[DataSet]:
-        inputs_resolved = []
-        for n in self.kedro_pipelines[self.name].all_inputs():
-            if not n.startswith("params:") and n != "parameters":
-                config = self.kedro_catalog[n]
-                inputs_resolved.append(DataSet(name=n, config=json.dumps(config)))
-
-        return inputs_resolved
+        return self.get_metadata().inputs
 
     @strawberry.field
     def outputs(self) -> List[DataSet]:
-        outputs_resolved = []
-        for n in self.kedro_pipelines[self.name].all_outputs():
-            config = self.kedro_catalog[n]
-            outputs_resolved.append(DataSet(name=n, config=json.dumps(config)))
-
-        return outputs_resolved
+        return self.get_metadata().outputs
 
 
 @strawberry.type
@@ -374,6 +514,46 @@ class PageMeta:
     next_cursor: Optional[str] = strawberry.field(
         description="The next cursor to continue with."
     )
+    has_previous: Optional[bool] = strawberry.field(
+        default=None,
+        description="Whether there are results before this page."
+    )
+    total_count: Optional[int] = strawberry.field(
+        default=None,
+        description="The total number of results matching the filter, only computed when selected."
+    )
+
+
+class PipelineTemplateIndex:
+    """
+    The PipelineTemplates of a project by id and by name, with their ids
+    sorted for cursor pagination.  Iterating it yields the templates in id
+    order, like the list it replaces.
+    """
+
+    def __init__(self, templates):
+        self.templates = sorted(templates, key=lambda t: str(t.id))
+        self.ids = [str(t.id) for t in self.templates]
+        self.by_id = {str(t.id): t for t in self.templates}
+        self.by_name = {t.name: t for t in self.templates}
+
+    def __iter__(self):
+        return iter(self.templates)
+
+    def __len__(self):
+        return len(self.templates)
+
+    def __getitem__(self, index):
+        return self.templates[index]
+
+    def get(self, id: str = None, name: str = None) -> Optional["PipelineTemplate"]:
+        """The template with an id or a name, None if there is none."""
+        return self.by_id.get(str(id)) if id is not None else self.by_name.get(name)
+
+    def page(self, cursor: str = None, limit: int = 10) -> List["PipelineTemplate"]:
+        """Up to limit templates starting at the id cursor, or at the first template."""
+        start = bisect_left(self.ids, str(cursor)) if cursor is not None else 0
+        return self.templates[start:start + limit]
 
 
 @strawberry.type
@@ -385,6 +565,12 @@ class PipelineTemplates:
     @staticmethod
     def _build_pipeline_index(kedro_pipelines, kedro_catalog, kedro_parameters):
         """
+        Build a PipelineTemplate for each pipeline of the registry with its
+        metadata computed up front, so resolvers do not walk the kedro
+        pipelines on every request.
+
+        Returns:
+            PipelineTemplateIndex: the templates by id and by name.
         """
         pipes = []
         count = 100000000000000000000000
@@ -393,10 +579,12 @@ class PipelineTemplates:
                                           id=ObjectId(str(count)),
                                           kedro_pipelines=kedro_pipelines,
                                           kedro_catalog=kedro_catalog,
-                                          kedro_parameters=kedro_parameters))
+                                          kedro_parameters=kedro_parameters,
+                                          metadata=PipelineTemplateMetadata(
+                                              v, kedro_catalog, kedro_parameters).compute()))
             count += 1
 
-        return pipes
+        return PipelineTemplateIndex(pipes)
 
 
 @strawberry.enum
@@ -433,6 +621,7 @@ class PipelineInput:
     runner: Optional[str] = None
     slices: Optional[List[PipelineSlice]] = None
     only_missing: Optional[bool] = False
+    version: Optional[int] = strawberry.field(default=None, description="Version of the pipeline the update is based on, the update fails if the pipeline was modified since.")
 
     @staticmethod
     def create(name=None, data_catalog=None, parameters=None, tags=None):
@@ -531,6 +720,54 @@ class PipelineStatus:
     task_einfo: Optional[str] = None
     task_result: Optional[str] = None
 
+    def encode(self) -> dict:
+        """
+        Returns a dict of the status for storage, the inverse of decode.
+        """
+        return {
+            "state": _enum_value(self.state),
+            "session": self.session,
+            "runner": self.runner,
+            "filtered_nodes": list(self.filtered_nodes) if self.filtered_nodes is not None else None,
+            "started_at": _isoformat(self.started_at),
+            "finished_at": _isoformat(self.finished_at),
+            "task_id": self.task_id,
+            "task_name": self.task_name,
+            "task_args": self.task_args,
+            "task_kwargs": self.task_kwargs,
+            "task_request": self.task_request,
+            "task_exception": self.task_exception,
+            "task_traceback": self.task_traceback,
+            "task_einfo": self.task_einfo,
+            "task_result": self.task_result,
+        }
+
+    @staticmethod
+    def decode(payload):
+        """
+        Return a new PipelineStatus from a dictionary, fields missing from a
+        partial document are left unset.
+        """
+        get = payload.get
+        state = get("state")
+        return PipelineStatus(
+            state=State[state] if state else None,
+            session=get("session"),
+            runner=get("runner", "kedro.runner.SequentialRunner"),
+            filtered_nodes=get("filtered_nodes"),
+            started_at=_fromisoformat(get("started_at")),
+            finished_at=_fromisoformat(get("finished_at")),
+            task_name=get("task_name"),
+            task_id=get("task_id"),
+            task_args=get("task_args"),
+            task_kwargs=get("task_kwargs"),
+            task_request=get("task_request"),
+            task_exception=get("task_exception"),
+            task_traceback=get("task_traceback"),
+            task_einfo=get("task_einfo"),
+            task_result=get("task_result")
+        )
+
 
 @strawberry.type
 class Pipeline:
@@ -547,6 +784,17 @@ class Pipeline:
     project_version: Optional[str] = None
     pipeline_version: Optional[str] = None
     kedro_graphql_version: Optional[str] = None
+    version: int = strawberry.field(default=0, description="Incremented on every write of the pipeline.")
+
+    @strawberry.field(description="The parent pipeline, the parents of all pipelines of a request are read in one backend call.")
+    async def parent_pipeline(self, info: Info) -> Optional["Pipeline"]:
+        if self.parent is None:
+            return None
+        return await pipeline_loader(info).load(str(self.parent))
+
+    @strawberry.field(description="The child pipelines, oldest first.")
+    async def children(self, info: Info, limit: int = 100) -> List["Pipeline"]:
+        return await children_loader(info).load((str(self.id), limit))
 
     def serialize(self):
         parameters = {}
@@ -572,11 +820,25 @@ class Pipeline:
     def encode(self, encoder="dict"):
 
         if encoder == "dict":
-            p = deepcopy(self)
-            p.id = str(p.id)  # if type ObjectID the jsonable_encoder will throw an error
-            encoded_pipeline = jsonable_encoder(p)
-
-            return encoded_pipeline
+            # written out field by field, deepcopy and jsonable_encoder were the
+            # most expensive part of every backend write; parent_pipeline and
+            # children are resolved from other pipelines and not stored
+            return {
+                "id": str(self.id),
+                "name": self.name,
+                "data_catalog": _encode_all(self.data_catalog),
+                "describe": self.describe,
+                "nodes": _encode_all(self.nodes),
+                "parameters": _encode_all(self.parameters),
+                "status": _encode_all(self.status),
+                "tags": _encode_all(self.tags),
+                "created_at": _isoformat(self.created_at),
+                "parent": str(self.parent) if self.parent is not None else None,
+                "project_version": self.project_version,
+                "pipeline_version": self.pipeline_version,
+                "kedro_graphql_version": self.kedro_graphql_version,
+                "version": self.version,
+            }
         elif encoder == "kedro":
             return self.serialize()
         else:
@@ -603,54 +865,26 @@ class Pipeline:
 
     @staticmethod
     def decode_dict(payload):
-        if payload.get("tags", None):
-            tags = [Tag(**t) for t in payload["tags"]]
-        else:
-            tags = None
-
-        if payload.get("data_catalog", None):
-            data_catalog = [DataSet.decode(d) for d in payload["data_catalog"]]
-        else:
-            data_catalog = []
-
-        if payload.get("status", None):
-            status = [PipelineStatus(
-                state=State[s["state"]],
-                session=s["session"],
-                runner=s.get("runner", "kedro.runner.SequentialRunner"),
-                filtered_nodes=s.get("filtered_nodes"),
-                started_at=datetime.fromisoformat(s["started_at"]) if s.get("started_at") else None,
-                finished_at=datetime.fromisoformat(s["finished_at"]) if s.get("finished_at") else None,
-                task_name=s.get("task_name"),
-                task_id=s.get("task_id"),
-                task_args=s.get("task_args"),
-                task_kwargs=s.get("task_kwargs"),
-                task_request=s.get("task_request"),
-                task_exception=s.get("task_exception"),
-                task_traceback=s.get("task_traceback"),
-                task_einfo=s.get("task_einfo"),
-                task_result=s.get("task_result")
-            ) for s in payload["status"]]
-        else:
-            status = []
-
-        if payload.get("parameters", None):
-            parameters = [Parameter.decode(p) for p in payload["parameters"]]
-        else:
-            parameters = None
+        """Create a Pipeline from a dictionary.
 
+        Partial documents, e.g. the result of a backend read with a projection,
+        are supported and missing fields are left unset.
+        """
         return Pipeline(
             id=payload.get("id", None),
-            name=payload["name"],
-            data_catalog=data_catalog,
-            parameters=parameters,
-            status=status,
-            tags=tags,
-            created_at=datetime.fromisoformat(payload["created_at"]) if payload.get("created_at", None) else None,
+            name=payload.get("name", None),
+            data_catalog=_decode_data_catalog(payload),
+            describe=payload.get("describe", None),
+            nodes=_decode_nodes(payload),
+            parameters=_decode_parameters(payload),
+            status=_decode_status(payload),
+            tags=_decode_tags(payload),
+            created_at=_fromisoformat(payload.get("created_at", None)),
             parent=payload.get("parent", None),
             project_version=payload.get("project_version", None),
             pipeline_version=payload.get("pipeline_version", None),
-            kedro_graphql_version=payload.get("kedro_graphql_version", None)
+            kedro_graphql_version=payload.get("kedro_graphql_version", None),
+            version=payload.get("version") or 0
         )
 
     @classmethod
@@ -662,6 +896,84 @@ class Pipeline:
 
 
 
+def _decode_tags(payload):
+    return [Tag(**t) for t in payload["tags"]] if payload.get("tags", None) else None
+
+
+def _decode_data_catalog(payload):
+    return [DataSet.decode(d) for d in payload["data_catalog"]] if payload.get("data_catalog", None) else []
+
+
+def _decode_status(payload):
+    return [PipelineStatus.decode(s) for s in payload["status"]] if payload.get("status", None) else []
+
+
+def _decode_parameters(payload):
+    return [Parameter.decode(p) for p in payload["parameters"]] if payload.get("parameters", None) else None
+
+
+def _decode_nodes(payload):
+    # nodes of documents written before 1.1.0 hold kedro Node internals and are skipped
+    if payload.get("nodes", None) and all("name" in n for n in payload["nodes"]):
+        return [Node(**n) for n in payload["nodes"]]
+    return None
+
+
+class _LazyField:
+    """A field of a LazyPipeline decoded from the raw document on first access."""
+
+    def __init__(self, decode):
+        self.decode = decode
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, pipeline, owner=None):
+        if pipeline is None:
+            return self
+        values = pipeline.__dict__
+        if self.name not in values:
+            values[self.name] = self.decode(pipeline._raw)
+        return values[self.name]
+
+    def __set__(self, pipeline, value):
+        pipeline.__dict__[self.name] = value
+
+
+class LazyPipeline(Pipeline):
+    """A Pipeline over a raw document, e.g. returned by a MongoDB query.
+
+    The scalar fields are set when it is created, the nested lists
+    data_catalog, nodes, parameters, status and tags are decoded when they
+    are first accessed and then kept, so a query or a worker hook only
+    decodes the fields it uses.  A LazyPipeline is equal to a Pipeline with
+    the same values.
+    """
+
+    data_catalog = _LazyField(_decode_data_catalog)
+    nodes = _LazyField(_decode_nodes)
+    parameters = _LazyField(_decode_parameters)
+    status = _LazyField(_decode_status)
+    tags = _LazyField(_decode_tags)
+
+    def __init__(self, payload):
+        self._raw = payload
+        self.id = payload.get("id", None)
+        self.name = payload.get("name", None)
+        self.describe = payload.get("describe", None)
+        self.created_at = _fromisoformat(payload.get("created_at", None))
+        self.parent = payload.get("parent", None)
+        self.project_version = payload.get("project_version", None)
+        self.pipeline_version = payload.get("pipeline_version", None)
+        self.kedro_graphql_version = payload.get("kedro_graphql_version", None)
+        self.version = payload.get("version") or 0
+
+    def __eq__(self, other):
+        if not isinstance(other, Pipeline):
+            return NotImplemented
+        return all(getattr(self, f.name) == getattr(other, f.name) for f in fields(Pipeline) if f.compare)
+
+
 @strawberry.type
 class Pipelines:
     pipelines: List[Pipeline] = strawberry.field(description="The list of pipeline instances.")
@@ -678,6 +990,82 @@ class Pipelines:
         else:
             raise TypeError("decoder must be 'graphql'")
 
+@strawberry.input(description="Typed filter on pipelines, all conditions must match.  Backends compile it into a query that can use their indexes.")
+class PipelineFilterInput:
+    name: Optional[str] = None
+    state: Optional[State] = strawberry.field(default=None, description="State of the latest PipelineStatus.")
+    tags: Optional[List[TagInput]] = strawberry.field(default=None, description="Pipelines having all of these tags.")
+    created_after: Optional[datetime] = strawberry.field(default=None, description="Inclusive lower bound of created_at.")
+    created_before: Optional[datetime] = strawberry.field(default=None, description="Exclusive upper bound of created_at.")
+    parent: Optional[str] = None
+
+    def created_bounds(self):
+        """
+        created_after and created_before as isoformat strings comparable with
+        the stored created_at values, which are naive local times.  Timezone
+        aware bounds e.g. 2025-03-01T12:00:00Z are converted to local time.
+        """
+        return tuple(_isoformat(_local_naive(d)) for d in (self.created_after, self.created_before))
+
+
+@strawberry.type(description="Query plan chosen by the backend for a readPipelines query.")
+class PipelinesQueryPlan:
+    query: JSON = strawberry.field(description="The query sent to the backend.")
+    indexes: List[str] = strawberry.field(description="Names of the indexes used, empty for a full collection scan.")
+    keys_examined: Optional[int] = None
+    docs_examined: Optional[int] = None
+    returned: Optional[int] = None
+    execution_time_ms: Optional[int] = None
+    plan: JSON = strawberry.field(description="The raw winning plan.")
+
+
+@strawberry.enum
+class LineageDirection(Enum):
+    ANCESTORS = "ancestors"
+    DESCENDANTS = "descendants"
+
+
+@strawberry.type(description="A pipeline of the lineage of another pipeline.")
+class PipelineLineageEntry:
+    depth: int = strawberry.field(description="Number of parent links between the two pipelines, 1 for the parent or a child.")
+    pipeline: Pipeline
+
+
+@strawberry.enum
+class PipelineStatsGroupBy(Enum):
+    NAME = "name"
+    STATE = "state"
+    TAG = "tag"
+    DAY = "day"
+
+
+@strawberry.type(description="Run statistics of a group of pipelines computed from their latest PipelineStatus.")
+class PipelineStats:
+    group: JSON = strawberry.field(description="Values of the group by keys e.g. {\"name\": \"example00\", \"day\": \"2025-03-01\"}.")
+    count: int
+    state_counts: JSON = strawberry.field(description="Number of pipelines by latest state e.g. {\"SUCCESS\": 10, \"FAILURE\": 2}.")
+    failure_rate: Optional[float] = strawberry.field(default=None, description="FAILURE count divided by the count of pipelines in a READY_STATE.")
+    duration_p50: Optional[float] = strawberry.field(default=None, description="Median of finished_at - started_at in seconds.")
+    duration_p95: Optional[float] = strawberry.field(default=None, description="95th percentile of finished_at - started_at in seconds.")
+    duration_p99: Optional[float] = strawberry.field(default=None, description="99th percentile of finished_at - started_at in seconds.")
+
+
+# Tag of the parent and child pipelines of a parameter sweep, the value is the name of the sweep
+SWEEP_TAG = "kedro-graphql.sweep"
+# Tag marking the parent pipeline of a parameter sweep, a handle of the sweep that is never run itself
+SWEEP_PARENT_TAG = "kedro-graphql.sweep.parent"
+
+
+@strawberry.type(description="A parameter sweep, stored as a parent pipeline with one child pipeline per combination of the grid.")
+class ParameterSweep:
+    id: str = strawberry.field(description="ID of the parent pipeline of the sweep.")
+    name: str
+    total: int = strawberry.field(description="Number of child pipelines.")
+    state_counts: JSON = strawberry.field(description="Number of child pipelines by latest state e.g. {\"SUCCESS\": 10, \"STARTED\": 4}.")
+    finished: int = strawberry.field(description="Number of child pipelines in a SUCCESS, FAILURE or REVOKED state.")
+    progress: float = strawberry.field(description="finished divided by total.")
+
+
 @strawberry.type
 class PipelineEvent:
     id: str
@@ -1,40 +1,57 @@
-import asyncio
+import itertools
+import json
 from base64 import b64decode, b64encode
 from datetime import datetime
 from importlib import import_module
-from typing import Optional, Union
+from typing import Annotated, List, Optional, Union
 from collections.abc import AsyncGenerator, Iterable
+from dataclasses import replace
 from graphql.execution import ExecutionContext as GraphQLExecutionContext
 
 import strawberry
-from bson.objectid import ObjectId
-from celery.states import UNREADY_STATES
+from celery import group
+from celery.states import READY_STATES, UNREADY_STATES
 from fastapi.encoders import jsonable_encoder
-from kedro.framework.project import pipelines
 from strawberry.extensions import SchemaExtension
 from strawberry.tools import merge_types
 from strawberry.types import Info
+from strawberry.types.nodes import FragmentSpread, InlineFragment
+from strawberry.utils.str_converters import to_snake_case
 from strawberry.directive import StrawberryDirective
 from strawberry.types.base import StrawberryType
 from strawberry.types.scalar import ScalarDefinition, ScalarWrapper
 from strawberry.schema.config import StrawberryConfig
 
 from . import __version__ as kedro_graphql_version
+from .backends.pagination import cursor_values, parse_sort
 from .config import config
 from .events import PipelineEventMonitor
 from .hooks import InvalidPipeline
 from .logs.logger import PipelineLogStream, logger
 from .models import (
+    LineageDirection,
     PageMeta,
+    ParameterGridInput,
+    ParameterInput,
+    ParameterSweep,
     Pipeline,
     PipelineEvent,
+    PipelineFilterInput,
     PipelineInput,
+    PipelineInputStatus,
+    PipelineLineageEntry,
     PipelineLogMessage,
     Pipelines,
+    PipelinesQueryPlan,
+    PipelineStats,
+    PipelineStatsGroupBy,
     PipelineStatus,
     PipelineTemplate,
     PipelineTemplates,
+    SWEEP_PARENT_TAG,
+    SWEEP_TAG,
     State,
+    TagInput,
 )
 from .tasks import run_pipeline
 
@@ -62,32 +79,124 @@ def decode_cursor(cursor: str) -> int:
     return cursor_data.split(":")[1]
 
 
+def encode_keyset_cursor(values: dict) -> str:
+    """
+    Encodes the sort key values of the last item of a page into a cursor.
+
+    :param values: The sort key values e.g. {"created_at": "2025-03-01T12:00:00", "_id": "67c2f0..."}.
+
+    :return: The encoded cursor.
+    """
+    return b64encode(f"cursor:{json.dumps(values)}".encode("utf-8")).decode("ascii")
+
+
+def decode_keyset_cursor(cursor: str) -> Union[dict, str]:
+    """
+    Decodes the sort key values from the given cursor.
+
+    :param cursor: The cursor to decode.
+
+    :return: The decoded sort key values, or the pipeline id for cursors
+        created with encode_cursor.
+    """
+    cursor_data = b64decode(cursor.encode("ascii")).decode("utf-8").split(":", 1)[1]
+    if cursor_data.startswith("{"):
+        return json.loads(cursor_data)
+    return cursor_data
+
+
+# Pipeline fields persisted by the backend that can be projected
+PIPELINE_DOCUMENT_FIELDS = {"name", "data_catalog", "describe", "nodes", "parameters", "status", "tags",
+                            "created_at", "parent", "project_version", "pipeline_version",
+                            "kedro_graphql_version", "version"}
+
+# Pipeline fields resolved from other pipelines and the stored field each needs
+PIPELINE_RELATION_FIELDS = {"parent_pipeline": "parent", "children": None}
+
+
+def _flatten_selections(selections):
+    for s in selections:
+        if isinstance(s, (FragmentSpread, InlineFragment)):
+            yield from _flatten_selections(s.selections)
+        else:
+            yield s
+
+
+def pipeline_projection(selections, status_limit: Optional[int] = None) -> Optional[dict]:
+    """
+    Builds a backend projection from the fields selected on a Pipeline.
+
+    :param selections: The selected fields of a Pipeline e.g. info.selected_fields[0].selections.
+    :param status_limit: Only return the most recent N status entries.
+
+    :return: A projection like {"name": 1, "status.state": 1} or None if the
+        selection contains a field that is not stored in the backend.
+    """
+    projection = {"name": 1}
+    for f in _flatten_selections(selections):
+        if f.name in ("id", "__typename"):
+            continue
+        field = to_snake_case(f.name)
+        if field in PIPELINE_RELATION_FIELDS:
+            if PIPELINE_RELATION_FIELDS[field]:
+                projection[PIPELINE_RELATION_FIELDS[field]] = 1
+            continue
+        if field not in PIPELINE_DOCUMENT_FIELDS:
+            return None
+        if field in ("describe", "nodes"):
+            # stored once per template in a snapshot referenced by the pipeline
+            projection["snapshot"] = 1
+        if field == "status" and not status_limit:
+            for s in _flatten_selections(f.selections):
+                if s.name != "__typename":
+                    projection["status." + to_snake_case(s.name)] = 1
+        else:
+            projection[field] = 1
+
+    if status_limit:
+        projection["status"] = {"$slice": -status_limit}
+    return projection
+
+
+FILTER_DEPRECATION = "Use 'where', raw JSON filters cannot be checked against the backend indexes."
+LegacyFilter = Annotated[Optional[str], strawberry.argument(
+    description="A MongoDB query document as a JSON string.", deprecation_reason=FILTER_DEPRECATION)]
+
+
+def _pipeline_filter(where: Optional[PipelineFilterInput], filter: Optional[str]):
+    """Returns the filter to pass to the backend, the typed one if given."""
+    if where is not None and filter:
+        raise InvalidPipeline("Use either the 'where' or the 'filter' argument, not both.")
+    return where if where is not None else filter
+
+
+def _selection(selections, name):
+    for s in _flatten_selections(selections):
+        if s.name == name:
+            return s.selections
+    return []
+
+
 @strawberry.type
 class Query:
 
-    @strawberry.field(description="Get a pipeline template.")
-    def pipeline_template(self, info: Info, id: str) -> PipelineTemplate:
-        for p in info.context["request"].app.kedro_pipelines_index:
-            print(p.id, type(p.id))
-            if p.id == id:
-                return p
+    @strawberry.field(description="Get a pipeline template by id or by name.")
+    def pipeline_template(self, info: Info, id: Optional[str] = None, name: Optional[str] = None) -> PipelineTemplate:
+        if (id is None) == (name is None):
+            raise InvalidPipeline("Use either the 'id' or the 'name' argument.")
+        template = info.context["request"].app.kedro_pipelines_index.get(id=id, name=name)
+        if template is None:
+            raise InvalidPipeline(f"Pipeline template {id or name} does not exist in the project.")
+        return template
 
     @strawberry.field(description="Get a list of pipeline templates.")
     def pipeline_templates(self, info: Info, limit: int, cursor: Optional[str] = None) -> PipelineTemplates:
-        if cursor is not None:
-            # decode the user ID from the given cursor.
-            pipe_id = ObjectId(decode_cursor(cursor=cursor))
-        else:
-            # unix epoch Jan 1, 1970 as objectId
-            pipe_id = ObjectId("100000000000000000000000")
-
-        # filter the pipeline template data, going through the next set of results.
-        filtered_data = [pipe for pipe in info.context["request"].app.kedro_pipelines_index
-                         if pipe.id.generation_time >= pipe_id.generation_time]
+        # the id of the first template of the page, decoded from the given cursor
+        pipe_id = decode_cursor(cursor=cursor) if cursor is not None else None
 
         # slice the relevant pipeline template data (Here, we also slice an
         # additional pipe instance, to prepare the next cursor).
-        sliced_pipes = filtered_data[: limit + 1]
+        sliced_pipes = info.context["request"].app.kedro_pipelines_index.page(cursor=pipe_id, limit=limit + 1)
 
         if len(sliced_pipes) > limit:
             # calculate the client's next cursor.
@@ -103,9 +212,10 @@ class Query:
         )
 
     @strawberry.field(description="Get a pipeline instance.")
-    def read_pipeline(self, id: str, info: Info) -> Pipeline:
+    async def read_pipeline(self, id: str, info: Info, archived: bool = False) -> Pipeline:
+        projection = pipeline_projection(info.selected_fields[0].selections)
         try:
-            p = info.context["request"].app.backend.read(id=id)
+            p = await info.context["request"].app.async_backend.read(id=id, projection=projection, archived=archived)
             if p is None:
                 raise InvalidPipeline(f"Pipeline {id} does not exist in the project.")
         except Exception as e:
@@ -113,118 +223,184 @@ class Query:
 
         return p
 
+    @strawberry.field(description="Get pipeline instances by id, in the order of ids, null for ids that do not exist.")
+    async def pipelines_by_ids(self, ids: List[str], info: Info) -> List[Optional[Pipeline]]:
+        projection = pipeline_projection(info.selected_fields[0].selections)
+        try:
+            return await info.context["request"].app.async_backend.read_many(ids, projection=projection)
+        except Exception as e:
+            raise InvalidPipeline(f"Error retrieving pipelines {ids}: {e}")
+
+    @strawberry.field(description="Get the progress of a parameter sweep.")
+    async def parameter_sweep(self, id: str, info: Info) -> ParameterSweep:
+        backend = info.context["request"].app.async_backend
+        parent = await backend.read(id=id, projection={"name": 1, "tags": 1})
+        if parent is None or not _is_sweep_parent(parent):
+            raise InvalidPipeline(f"Parameter sweep {id} does not exist.")
+        return await _sweep_progress(backend, parent)
+
+    @strawberry.field(description="Get the ancestors or the descendants of a pipeline following parent links, "
+                      "ordered by depth, with a single backend query.")
+    async def pipeline_lineage(self, id: str, info: Info, direction: LineageDirection = LineageDirection.ANCESTORS,
+                               max_depth: Optional[int] = None) -> List[PipelineLineageEntry]:
+        if max_depth is not None and max_depth < 1:
+            raise InvalidPipeline("maxDepth must be at least 1.")
+        projection = pipeline_projection(_selection(info.selected_fields[0].selections, "pipeline"))
+        try:
+            return await info.context["request"].app.async_backend.lineage(
+                id=id, direction=direction.value, max_depth=max_depth, projection=projection)
+        except Exception as e:
+            raise InvalidPipeline(f"Error retrieving the lineage of pipeline {id}: {e}")
+
     @strawberry.field(description="Get a list of pipeline instances.")
-    def read_pipelines(self, info: Info, limit: int, cursor: Optional[str] = None, filter: Optional[str] = "",
-                       sort: Optional[str] = "") -> Pipelines:
+    async def read_pipelines(self, info: Info, limit: int, cursor: Optional[str] = None, filter: LegacyFilter = "",
+                             sort: Optional[str] = "", status_limit: Optional[int] = None,
+                             archived: bool = False, where: Optional[PipelineFilterInput] = None) -> Pipelines:
+        if limit < 1:
+            raise InvalidPipeline("limit must be at least 1.")
+        filter = _pipeline_filter(where, filter)
         if cursor is not None:
-            # decode the user ID from the given cursor.
-            pipe_id = decode_cursor(cursor=cursor)
+            # decode the sort key values of the last pipeline of the previous page
+            pipe_cursor = decode_keyset_cursor(cursor=cursor)
         else:
-            pipe_id = "000000000000000000000000"  # unix epoch Jan 1, 1970 as objectId
+            pipe_cursor = None
+
+        sort_keys = parse_sort(sort)
+        projection = pipeline_projection(_selection(info.selected_fields[0].selections, "pipelines"),
+                                         status_limit=status_limit)
+        if projection is not None:
+            # the sort keys are needed to build the next cursor
+            projection.update({k: 1 for k, _ in sort_keys if k != "_id"})
 
-        results = info.context["request"].app.backend.list(
-            cursor=pipe_id, limit=limit + 1, filter=filter, sort=sort)
+        results = await info.context["request"].app.async_backend.list(
+            cursor=pipe_cursor, limit=limit + 1, filter=filter, sort=sort, projection=projection, archived=archived)
 
         if len(results) > limit:
-            # calculate the client's next cursor.
-            last_pipe = results.pop(-1)
-            next_cursor = encode_cursor(id=last_pipe.id)
+            # calculate the client's next cursor from the last pipeline of this page.
+            results.pop(-1)
+            next_cursor = encode_keyset_cursor(cursor_values(results[-1], sort_keys))
         else:
             # We have reached the last page, and
             # don't have the next cursor.
             next_cursor = None
 
+        page_meta = PageMeta(next_cursor=next_cursor, has_previous=cursor is not None)
+        page_meta_fields = _flatten_selections(_selection(info.selected_fields[0].selections, "pageMeta"))
+        if "totalCount" in [f.name for f in page_meta_fields]:
+            page_meta.total_count = await info.context["request"].app.async_backend.count(filter=filter,
+                                                                                          archived=archived)
+
         return Pipelines(
-            pipelines=results, page_meta=PageMeta(next_cursor=next_cursor)
+            pipelines=results, page_meta=page_meta
         )
 
+    @strawberry.field(description="Get run statistics of pipeline instances, computed by the backend.")
+    async def pipeline_stats(self, info: Info, filter: LegacyFilter = "",
+                             group_by: Optional[List[PipelineStatsGroupBy]] = None,
+                             where: Optional[PipelineFilterInput] = None) -> List[PipelineStats]:
+        try:
+            return await info.context["request"].app.async_backend.aggregate(
+                filter=_pipeline_filter(where, filter), group_by=[g.value for g in group_by or []])
+        except ValueError as e:
+            raise InvalidPipeline(f"Error computing pipeline stats: {e}")
+        except NotImplementedError:
+            raise InvalidPipeline("The backend does not support pipeline stats.")
+
+    @strawberry.field(description="Explain how the backend executes a readPipelines query with the same arguments.")
+    async def explain_pipelines_query(self, info: Info, limit: int, cursor: Optional[str] = None,
+                                      filter: LegacyFilter = "", sort: Optional[str] = "",
+                                      where: Optional[PipelineFilterInput] = None) -> PipelinesQueryPlan:
+        try:
+            return await info.context["request"].app.async_backend.explain(
+                cursor=decode_keyset_cursor(cursor=cursor) if cursor is not None else None,
+                limit=limit + 1, filter=_pipeline_filter(where, filter), sort=sort)
+        except NotImplementedError:
+            raise InvalidPipeline("The backend does not support explaining queries.")
+
 
 @strawberry.type
 class Mutation:
     @strawberry.mutation(description="Execute a pipeline.")
-    def create_pipeline(self, pipeline: PipelineInput, info: Info) -> Pipeline:
+    async def create_pipeline(self, pipeline: PipelineInput, info: Info) -> Pipeline:
         """
         - is validation against template needed, e.g. check DataSet type or at least check dataset names
         """
+        app = info.context["request"].app
+        p, d = _new_pipeline(pipeline, app)
+        p = await app.async_backend.create(p)
+        if p.status[-1].state == State.READY:
+            _run_pipeline(p, d, app.config["KEDRO_GRAPHQL_RUNNER"])
+        return p
 
-        if pipeline.name not in pipelines.keys():
-            raise InvalidPipeline(
-                f"Pipeline {pipeline.name} does not exist in the project.")
-
-        d = jsonable_encoder(pipeline)
-        p = Pipeline.decode(d)
-        p.describe = info.context["request"].app.kedro_pipelines[p.name].describe()
-        p.nodes = info.context["request"].app.kedro_pipelines[p.name].nodes
-        serial = p.encode(encoder="kedro")
-
-        # credentials not supported yet
-        # merge any credentials with inputs and outputs
-        # credentials are intentionally not persisted
-        # NOTE celery result may persist creds in task result?
-
-        started_at = datetime.now()
-        p.created_at = started_at
-
-        # Get kedro project, kedro-graphql, and pipeline versions
-        p.project_version = config.get("KEDRO_PROJECT_VERSION", None)
-        p.kedro_graphql_version = kedro_graphql_version
-        p.pipeline_version = None
-        package_name = config.get("KEDRO_PROJECT_NAME", None)
-        if package_name:
-            try:
-                module = import_module(
-                    f".pipelines.{pipeline.name}", package=package_name)
-                p.pipeline_version = getattr(module, "__version__", None)
-            except Exception as e:
-                logger.info(f"Could not find pipeline version: {e}")
-
-        if d["state"] == "STAGED":
-            p.status.append(PipelineStatus(state=State.STAGED,
-                                           runner=None,
-                                           session=None,
-                                           started_at=None,
-                                           finished_at=None,
-                                           task_id=None,
-                                           task_name=None))
-            logger.info(f'Staging pipeline {p.name}')
-            p = info.context["request"].app.backend.create(p)
-            return p
-        else:
-            p.status.append(PipelineStatus(state=State.READY,
-                                           runner=info.context["request"].app.config["KEDRO_GRAPHQL_RUNNER"],
-                                           session=None,
-                                           started_at=started_at,
-                                           finished_at=None,
-                                           task_id=None,
-                                           task_name=str(run_pipeline)))
-
-            p = info.context["request"].app.backend.create(p)
-
-            result = run_pipeline.delay(
-                id=str(p.id),
-                name=serial["name"],
-                parameters=serial["parameters"],
-                data_catalog=serial["data_catalog"],
-                runner=info.context["request"].app.config["KEDRO_GRAPHQL_RUNNER"],
-                slices=d.get("slices", None),
-                only_missing=d.get("only_missing", False)
-            )
-
-            logger.info(
-                f'Running {p.name} pipeline with task_id: ' + str(result.task_id))
-            return p
+    @strawberry.mutation(description="Execute several pipelines, saved with a single backend write and "
+                         "dispatched as a single celery group.")
+    async def create_pipelines(self, pipelines: List[PipelineInput], info: Info) -> List[Pipeline]:
+        app = info.context["request"].app
+        _validate_names(pipelines, app)
+        new = [_new_pipeline(pipeline, app) for pipeline in pipelines]
+        created = await app.async_backend.create_many([p for p, _ in new])
+        runner = app.config["KEDRO_GRAPHQL_RUNNER"]
+        ready = [_run_signature(p, d, runner) for p, (_, d) in zip(created, new) if p.status[-1].state == State.READY]
+        if ready:
+            # a group publishes all tasks with a single producer connection
+            result = group(ready).apply_async()
+            logger.info(f'Running {len(ready)} pipelines with task_ids: {[r.task_id for r in result.results]}')
+        return created
+
+    @strawberry.mutation(description="Run a pipeline for every combination of the parameter values of a grid, "
+                         "at most maxConcurrency runs at a time.")
+    async def create_parameter_sweep(self, name: str, base: PipelineInput, grid: List[ParameterGridInput],
+                                     info: Info, max_concurrency: int = 1) -> ParameterSweep:
+        app = info.context["request"].app
+        if max_concurrency < 1:
+            raise InvalidPipeline("maxConcurrency must be at least 1.")
+        combinations = _expand_grid(grid)
+        if not combinations:
+            raise InvalidPipeline("The grid of the sweep has no combinations.")
+
+        # the parent holds the base inputs, each child overrides the swept
+        # parameters.  The parent is only a handle of the sweep, PENDING
+        # until its children finish and never run, see update_pipeline.
+        tags = (base.tags or []) + [TagInput(key=SWEEP_TAG, value=name)]
+        parent, _ = _new_pipeline(replace(base, state=PipelineInputStatus.STAGED,
+                                          tags=tags + [TagInput(key=SWEEP_PARENT_TAG, value=name)]), app)
+        parent.status[-1].state = State.PENDING
+        parent = await app.async_backend.create(parent)
+        swept = {g.name for g in grid}
+        parameters = [p for p in base.parameters or [] if p.name not in swept]
+        # the first maxConcurrency children run now, the worker finishing a
+        # child starts the next staged one, see KedroGraphqlTask.run_next_in_sweep
+        new = [_new_pipeline(replace(base, tags=tags, parent=str(parent.id), parameters=parameters + c,
+                                     state=PipelineInputStatus.READY if i < max_concurrency
+                                     else PipelineInputStatus.STAGED),
+                             app)
+               for i, c in enumerate(combinations)]
+        children = await app.async_backend.create_many([p for p, _ in new])
+
+        runner = app.config["KEDRO_GRAPHQL_RUNNER"]
+        group([_run_signature(p, d, runner) for p, (_, d) in zip(children, new)
+               if p.status[-1].state == State.READY]).apply_async()
+        logger.info(f'Running sweep {name} of {len(children)} {base.name} pipelines, '
+                    f'{min(max_concurrency, len(children))} at a time, parent id: {parent.id}')
+        return await _sweep_progress(app.async_backend, parent)
 
     @strawberry.mutation(description="Update a pipeline.")
-    def update_pipeline(self, id: str, pipeline: PipelineInput, info: Info) -> Pipeline:
+    async def update_pipeline(self, id: str, pipeline: PipelineInput, info: Info) -> Pipeline:
 
         try:
-            p = info.context["request"].app.backend.read(id=id)
+            p = await info.context["request"].app.async_backend.read(id=id)
             if p is None:
                 raise InvalidPipeline(f"Pipeline {id} does not exist in the project.")
         except Exception as e:
             raise InvalidPipeline(f"Error retrieving pipeline {id}: {e}")
 
+        if pipeline.state == PipelineInputStatus.READY and _is_sweep_parent(p):
+            raise InvalidPipeline(f"Pipeline {id} is the parent of a parameter sweep and cannot be run.")
+
         pipeline_input_dict = jsonable_encoder(pipeline)
+        if pipeline.version is not None:
+            # compare-and-set against the version the client read
+            p.version = pipeline.version
 
         # Update pipeline with new pipeline input
         p.parameters = pipeline_input_dict.get("parameters")
@@ -257,7 +433,7 @@ class Mutation:
                                               task_name=str(run_pipeline))
 
             # Update pipeline in backend before running task
-            p = info.context["request"].app.backend.update(p)
+            p = await info.context["request"].app.async_backend.update(p)
 
             serial = p.encode(encoder="kedro")
 
@@ -273,6 +449,8 @@ class Mutation:
 
             logger.info(
                 f'Running {p.name} pipeline with task_id: ' + str(result.task_id))
+            # the worker may already be writing to the pipeline, do not update it again
+            return p
 
         # If PipelineInput is STAGED and pipeline is not already running or staged
         if pipeline_input_dict.get("state", None) == "STAGED" and p.status[-1].state.value not in UNREADY_STATES.union(["READY"]) and p.status[-1].state.value != "STAGED":
@@ -284,23 +462,168 @@ class Mutation:
                                            task_id=None,
                                            task_name=None))
             logger.info(f'Staging pipeline {p.name}')
-        p = info.context["request"].app.backend.update(p)
+        p = await info.context["request"].app.async_backend.update(p)
 
         return p
 
     @strawberry.mutation(description="Delete a pipeline.")
-    def delete_pipeline(self, id: str, info: Info) -> Optional[Pipeline]:
+    async def delete_pipeline(self, id: str, info: Info) -> Optional[Pipeline]:
         try:
-            p = info.context["request"].app.backend.read(id=id)
+            p = await info.context["request"].app.async_backend.read(id=id)
             if p is None:
                 raise InvalidPipeline(f"Pipeline {id} does not exist in the project.")
         except Exception as e:
             raise InvalidPipeline(f"Error retrieving pipeline {id}: {e}")
 
-        info.context["request"].app.backend.delete(id=id)
+        await info.context["request"].app.async_backend.delete(id=id)
         logger.info(f'Deleted {p.name} pipeline with id: ' + str(id))
         return p
 
+    @strawberry.mutation(description="Delete several pipelines with a single backend write.")
+    async def delete_pipelines(self, ids: List[str], info: Info) -> List[Optional[Pipeline]]:
+        try:
+            found = await info.context["request"].app.async_backend.read_many(ids)
+        except Exception as e:
+            raise InvalidPipeline(f"Error retrieving pipelines {ids}: {e}")
+
+        deleted = [str(p.id) for p in found if p is not None]
+        await info.context["request"].app.async_backend.delete_many(deleted)
+        logger.info(f'Deleted pipelines with ids: {deleted}')
+        return found
+
+
+def _validate_names(inputs: List[PipelineInput], app):
+    """Raises InvalidPipeline naming every input whose pipeline does not exist in the project."""
+    missing = sorted({i.name for i in inputs if app.kedro_pipelines_index.get(name=i.name) is None})
+    if missing:
+        raise InvalidPipeline(
+            f"Pipelines {', '.join(missing)} do not exist in the project.")
+
+
+def _new_pipeline(pipeline: PipelineInput, app):
+    """
+    Builds the Pipeline to create from a PipelineInput, with a STAGED or READY status.
+
+    The describe and nodes of the pipeline are the precomputed metadata of its template.
+
+    :return: The Pipeline and the encoded PipelineInput.
+    """
+    template = app.kedro_pipelines_index.get(name=pipeline.name)
+    if template is None:
+        raise InvalidPipeline(
+            f"Pipeline {pipeline.name} does not exist in the project.")
+
+    d = jsonable_encoder(pipeline)
+    p = Pipeline.decode(d)
+    metadata = template.get_metadata()
+    p.describe = metadata.describe
+    p.nodes = list(metadata.nodes)
+
+    # credentials not supported yet
+    # merge any credentials with inputs and outputs
+    # credentials are intentionally not persisted
+    # NOTE celery result may persist creds in task result?
+
+    started_at = datetime.now()
+    p.created_at = started_at
+
+    # Get kedro project, kedro-graphql, and pipeline versions
+    p.project_version = config.get("KEDRO_PROJECT_VERSION", None)
+    p.kedro_graphql_version = kedro_graphql_version
+    p.pipeline_version = None
+    package_name = config.get("KEDRO_PROJECT_NAME", None)
+    if package_name:
+        try:
+            module = import_module(
+                f".pipelines.{pipeline.name}", package=package_name)
+            p.pipeline_version = getattr(module, "__version__", None)
+        except Exception as e:
+            logger.info(f"Could not find pipeline version: {e}")
+
+    if d["state"] == "STAGED":
+        p.status.append(PipelineStatus(state=State.STAGED,
+                                       runner=None,
+                                       session=None,
+                                       started_at=None,
+                                       finished_at=None,
+                                       task_id=None,
+                                       task_name=None))
+        logger.info(f'Staging pipeline {p.name}')
+    else:
+        p.status.append(PipelineStatus(state=State.READY,
+                                       runner=app.config["KEDRO_GRAPHQL_RUNNER"],
+                                       session=None,
+                                       started_at=started_at,
+                                       finished_at=None,
+                                       task_id=None,
+                                       task_name=str(run_pipeline)))
+    return p, d
+
+
+def _run_signature(p: Pipeline, d: dict, runner: str):
+    """The immutable run_pipeline task signature of a saved pipeline."""
+    serial = p.encode(encoder="kedro")
+    return run_pipeline.si(
+        id=str(p.id),
+        name=serial["name"],
+        parameters=serial["parameters"],
+        data_catalog=serial["data_catalog"],
+        runner=runner,
+        slices=d.get("slices", None),
+        only_missing=d.get("only_missing", False)
+    )
+
+
+def _run_pipeline(p: Pipeline, d: dict, runner: str):
+    """Sends the run_pipeline task of a saved pipeline to the workers."""
+    result = _run_signature(p, d, runner).apply_async()
+    logger.info(
+        f'Running {p.name} pipeline with task_id: ' + str(result.task_id))
+    return result
+
+
+def _expand_grid(grid: List[ParameterGridInput]) -> List[List[ParameterInput]]:
+    """The Cartesian product of the values of each parameter of a grid."""
+    axes = [[ParameterInput(name=g.name, value=v, type=g.type) for v in g.values] for g in grid]
+    return [list(c) for c in itertools.product(*axes)] if axes else []
+
+
+def _is_sweep_parent(p: Pipeline) -> bool:
+    return any(t.key == SWEEP_PARENT_TAG for t in p.tags or [])
+
+
+async def _sweep_progress(backend, parent: Pipeline) -> ParameterSweep:
+    """Counts the child pipelines of a sweep by latest state."""
+    where = PipelineFilterInput(parent=str(parent.id))
+    try:
+        stats = await backend.aggregate(filter=where)
+        state_counts = stats[0].state_counts if stats else {}
+    except NotImplementedError:
+        state_counts = {s.value: n for s in State if (n := await backend.count(
+            filter=PipelineFilterInput(parent=str(parent.id), state=s)))}
+    total = sum(state_counts.values())
+    finished = sum(n for s, n in state_counts.items() if s in READY_STATES)
+    return ParameterSweep(id=str(parent.id),
+                          name=next(t.value for t in parent.tags if t.key == SWEEP_TAG),
+                          total=total,
+                          state_counts=state_counts,
+                          finished=finished,
+                          progress=finished / total if total else 0.0)
+
+
+async def _wait_for_task_id(app, id):
+    """Wait until a worker assigns a task_id to the latest status of a pipeline.
+
+    The pipeline is only read again when the worker publishes a change, see
+    kedro_graphql.events.PipelineChangeWatcher.
+    """
+    async with app.pipeline_watcher.watch(id) as changed:
+        p = await app.async_backend.read(id=id, projection={"status.task_id": 1})
+        while p and not p.status[-1].task_id:
+            await changed.wait()
+            p = await app.async_backend.read(id=id, projection={"status.task_id": 1})
+    return p
+
 
 @strawberry.type
 class Subscription:
@@ -309,16 +632,14 @@ class Subscription:
         """Subscribe to pipeline events.
         """
         try:
-            p = info.context["request"].app.backend.read(id=id)
+            p = await info.context["request"].app.async_backend.read(id=id)
             if p is None:
                 raise InvalidPipeline(f"Pipeline {id} does not exist in the project.")
         except Exception as e:
             raise InvalidPipeline(f"Error retrieving pipeline {id}: {e}")
 
-        while (not p.status[-1].task_id):
-            # Wait for the task to be assigned a task_id
-            await asyncio.sleep(0.1)
-            p = info.context["request"].app.backend.read(id=id)
+        if not p.status[-1].task_id:
+            p = await _wait_for_task_id(info.context["request"].app, id)
 
         if p:
             async for e in PipelineEventMonitor(app=info.context["request"].app.celery_app, task_id=p.status[-1].task_id).start(interval=interval):
@@ -329,16 +650,14 @@ class Subscription:
     async def pipeline_logs(self, id: str, info: Info) -> AsyncGenerator[PipelineLogMessage, None]:
         """Subscribe to pipeline logs."""
         try:
-            p = info.context["request"].app.backend.read(id=id)
+            p = await info.context["request"].app.async_backend.read(id=id)
             if p is None:
                 raise InvalidPipeline(f"Pipeline {id} does not exist in the project.")
         except Exception as e:
             raise InvalidPipeline(f"Error retrieving pipeline {id}: {e}")
 
-        while (not p.status[-1].task_id):
-            # Wait for the task to be assigned a task_id
-            await asyncio.sleep(0.1)
-            p = info.context["request"].app.backend.read(id=id)
+        if not p.status[-1].task_id:
+            p = await _wait_for_task_id(info.context["request"].app, id)
 
         if p:
             stream = await PipelineLogStream().create(task_id=p.status[-1].task_id, broker_url=info.context["request"].app.config["KEDRO_GRAPHQL_BROKER"])
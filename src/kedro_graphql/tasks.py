@@ -7,6 +7,7 @@ from pathlib import Path
 from typing import Dict, List
 
 from celery import Task, shared_task
+from celery.states import READY_STATES
 from kedro import __version__ as kedro_version
 from kedro.framework.project import pipelines
 from kedro.framework.session import KedroSession
@@ -17,13 +18,22 @@ from kedro_graphql.logs.logger import KedroGraphQLLogHandler
 from kedro_graphql.runners import init_runner
 
 from .config import config as CONFIG
-from .models import DataSet, State
+from .events import PipelineChangePublisher
+from .backends.base import PipelineConflictError
+from .models import SWEEP_TAG, DataSet, PipelineFilterInput, State, TagInput
 
 logger = logging.getLogger(__name__)
 
+# pages of staged pipelines run_next_in_sweep tries to claim one from before giving up
+SWEEP_CLAIM_ATTEMPTS = 5
+# reads of a pipeline before_start updates before giving up on version conflicts
+UPDATE_ATTEMPTS = 5
+
+
 class KedroGraphqlTask(Task):
 
     _db = None
+    _notifier = None
 
     @property
     def db(self):
@@ -31,6 +41,63 @@ class KedroGraphqlTask(Task):
             self._db = self.app.kedro_graphql_backend
         return self._db
 
+    @property
+    def notifier(self):
+        if self._notifier is None:
+            self._notifier = PipelineChangePublisher(broker_url=self._app.conf["broker_url"])
+        return self._notifier
+
+    def update_status(self, id, fields):
+        """Update the latest PipelineStatus and wake up the subscriptions watching the pipeline."""
+        self.db.update_status(id=id, fields=fields)
+        self.notifier.publish(id, fields)
+
+
+    def run_next_in_sweep(self, kwargs):
+        """Start the next staged pipeline of the parameter sweep of a finished pipeline.
+
+        Every finished pipeline of a sweep starts at most one other, so the
+        number of running pipelines stays at the maxConcurrency of the sweep.
+        A pipeline is claimed with a write conditional on its version so that
+        workers finishing at the same time start different pipelines.
+
+        Arguments:
+            kwargs (Dict): Keyword arguments of the finished run_pipeline task.
+
+        Returns:
+            AsyncResult: The task of the started pipeline, or None.
+        """
+        p = self.db.read(id=kwargs["id"], projection={"name": 1, "tags": 1, "parent": 1})
+        sweep = next((t.value for t in (p.tags or []) if t.key == SWEEP_TAG), None) if p else None
+        if sweep is None or p.parent is None:
+            return None
+        where = PipelineFilterInput(parent=str(p.parent), state=State.STAGED,
+                                    tags=[TagInput(key=SWEEP_TAG, value=sweep)])
+        for _ in range(SWEEP_CLAIM_ATTEMPTS):
+            staged = self.db.list(limit=10, filter=where, sort="[('_id', 1)]")
+            if not staged:
+                return None
+            for child in staged:
+                fields = {"state": State.READY, "runner": kwargs.get("runner"),
+                          "started_at": datetime.now(), "task_name": str(self)}
+                try:
+                    self.db.update_status(id=child.id, fields=fields, version=child.version)
+                except PipelineConflictError:
+                    continue
+                self.notifier.publish(child.id, fields)
+                serial = child.encode(encoder="kedro")
+                result = self.apply_async(kwargs={"id": str(child.id),
+                                                  "name": serial["name"],
+                                                  "parameters": serial["parameters"],
+                                                  "data_catalog": serial["data_catalog"],
+                                                  "runner": kwargs.get("runner"),
+                                                  "slices": kwargs.get("slices"),
+                                                  "only_missing": kwargs.get("only_missing", False)})
+                logger.info(f"Running the next pipeline {child.id} of sweep {sweep} with task_id: {result.task_id}")
+                return result
+        logger.warning(f"Could not claim the next pipeline of sweep {sweep} after {SWEEP_CLAIM_ATTEMPTS} attempts, "
+                       "it starts when another pipeline of the sweep finishes")
+        return None
 
     def before_start(self, task_id, args, kwargs):
         """Handler called before the task starts.
@@ -48,12 +115,10 @@ class KedroGraphqlTask(Task):
         handler = KedroGraphQLLogHandler(task_id, broker_url = self._app.conf["broker_url"])
         logging.getLogger("kedro").addHandler(handler)
 
-        p = self.db.read(id=kwargs["id"])
-        p.status[-1].state = State.STARTED
-        p.status[-1].task_id = task_id
-        p.status[-1].task_args = json.dumps(args)
-        p.status[-1].task_kwargs = json.dumps(kwargs)
-        self.db.update(p)
+        self.update_status(id=kwargs["id"], fields={"state": State.STARTED,
+                                                    "task_id": task_id,
+                                                    "task_args": json.dumps(args),
+                                                    "task_kwargs": json.dumps(kwargs)})
 
         try:
             # Create info and error handlers for the run
@@ -74,19 +139,27 @@ class KedroGraphqlTask(Task):
             if log_path_prefix:
 
                 today = date.today()
-
-                # Add metadata and log datasets to data catalog
-                gql_meta = DataSet(name="gql_meta", config=json.dumps({"type": "json.JSONDataset",
-                                                            "filepath": os.path.join(log_path_prefix,f"year={today.year}",f"month={today.month}",f"day={today.day}",str(p.id),"meta.json")}))
-                gql_logs = DataSet(name="gql_logs",config=json.dumps({"type": "partitions.PartitionedDataset",
-                                                        "dataset": "text.TextDataset",
-                                                        "path": os.path.join(log_path_prefix,f"year={today.year}",f"month={today.month}",f"day={today.day}",str(p.id))}))
-                p.data_catalog.append(gql_meta)
-                p.data_catalog.append(gql_logs)
+                for attempt in range(UPDATE_ATTEMPTS):
+                    p = self.db.read(id=kwargs["id"])
+
+                    # Add metadata and log datasets to data catalog
+                    gql_meta = DataSet.from_config("gql_meta", {"type": "json.JSONDataset",
+                                                                "filepath": os.path.join(log_path_prefix,f"year={today.year}",f"month={today.month}",f"day={today.day}",str(p.id),"meta.json")})
+                    gql_logs = DataSet.from_config("gql_logs", {"type": "partitions.PartitionedDataset",
+                                                            "dataset": "text.TextDataset",
+                                                            "path": os.path.join(log_path_prefix,f"year={today.year}",f"month={today.month}",f"day={today.day}",str(p.id))})
+                    p.data_catalog.append(gql_meta)
+                    p.data_catalog.append(gql_logs)
+                    try:
+                        p = self.db.update(p)
+                        break
+                    except PipelineConflictError:
+                        # a status update or an updatePipeline mutation wrote the pipeline since it was read
+                        if attempt == UPDATE_ATTEMPTS - 1:
+                            raise
 
                 # Save metadata to S3
-                AbstractDataset.from_config(gql_meta.name, json.loads(gql_meta.config)).save(p.serialize())
-                p = self.db.update(p)
+                AbstractDataset.from_config(gql_meta.name, gql_meta.serialize()[gql_meta.name]).save(p.serialize())
 
                 logger.info(f"Capturing pipeline metadata in {os.path.join(log_path_prefix,f'year={today.year}',f'month={today.month}',f'day={today.day}',str(p.id),'meta.json')}")
                 logger.info(f"Capturing pipeline logs in {os.path.join(log_path_prefix,f'year={today.year}',f'month={today.month}',f'day={today.day}',str(p.id))}")
@@ -113,10 +186,8 @@ class KedroGraphqlTask(Task):
         Returns:
             None: The return value of this handler is ignored.
         """
-        
-        p = self.db.read(id=kwargs["id"])
-        p.status[-1].state = State.SUCCESS
-        self.db.update(p)
+
+        self.update_status(id=kwargs["id"], fields={"state": State.SUCCESS})
 
 
     def on_retry(self, exc, task_id, args, kwargs, einfo):
@@ -134,12 +205,10 @@ class KedroGraphqlTask(Task):
         Returns:
             None: The return value of this handler is ignored.
         """
-        
-        p = self.db.read(id=kwargs["id"])
-        p.status[-1].state = State.RETRY
-        p.status[-1].task_exception = str(exc)
-        p.status[-1].task_einfo = str(einfo)
-        self.db.update(p)        
+
+        self.update_status(id=kwargs["id"], fields={"state": State.RETRY,
+                                                    "task_exception": str(exc),
+                                                    "task_einfo": str(einfo)})
    
 
     def on_failure(self, exc, task_id, args, kwargs, einfo):
@@ -158,11 +227,9 @@ class KedroGraphqlTask(Task):
             None: The return value of this handler is ignored.
         """
 
-        p = self.db.read(id=kwargs["id"])
-        p.status[-1].state = State.FAILURE
-        p.status[-1].task_exception = str(exc)
-        p.status[-1].task_einfo = str(einfo)
-        self.db.update(p)
+        self.update_status(id=kwargs["id"], fields={"state": State.FAILURE,
+                                                    "task_exception": str(exc),
+                                                    "task_einfo": str(einfo)})
 
 
     def after_return(self, status, retval, task_id, args, kwargs, einfo):
@@ -182,10 +249,14 @@ class KedroGraphqlTask(Task):
 
         finished_at = datetime.now()
 
-        p = self.db.read(id=kwargs["id"])
-        p.status[-1].finished_at = finished_at
-        p.status[-1].task_result = str(retval)
-        self.db.update(p)
+        self.update_status(id=kwargs["id"], fields={"finished_at": finished_at,
+                                                    "task_result": str(retval)})
+
+        if status in READY_STATES:
+            try:
+                self.run_next_in_sweep(kwargs)
+            except Exception as e:
+                logger.error(f"Could not start the next pipeline of the sweep of pipeline {kwargs['id']}: {e}")
 
         logger.info("Closing log stream")
 
@@ -223,9 +294,7 @@ def run_pipeline(self,
         
         hook_manager = session._hook_manager
         
-        p = self.db.read(id=id)
-        p.status[-1].session = session.session_id
-        self.db.update(p)
+        self.update_status(id=id, fields={"session": session.session_id})
 
         # If modified data catalog object with gql_meta and gql_logs datasets exists, use it
         if getattr(self, "kedro_graphql_pipeline", None):
@@ -340,9 +409,7 @@ def run_pipeline(self,
                     node_namespace=node_namespace,
                 )
 
-            p = self.db.read(id=id)
-            p.status[-1].filtered_nodes = [node.name for node in filtered_pipeline.nodes]
-            self.db.update(p)
+            self.update_status(id=id, fields={"filtered_nodes": [node.name for node in filtered_pipeline.nodes]})
 
             run_result = runner().run(filtered_pipeline, catalog = io, hook_manager=hook_manager, session_id=session.session_id)
 
@@ -29,10 +29,12 @@ def merge_dicts(dicts):
 def parse_s3_filepath(config):
     """
     Parse the s3 bucket name and key from DataSet filepath field.
+
+    The config is a JSON string or an already parsed dict.
     """
     if config:
         try:
-            dataset_dict = json.loads(config)
+            dataset_dict = json.loads(config) if isinstance(config, str) else config
             filepath = dataset_dict.get("filepath")
             if not filepath:
                 raise ValueError("Invalid dataset configuration. Must have 'filepath' key")
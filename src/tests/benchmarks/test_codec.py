@@ -0,0 +1,73 @@
+"""
+Cost of encoding a Pipeline for storage and decoding it back, against the
+generic deepcopy and jsonable_encoder path Pipeline.encode used before, and
+of reading the latest state from an eager Pipeline and from a LazyPipeline.
+
+Run with:
+
+    pytest src/tests/benchmarks --benchmark-only --benchmark-group-by=group
+"""
+import json
+from copy import deepcopy
+from datetime import datetime
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from kedro_graphql.models import DataSet, LazyPipeline, Node, Parameter, Pipeline, PipelineStatus, State, Tag
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.fixture
+def pipeline():
+    p = Pipeline(
+        id="65f0c7b1d1e4b5a3c2a1b0c9",
+        name="example00",
+        data_catalog=[DataSet(name=f"dataset{i}",
+                              config=json.dumps({"type": "text.TextDataset", "filepath": f"./data/{i}.txt"}),
+                              tags=[Tag(key="owner", value="opensean")]) for i in range(20)],
+        parameters=[Parameter(name=f"parameter{i}", value=str(i)) for i in range(20)],
+        nodes=[Node(name=f"node{i}", inputs=[f"dataset{i}"], outputs=[f"dataset{i + 1}"], tags=[]) for i in range(10)],
+        tags=[Tag(key="author", value="opensean"), Tag(key="package", value="kedro-graphql")],
+        created_at=datetime.now(),
+    )
+    for _ in range(3):
+        p.status.append(PipelineStatus(state=State.SUCCESS, session="session", started_at=datetime.now(),
+                                       finished_at=datetime.now(), task_id="task", task_name="run_pipeline"))
+    return p
+
+
+def _legacy_encode(p):
+    p = deepcopy(p)
+    p.id = str(p.id)
+    return jsonable_encoder(p, exclude={"parent_pipeline", "children"})
+
+
+@pytest.mark.benchmark(group="encode")
+def test_bench_encode_legacy(benchmark, pipeline):
+    benchmark(_legacy_encode, pipeline)
+
+
+@pytest.mark.benchmark(group="encode")
+def test_bench_encode(benchmark, pipeline):
+    encoded = benchmark(pipeline.encode)
+    assert Pipeline.decode_dict(encoded) == pipeline
+
+
+@pytest.mark.benchmark(group="decode")
+def test_bench_decode(benchmark, pipeline):
+    encoded = pipeline.encode()
+    assert benchmark(Pipeline.decode_dict, encoded) == pipeline
+
+
+@pytest.mark.benchmark(group="latest state")
+def test_bench_latest_state(benchmark, pipeline):
+    encoded = pipeline.encode()
+    assert benchmark(lambda: Pipeline.decode_dict(encoded).status[-1].state) == State.SUCCESS
+
+
+@pytest.mark.benchmark(group="latest state")
+def test_bench_latest_state_lazy(benchmark, pipeline):
+    encoded = pipeline.encode()
+    assert benchmark(lambda: LazyPipeline(encoded).status[-1].state) == State.SUCCESS
@@ -0,0 +1,74 @@
+"""
+Throughput of creating pipelines one by one with createPipeline against a
+single createPipelines mutation.
+
+Run with:
+
+    pytest src/tests/benchmarks --benchmark-only --benchmark-group-by=group
+"""
+import asyncio
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+BATCH = 100
+
+CREATE_PIPELINE = """
+    mutation TestMutation($pipeline: PipelineInput!) {
+      createPipeline(pipeline: $pipeline) {
+        id
+      }
+    }
+    """
+
+CREATE_PIPELINES = """
+    mutation TestMutation($pipelines: [PipelineInput!]!) {
+      createPipelines(pipelines: $pipelines) {
+        id
+      }
+    }
+    """
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+def _inputs():
+    # staged pipelines are saved without dispatching a run to a worker
+    return [{"name": "example00", "state": "STAGED",
+             "parameters": [{"name": "example", "value": str(i)}],
+             "tags": [{"key": "sweep", "value": "benchmark"}]} for i in range(BATCH)]
+
+
+def _clear(mock_app):
+    mock_app.backend.db["pipelines"].delete_many({})
+
+
+@pytest.mark.benchmark(group="createPipelines")
+def test_bench_create_pipeline_loop(benchmark, loop, mock_app, mock_info_context):
+
+    async def create():
+        for pipeline in _inputs():
+            resp = await mock_app.schema.execute(CREATE_PIPELINE, variable_values={"pipeline": pipeline})
+            assert resp.errors is None
+
+    benchmark.pedantic(lambda: loop.run_until_complete(create()), setup=lambda: _clear(mock_app),
+                       rounds=5, iterations=1)
+    assert mock_app.backend.count() == BATCH
+
+
+@pytest.mark.benchmark(group="createPipelines")
+def test_bench_create_pipelines_batch(benchmark, loop, mock_app, mock_info_context):
+
+    async def create():
+        resp = await mock_app.schema.execute(CREATE_PIPELINES, variable_values={"pipelines": _inputs()})
+        assert resp.errors is None
+
+    benchmark.pedantic(lambda: loop.run_until_complete(create()), setup=lambda: _clear(mock_app),
+                       rounds=5, iterations=1)
+    assert mock_app.backend.count() == BATCH
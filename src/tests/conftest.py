@@ -164,8 +164,7 @@ def mock_pipeline(mock_app, tmp_path, mock_text_in, mock_text_out):
                                       countdown=0.1)
 
     print(f'Starting {p.name} pipeline with task_id: ' + str(result.id))
-    p.status[-1].task_id = result.id
-    p = mock_app.backend.update(p)
+    p = mock_app.backend.update_status(id=p.id, fields={"task_id": result.id}, return_pipeline=True)
     return p
 
 
@@ -205,8 +204,7 @@ def mock_pipeline2(mock_app, tmp_path, mock_text_in, mock_text_out):
                                       countdown=0.1)
 
     print(f'Starting {p.name} pipeline with task_id: ' + str(result.id))
-    p.status[-1].task_id = result.id
-    p = mock_app.backend.update(p)
+    p = mock_app.backend.update_status(id=p.id, fields={"task_id": result.id}, return_pipeline=True)
     return p
 
 
@@ -1,4 +1,14 @@
-from kedro_graphql.models import State
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from bson.objectid import ObjectId
+
+from kedro_graphql.backends import mongodb
+from kedro_graphql.backends.base import AsyncBackendAdapter, BaseBackend, PipelineConflictError
+from kedro_graphql.backends.mongodb import PIPELINE_INDEXES, MongoBackend, _filter_query
+from kedro_graphql.backends.pagination import cursor_values, parse_sort
+from kedro_graphql.models import LazyPipeline, Node, PipelineFilterInput, PipelineStatus, State, TagInput
 
 
 def test_backend_create(mock_app, mock_pipeline_no_task):
@@ -20,3 +30,488 @@ def test_backend_update_status(mock_app, mock_pipeline_no_task):
     p.status[-1].state = State.STARTED
     p = mock_app.backend.update(p)
     assert p.status[-1].state == State.STARTED
+
+
+def test_backend_update_version(mock_app, mock_pipeline_no_task):
+    p = mock_app.backend.create(mock_pipeline_no_task)
+    assert p.version == 0
+    stale = mock_app.backend.read(id=p.id)
+    p.name = "example01"
+    p = mock_app.backend.update(p)
+    assert p.version == 1
+
+    stale.name = "example02"
+    with pytest.raises(PipelineConflictError):
+        mock_app.backend.update(stale)
+    assert mock_app.backend.read(id=p.id).name == "example01"
+
+
+def test_backend_update_status_version(mock_app, mock_pipeline_no_task):
+    p = mock_app.backend.create(mock_pipeline_no_task)
+    mock_app.backend.update_status(id=p.id, fields={"state": State.STARTED})
+    assert mock_app.backend.read(id=p.id).version == 1
+
+    # a whole document write based on a read before the status update conflicts
+    with pytest.raises(PipelineConflictError):
+        mock_app.backend.update(p)
+    # blind conditional writes
+    with pytest.raises(PipelineConflictError):
+        mock_app.backend.update_status(id=p.id, fields={"state": State.SUCCESS}, version=0)
+    p = mock_app.backend.update_status(id=p.id, fields={"state": State.SUCCESS}, version=1, return_pipeline=True)
+    assert p.status[-1].state == State.SUCCESS
+    assert p.version == 2
+
+
+def test_backend_snapshot(mock_app, mock_pipeline_no_task):
+    mock_pipeline_no_task.describe = "#### Pipeline execution order ####"
+    mock_pipeline_no_task.nodes = [Node(name="uppercase", inputs=["text_in"], outputs=["text_out"], tags=[])]
+    first = mock_app.backend.create(mock_pipeline_no_task)
+    second = mock_app.backend.create(mock_pipeline_no_task)
+    assert second.describe == mock_pipeline_no_task.describe
+    assert second.nodes == mock_pipeline_no_task.nodes
+
+    # the snapshot is stored once and referenced by both runs
+    raw = [mock_app.backend.db["pipelines"].find_one({"_id": ObjectId(p.id)}) for p in (first, second)]
+    assert "describe" not in raw[0] and "nodes" not in raw[0]
+    assert raw[0]["snapshot"] == raw[1]["snapshot"]
+    assert mock_app.backend.db["pipeline_snapshots"].count_documents({"_id": raw[0]["snapshot"]}) == 1
+
+    # a fresh cache loads the snapshot again, a projection without describe and nodes does not
+    mock_app.backend.snapshots.decoded.clear()
+    assert mock_app.backend.read(id=first.id, projection={"name": 1}).nodes is None
+    assert mock_app.backend.snapshots.decoded == {}
+    assert mock_app.backend.read(id=first.id).nodes == mock_pipeline_no_task.nodes
+
+
+def test_backend_blobs(mocker, mock_app, mock_pipeline_no_task):
+    kwargs = json.dumps({"parameters": {"example": "hello" * 1000}})
+    p = mock_app.backend.create(mock_pipeline_no_task)
+    mock_app.backend.update_status(id=p.id, fields={"state": State.STARTED, "task_kwargs": kwargs,
+                                                    "task_args": "[]"})
+    p = mock_app.backend.append_status(id=p.id, return_pipeline=True,
+                                       status=PipelineStatus(state=State.FAILURE, session=None, task_kwargs=kwargs,
+                                                             task_einfo="Traceback" + " " * 2000))
+    assert [s.task_kwargs for s in p.status] == [kwargs, kwargs]
+    assert p.status[-1].task_einfo.startswith("Traceback")
+
+    # large values are stored once, compressed, and referenced by the status entries
+    raw = mock_app.backend.db["pipelines"].find_one({"_id": ObjectId(p.id)})
+    assert raw["status"][0]["task_kwargs"] == raw["status"][1]["task_kwargs"]
+    assert raw["status"][0]["task_args"] == "[]"
+    blobs = mock_app.backend.db["pipeline_blobs"]
+    assert blobs.count_documents({}) == 2
+    assert len(blobs.find_one({"_id": raw["status"][0]["task_kwargs"]["blob"]})["data"]) < len(kwargs)
+
+    # the blobs are only loaded when their field is selected
+    join = mocker.spy(mongodb, "join_blobs")
+    assert mock_app.backend.read(id=p.id, projection={"status.state": 1}).status[-1].task_kwargs is None
+    assert join.call_count == 0
+    assert mock_app.backend.read(id=p.id, projection={"status.task_einfo": 1}).status[-1].task_einfo is not None
+    assert join.call_count == 1
+
+    updated = mock_app.backend.update(mock_app.backend.read(id=p.id))
+    assert updated.status[-1].task_einfo == p.status[-1].task_einfo
+    assert blobs.count_documents({}) == 2
+
+
+@pytest.mark.asyncio
+async def test_async_backend_blobs(mock_app, mock_pipeline_no_task):
+    kwargs = "x" * 2048
+    mock_pipeline_no_task.status[-1].task_kwargs = kwargs
+    p = await mock_app.async_backend.create(mock_pipeline_no_task)
+    assert p.status[-1].task_kwargs == kwargs
+    raw = mock_app.backend.db["pipelines"].find_one({"_id": ObjectId(p.id)})
+    assert "blob" in raw["status"][-1]["task_kwargs"]
+    assert (await mock_app.async_backend.read(id=p.id)).status[-1].task_kwargs == kwargs
+
+
+def test_backend_read_lazy(mock_app, mock_pipeline_no_task):
+    created = mock_app.backend.create(mock_pipeline_no_task)
+    p = mock_app.backend.list(limit=1)[0]
+    assert isinstance(p, LazyPipeline)
+    assert p.status[-1].state == State.READY
+    assert "data_catalog" not in p.__dict__
+    assert p == created
+
+
+def test_backend_read_projection(mock_app, mock_pipeline_no_task):
+    created = mock_app.backend.create(mock_pipeline_no_task)
+    p = mock_app.backend.read(id=created.id, projection={"name": 1, "status.state": 1})
+    assert p.id == created.id
+    assert p.name == created.name
+    assert p.status[-1].state == created.status[-1].state
+    assert p.status[-1].session is None
+    assert p.parameters is None
+    assert p.data_catalog == []
+
+
+def test_backend_list_projection_slice(mock_app, mock_pipeline_no_task):
+    created = mock_app.backend.create(mock_pipeline_no_task)
+    mock_app.backend.append_status(id=created.id, status=PipelineStatus(state=State.STAGED, session=None))
+    results = mock_app.backend.list(cursor="000000000000000000000000", limit=10, filter="", sort="",
+                                    projection={"name": 1, "status": {"$slice": -1}})
+    assert len(results) == 1
+    assert [s.state for s in results[0].status] == [State.STAGED]
+
+
+def test_backend_startup_creates_indexes(mock_app):
+    mock_app.backend.startup()
+    existing = mock_app.backend.db["pipelines"].index_information()
+    for i in PIPELINE_INDEXES:
+        assert i["name"] in existing
+    assert mock_app.backend.index_report(usage=False)["missing"] == []
+
+
+def test_backend_extra_indexes(mock_app):
+    backend = MongoBackend(uri=mock_app.config["MONGO_URI"],
+                           db=mock_app.config["MONGO_DB_NAME"],
+                           indexes='[{"keys": [["parent", 1]], "name": "parent_test"}]')
+    assert "parent_test" in backend.index_report(usage=False)["missing"]
+    backend.create_indexes()
+    assert "parent_test" in backend.db["pipelines"].index_information()
+
+
+def test_backend_update_status_partial(mock_app, mock_pipeline_no_task):
+    p = mock_app.backend.create(mock_pipeline_no_task)
+    result = mock_app.backend.update_status(id=p.id, fields={"state": State.STARTED, "task_id": "abc"})
+    assert result is None
+    updated = mock_app.backend.read(id=p.id)
+    assert updated.status[-1].state == State.STARTED
+    assert updated.status[-1].task_id == "abc"
+    assert updated.status[-1].session == p.status[-1].session
+    assert updated.name == p.name
+
+
+def test_backend_update_status_index(mock_app, mock_pipeline_no_task):
+    p = mock_app.backend.create(mock_pipeline_no_task)
+    mock_app.backend.append_status(id=p.id, status=PipelineStatus(state=State.STAGED, session=None))
+    p = mock_app.backend.update_status(id=p.id, fields={"state": State.FAILURE}, index=0, return_pipeline=True)
+    assert len(p.status) == 2
+    assert p.status[0].state == State.FAILURE
+    assert p.status[1].state == State.STAGED
+
+    p = mock_app.backend.update_status(id=p.id, fields={"state": State.SUCCESS}, index=-2, return_pipeline=True)
+    assert [s.state for s in p.status] == [State.SUCCESS, State.STAGED]
+
+    # an index without a status raises and writes nothing
+    for index in (2, -3):
+        with pytest.raises(ValueError):
+            mock_app.backend.update_status(id=p.id, fields={"state": State.FAILURE}, index=index)
+        with pytest.raises(ValueError):
+            mock_app.backend.update_status(id=p.id, fields={"state": State.FAILURE}, index=index, version=p.version)
+    assert mock_app.backend.read(id=p.id).version == p.version
+    with pytest.raises(ValueError):
+        BaseBackend.update_status(mock_app.backend, id=p.id, fields={"state": State.FAILURE}, index=2)
+
+
+def test_backend_append_status(mock_app, mock_pipeline_no_task):
+    p = mock_app.backend.create(mock_pipeline_no_task)
+    p = mock_app.backend.append_status(id=p.id,
+                                       status=PipelineStatus(state=State.READY, session=None),
+                                       return_pipeline=True)
+    assert len(p.status) == 2
+    assert p.status[-1].state == State.READY
+
+
+def test_backend_many(mock_app, mock_pipeline_no_task):
+    created = mock_app.backend.create_many([mock_pipeline_no_task] * 3)
+    ids = [p.id for p in created]
+    assert [p.version for p in created] == [0, 0, 0]
+    missing = str(ObjectId())
+    read = mock_app.backend.read_many([ids[2], missing, ids[0]], projection={"name": 1})
+    assert [p.id if p else None for p in read] == [ids[2], None, ids[0]]
+
+    mock_app.backend.update_status(id=ids[1], fields={"state": State.STARTED})
+    for p in created:
+        p.name = "example01"
+    with pytest.raises(PipelineConflictError) as e:
+        mock_app.backend.update_many(created)
+    assert str(e.value.id) == ids[1]
+    # pipelines that were not modified are still updated
+    assert [p.name for p in mock_app.backend.read_many(ids)] == ["example01", "example00", "example01"]
+    assert [p.version for p in mock_app.backend.update_many(mock_app.backend.read_many(ids))] == [2, 2, 2]
+
+    mock_app.backend.delete_many(ids[:2])
+    assert mock_app.backend.read_many(ids)[:2] == [None, None]
+
+
+@pytest.mark.asyncio
+async def test_async_backend_many(mock_app, mock_pipeline_no_task):
+    created = await mock_app.async_backend.create_many([mock_pipeline_no_task] * 2)
+    ids = [p.id for p in created]
+    assert await mock_app.async_backend.read_many(ids[::-1]) == created[::-1]
+    await mock_app.async_backend.delete_many(ids)
+    assert await mock_app.async_backend.read_many(ids) == [None, None]
+
+
+def _lineage_tree(backend, p):
+    """root <- a <- a1 <- a11 and root <- b, returns the ids by name"""
+    ids = {}
+    for name, parent in [("root", None), ("a", "root"), ("b", "root"), ("a1", "a"), ("a11", "a1")]:
+        p.parent = ids.get(parent)
+        p.tags = [TagInput(key="name", value=name)]
+        ids[name] = str(backend.create(p).id)
+    return ids
+
+
+def test_backend_lineage(mock_app, mock_pipeline_no_task):
+    ids = _lineage_tree(mock_app.backend, mock_pipeline_no_task)
+
+    lineage = mock_app.backend.lineage(id=ids["a11"])
+    assert [(e.depth, e.pipeline.id) for e in lineage] == [(1, ids["a1"]), (2, ids["a"]), (3, ids["root"])]
+    lineage = mock_app.backend.lineage(id=ids["root"], direction="descendants", projection={"name": 1})
+    assert [e.depth for e in lineage] == [1, 1, 2, 3]
+    assert {e.pipeline.id for e in lineage[:2]} == {ids["a"], ids["b"]}
+    assert lineage[0].pipeline.tags is None
+    assert len(mock_app.backend.lineage(id=ids["root"], direction="descendants", max_depth=2)) == 3
+    assert mock_app.backend.lineage(id=ids["root"]) == []
+
+
+def test_backend_lineage_backfill(mock_app, mock_pipeline_no_task):
+    ids = _lineage_tree(mock_app.backend, mock_pipeline_no_task)
+    # documents written before the string id was stored
+    mock_app.backend.db["pipelines"].update_many({}, {"$unset": {"id": ""}})
+    assert mock_app.backend.lineage(id=ids["a1"]) == []
+    mock_app.backend.startup()
+    assert [e.pipeline.id for e in mock_app.backend.lineage(id=ids["a1"])] == [ids["a"], ids["root"]]
+
+
+def test_backend_list_children(mock_app, mock_pipeline_no_task):
+    ids = _lineage_tree(mock_app.backend, mock_pipeline_no_task)
+
+    children = mock_app.backend.list_children([ids["root"], ids["a11"], ids["a"]], projection={"name": 1})
+    assert [[c.id for c in group] for group in children] == [sorted([ids["a"], ids["b"]]), [], [ids["a1"]]]
+    assert [len(group) for group in mock_app.backend.list_children([ids["root"]], limit=1)] == [1]
+    # the default implementation lists the children of each parent
+    assert BaseBackend.list_children(mock_app.backend, [ids["root"], ids["a11"], ids["a"]]) == \
+        mock_app.backend.list_children([ids["root"], ids["a11"], ids["a"]])
+
+
+@pytest.mark.asyncio
+async def test_async_backend_create(mock_app, mock_pipeline_no_task):
+    p = await mock_app.async_backend.create(mock_pipeline_no_task)
+    assert p.id is not None
+    p.id = None
+    assert p == mock_pipeline_no_task
+
+
+@pytest.mark.asyncio
+async def test_async_backend_read(mock_app, mock_pipeline_no_task):
+    created = await mock_app.async_backend.create(mock_pipeline_no_task)
+    p = await mock_app.async_backend.read(id=created.id)
+    assert p == created
+
+
+@pytest.mark.asyncio
+async def test_async_backend_update(mock_app, mock_pipeline_no_task):
+    p = await mock_app.async_backend.create(mock_pipeline_no_task)
+    p.status[-1].state = State.STARTED
+    p = await mock_app.async_backend.update(p)
+    assert p.status[-1].state == State.STARTED
+
+
+@pytest.mark.asyncio
+async def test_async_backend_update_version(mock_app, mock_pipeline_no_task):
+    p = await mock_app.async_backend.create(mock_pipeline_no_task)
+    await mock_app.async_backend.update(p)
+    with pytest.raises(PipelineConflictError):
+        await mock_app.async_backend.update(p)
+
+
+@pytest.mark.asyncio
+async def test_async_backend_delete(mock_app, mock_pipeline_no_task):
+    p = await mock_app.async_backend.create(mock_pipeline_no_task)
+    await mock_app.async_backend.delete(id=p.id)
+    assert await mock_app.async_backend.read(id=p.id) is None
+
+
+@pytest.mark.asyncio
+async def test_async_backend_lineage(mock_app, mock_pipeline_no_task):
+    ids = _lineage_tree(mock_app.backend, mock_pipeline_no_task)
+    lineage = await mock_app.async_backend.lineage(id=ids["a"], direction="descendants")
+    assert [(e.depth, e.pipeline.id) for e in lineage] == [(1, ids["a1"]), (2, ids["a11"])]
+
+
+@pytest.mark.asyncio
+async def test_async_backend_list_children(mock_app, mock_pipeline_no_task):
+    ids = _lineage_tree(mock_app.backend, mock_pipeline_no_task)
+    children = await mock_app.async_backend.list_children([ids["a"], ids["root"]], limit=5)
+    assert children == mock_app.backend.list_children([ids["a"], ids["root"]])
+
+
+def test_base_backend_lineage(mock_app, mock_pipeline_no_task):
+    ids = _lineage_tree(mock_app.backend, mock_pipeline_no_task)
+
+    class LevelBackend(MongoBackend):
+        lineage = BaseBackend.lineage
+
+    backend = LevelBackend(uri=mock_app.config["MONGO_URI"], db=mock_app.config["MONGO_DB_NAME"])
+    assert backend.lineage(id=ids["a11"], max_depth=2) == mock_app.backend.lineage(id=ids["a11"], max_depth=2)
+    assert backend.lineage(id=ids["root"], direction="descendants") == \
+        mock_app.backend.lineage(id=ids["root"], direction="descendants")
+    with pytest.raises(ValueError):
+        backend.lineage(id=ids["root"], direction="siblings")
+
+
+@pytest.mark.asyncio
+async def test_async_backend_adapter(mock_app, mock_pipeline_no_task):
+    backend = AsyncBackendAdapter(backend=mock_app.backend)
+    p = await backend.create(mock_pipeline_no_task)
+    assert (await backend.read(id=p.id)) == p
+
+
+def _stats_pipelines(mock_app, p, name):
+    start = datetime(2025, 3, 1, 12, 0, 0)
+    for i, state in enumerate([State.SUCCESS, State.SUCCESS, State.FAILURE, State.STARTED]):
+        p.id = None
+        p.name = name
+        p.status = [PipelineStatus(state=state, runner=None, session=None, task_id=None, task_name=None,
+                                   started_at=start,
+                                   finished_at=start + timedelta(seconds=10 * (i + 1))
+                                   if state != State.STARTED else None)]
+        mock_app.backend.create(p)
+
+
+def test_backend_aggregate(mock_app, mock_pipeline_no_task):
+    _stats_pipelines(mock_app, mock_pipeline_no_task, "stats00")
+    stats = mock_app.backend.aggregate(filter='{"name": "stats00"}', group_by=["name"])
+    assert len(stats) == 1
+    assert stats[0].group == {"name": "stats00"}
+    assert stats[0].count == 4
+    assert stats[0].state_counts == {"SUCCESS": 2, "FAILURE": 1, "STARTED": 1}
+    assert stats[0].failure_rate == pytest.approx(1 / 3)
+    assert stats[0].duration_p50 == 20.0
+    assert stats[0].duration_p99 == 20.0
+
+
+def test_backend_aggregate_group_by_state(mock_app, mock_pipeline_no_task):
+    _stats_pipelines(mock_app, mock_pipeline_no_task, "stats01")
+    stats = mock_app.backend.aggregate(filter='{"name": "stats01"}', group_by=["state"])
+    stats = {s.group["state"]: s for s in stats}
+    assert stats["SUCCESS"].count == 2
+    assert stats["SUCCESS"].failure_rate == 0
+    assert stats["STARTED"].duration_p50 is None
+    with pytest.raises(ValueError):
+        mock_app.backend.aggregate(group_by=["runner"])
+
+
+@pytest.mark.asyncio
+async def test_async_backend_aggregate(mock_app, mock_pipeline_no_task):
+    _stats_pipelines(mock_app, mock_pipeline_no_task, "stats02")
+    stats = await mock_app.async_backend.aggregate(filter='{"name": "stats02"}')
+    assert len(stats) == 1
+    assert stats[0].group == {}
+    assert stats[0].count == 4
+
+
+def _archive_pipelines(mock_app, p, name):
+    ids = []
+    for i, state in enumerate([State.SUCCESS, State.FAILURE, State.STARTED]):
+        p.id = None
+        p.name = name
+        p.created_at = datetime(2020, 1 + i, 15)
+        p.status = [PipelineStatus(state=state, runner=None, session=None, task_id=None, task_name=None)]
+        ids.append(mock_app.backend.create(p).id)
+    return ids
+
+
+def test_backend_archive(mock_app, mock_pipeline_no_task):
+    success, failure, started = _archive_pipelines(mock_app, mock_pipeline_no_task, "archive00")
+    assert mock_app.backend.archive(older_than_days=365) >= 2
+    assert {"pipelines_archive_2020_01", "pipelines_archive_2020_02"} <= set(mock_app.backend.archive_collections())
+
+    # only the pipeline that is still running stays in the working set
+    assert [p.id for p in mock_app.backend.list(filter='{"name": "archive00"}')] == [started]
+    assert mock_app.backend.read(id=success) is None
+    assert mock_app.backend.read(id=success, archived=True).status[-1].state == State.SUCCESS
+    assert mock_app.backend.count(filter='{"name": "archive00"}', archived=True) == 3
+
+    listed = mock_app.backend.list(filter='{"name": "archive00"}', sort="[('created_at', -1)]", archived=True)
+    assert [p.id for p in listed] == [started, failure, success]
+    page = mock_app.backend.list(filter='{"name": "archive00"}', sort="[('created_at', -1)]", limit=1,
+                                 cursor={"created_at": listed[0].created_at.isoformat(), "_id": started},
+                                 archived=True)
+    assert [p.id for p in page] == [failure]
+
+    # archiving again is a no-op
+    assert mock_app.backend.archive(older_than_days=365) == 0
+
+
+@pytest.mark.asyncio
+async def test_async_backend_read_archived(mock_app, mock_pipeline_no_task):
+    success, _, _ = _archive_pipelines(mock_app, mock_pipeline_no_task, "archive01")
+    mock_app.backend.archive(older_than_days=365)
+    assert await mock_app.async_backend.read(id=success) is None
+    assert (await mock_app.async_backend.read(id=success, archived=True)).id == success
+
+
+def test_backend_list_filter_input(mock_app, mock_pipeline_no_task):
+    p = mock_pipeline_no_task
+    ids = []
+    for i, states in enumerate([[State.FAILURE, State.SUCCESS], [State.SUCCESS, State.FAILURE], [State.SUCCESS]]):
+        p.id = None
+        p.name = "filter00"
+        p.parent = "parent00" if i else None
+        p.created_at = datetime(2021, 1, 1 + i)
+        p.status = [PipelineStatus(state=s, runner=None, session=None, task_id=None, task_name=None) for s in states]
+        ids.append(mock_app.backend.create(p).id)
+
+    def listed(**kwargs):
+        return [p.id for p in mock_app.backend.list(filter=PipelineFilterInput(name="filter00", **kwargs))]
+
+    # only the latest status counts
+    assert listed(state=State.SUCCESS) == [ids[0], ids[2]]
+    assert listed(parent="parent00") == ids[1:]
+    assert listed(created_after=datetime(2021, 1, 2), created_before=datetime(2021, 1, 3)) == [ids[1]]
+    # timezone aware bounds are compared in the local time created_at is stored in
+    assert listed(created_after=datetime(2021, 1, 2).astimezone(timezone(timedelta(hours=2))),
+                  created_before=datetime(2021, 1, 3).astimezone(timezone.utc)) == [ids[1]]
+    assert listed(tags=[TagInput(key="author", value="opensean"), TagInput(key="package", value="kedro-graphql")]) == ids
+    assert listed(tags=[TagInput(key="author", value="kedro-graphql")]) == []
+    assert mock_app.backend.count(filter=PipelineFilterInput(name="filter00", state=State.FAILURE)) == 1
+
+
+def test_backend_list_keyset_nulls(mock_app, mock_pipeline_no_task):
+    p = mock_pipeline_no_task
+    for parent in ["parent00", None, "parent01", None, "parent02"]:
+        p.id = None
+        p.name = "keyset00"
+        p.parent = parent
+        mock_app.backend.create(p)
+
+    for sort in ["[('parent', -1)]", "[('parent', 1)]"]:
+        pages, cursor = [], None
+        while True:
+            page = mock_app.backend.list(cursor=cursor, limit=2, filter=PipelineFilterInput(name="keyset00"),
+                                         sort=sort)
+            if not page:
+                break
+            pages.append([p.parent for p in page])
+            cursor = cursor_values(page[-1], parse_sort(sort))
+        parents = [parent for page in pages for parent in page]
+        # pipelines without a parent sort before any other, and none are skipped
+        expected = [None, None, "parent00", "parent01", "parent02"]
+        assert parents == (expected[::-1] if sort.endswith("-1)]") else expected)
+
+
+def test_backend_filter_query():
+    query = _filter_query(PipelineFilterInput(name="example00", state=State.SUCCESS,
+                                              created_after=datetime(2021, 1, 1)))
+    assert query["name"] == "example00"
+    assert query["status.state"] == "SUCCESS"
+    assert query["created_at"] == {"$gte": "2021-01-01T00:00:00"}
+    query = _filter_query(PipelineFilterInput(created_before=datetime(2021, 1, 1).astimezone(timezone.utc)))
+    assert query["created_at"] == {"$lt": "2021-01-01T00:00:00"}
+    assert _filter_query('{"name": "example00"}') == {"name": "example00"}
+    assert _filter_query(None) == {}
+
+
+def test_backend_explain(mocker, mock_app):
+    command = mocker.patch.object(mock_app.backend.db, "command", return_value={
+        "queryPlanner": {"winningPlan": {"stage": "LIMIT", "inputStage": {
+            "stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "name_created_at"}}}},
+        "executionStats": {"nReturned": 2, "totalKeysExamined": 2, "totalDocsExamined": 2, "executionTimeMillis": 1}})
+    plan = mock_app.backend.explain(limit=3, filter=PipelineFilterInput(name="example00"), sort="[('created_at', -1)]")
+    assert command.call_args.args[1]["filter"] == {"name": "example00"}
+    assert plan.indexes == ["name_created_at"]
+    assert plan.docs_examined == plan.returned == 2
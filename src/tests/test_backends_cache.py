@@ -0,0 +1,157 @@
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from kedro_graphql.backends import init_async_backend, init_backend
+from kedro_graphql.backends.base import AsyncBackendAdapter
+from kedro_graphql.backends.cache import AsyncCachedBackend, CachedBackend, PipelineCache
+from kedro_graphql.celeryapp import celery_app, on_worker_init
+from kedro_graphql.models import State
+
+
+@pytest.fixture
+def cached_backend(mock_app):
+    backend = CachedBackend(mock_app.backend, PipelineCache(maxsize=2, ttl=60))
+    yield backend
+    backend.cache.stop()
+
+
+def test_cached_backend_read(cached_backend, mock_pipeline_no_task):
+    p = cached_backend.create(mock_pipeline_no_task)
+    assert cached_backend.read(id=p.id).name == "example00"
+    cached = cached_backend.read(id=p.id)
+    assert cached.name == "example00"
+    assert cached_backend.cache_stats() == {"hits": 1, "misses": 1, "invalidations": 0, "size": 1}
+
+    # callers get a copy they can modify
+    cached.name = "example01"
+    assert cached_backend.read(id=p.id).name == "example00"
+
+    # a projected read is served by the cached pipeline, a $slice is not
+    assert cached_backend.read(id=p.id, projection={"name": 1}).id == p.id
+    assert cached_backend.cache.hits == 3
+    cached_backend.read(id=p.id, projection={"status": {"$slice": -1}})
+    assert cached_backend.cache.hits == 3
+
+
+def test_cached_backend_projection_hits(cached_backend, mock_pipeline_no_task):
+    ids = [p.id for p in cached_backend.create_many([mock_pipeline_no_task] * 2)]
+    # resolvers read with a projection, a miss caches the whole pipeline
+    projection = {"name": 1, "tags": 1, "status.state": 1}
+    assert cached_backend.read(id=ids[0], projection=projection).name == "example00"
+    assert cached_backend.read(id=ids[0], projection={"status.state": 1}).status
+    assert cached_backend.read_many(ids, projection=projection)[1].id == ids[1]
+    assert cached_backend.read_many(ids, projection={"name": 1})[1].id == ids[1]
+    assert cached_backend.cache_stats() == {"hits": 4, "misses": 2, "invalidations": 0, "size": 2}
+
+
+def test_cached_backend_invalidate(cached_backend, mock_pipeline_no_task):
+    p = cached_backend.create(mock_pipeline_no_task)
+    cached_backend.read(id=p.id)
+    cached_backend.update_status(id=p.id, fields={"task_id": "cache00", "state": State.STARTED})
+    assert cached_backend.cache.stats()["size"] == 0
+
+    p = cached_backend.read(id=p.id)
+    assert p.status[-1].state == State.STARTED
+    assert cached_backend.read(task_id="cache00").id == p.id
+    assert cached_backend.cache.hits == 1
+
+
+def test_cached_backend_many(cached_backend, mock_pipeline_no_task):
+    ids = [p.id for p in cached_backend.create_many([mock_pipeline_no_task] * 2)]
+    cached_backend.read(id=ids[1])
+    assert [p.id for p in cached_backend.read_many(ids)] == ids
+    assert cached_backend.cache.hits == 1
+    assert [p.id for p in cached_backend.read_many(ids)] == ids
+    assert cached_backend.cache.hits == 3
+
+    cached_backend.delete_many(ids)
+    assert cached_backend.read_many(ids) == [None, None]
+
+
+def test_cached_backend_lineage(mocker, cached_backend, mock_pipeline_no_task):
+    lineage = mocker.spy(cached_backend.backend, "lineage")
+    parent = cached_backend.create(mock_pipeline_no_task)
+    mock_pipeline_no_task.parent = str(parent.id)
+    child = cached_backend.create(mock_pipeline_no_task)
+    assert [e.pipeline.id for e in cached_backend.lineage(id=child.id)] == [parent.id]
+    # the backend's single query is used, not the default level by level walk
+    assert lineage.call_count == 1
+
+
+def test_cached_backend_lru_ttl(mock_app, cached_backend, mock_pipeline_no_task):
+    ids = [cached_backend.create(mock_pipeline_no_task).id for _ in range(3)]
+    for id in ids:
+        cached_backend.read(id=id)
+    assert cached_backend.cache.stats()["size"] == 2
+    assert cached_backend.cache.get(id=ids[0]) is None
+
+    backend = CachedBackend(mock_app.backend, PipelineCache(ttl=0))
+    backend.read(id=ids[0])
+    backend.read(id=ids[0])
+    assert backend.cache.stats()["hits"] == 0
+
+
+def test_cached_backend_invalidation_channel(mock_app, mock_pipeline_no_task):
+    broker = mock_app.config["KEDRO_GRAPHQL_BROKER"]
+    api = CachedBackend(mock_app.backend, PipelineCache(broker_url=broker))
+    worker = CachedBackend(mock_app.backend, PipelineCache(broker_url=broker))
+    api.cache.start()
+    try:
+        p = api.create(mock_pipeline_no_task)
+        api.read(id=p.id)
+        worker.update_status(id=p.id, fields={"state": State.SUCCESS})
+        for _ in range(50):
+            if api.cache.stats()["size"] == 0:
+                break
+            time.sleep(0.1)
+        assert api.read(id=p.id).status[-1].state == State.SUCCESS
+    finally:
+        api.cache.stop()
+        worker.cache.stop()
+
+
+def test_cached_backend_worker_init(mock_app):
+    broker = mock_app.config["KEDRO_GRAPHQL_BROKER"]
+    backend = CachedBackend(mock_app.backend, PipelineCache(broker_url=broker))
+    app = celery_app(mock_app.config, backend)
+    try:
+        # a worker, or a forked child of one, subscribes to the invalidations
+        on_worker_init(sender=SimpleNamespace(app=app))
+        assert backend.cache._listener_pid == os.getpid()
+        backend.cache._listener_pid = -1
+        on_worker_init()
+        assert backend.cache._listener_pid == os.getpid()
+    finally:
+        backend.cache.stop()
+
+
+@pytest.mark.asyncio
+async def test_cached_backend_init(mock_app, mock_pipeline_no_task):
+    config = {**mock_app.config, "KEDRO_GRAPHQL_BACKEND_CACHE": '{"maxsize": 10}'}
+    backend = init_backend(config)
+    async_backend = init_async_backend(config, backend)
+    assert isinstance(backend, CachedBackend)
+    assert isinstance(async_backend, AsyncCachedBackend)
+    assert async_backend.cache is backend.cache
+
+    p = backend.create(mock_pipeline_no_task)
+    assert (await async_backend.read(id=p.id)).id == p.id
+    assert backend.read(id=p.id).id == p.id
+    assert backend.cache_stats()["hits"] == 1
+    backend.cache.stop()
+
+
+@pytest.mark.asyncio
+async def test_async_cached_backend_invalidate(mock_app, mock_pipeline_no_task):
+    async_backend = AsyncCachedBackend(AsyncBackendAdapter(mock_app.backend), PipelineCache(maxsize=2, ttl=60))
+    p = await async_backend.create(mock_pipeline_no_task)
+    await async_backend.read(id=p.id)
+    p.name = "example01"
+    await async_backend.replace(p)
+    assert (await async_backend.read(id=p.id)).name == "example01"
+
+    await async_backend.archive(older_than_days=0)
+    assert async_backend.cache.stats()["size"] == 0
@@ -0,0 +1,106 @@
+import uuid
+from datetime import datetime
+
+import pytest
+
+from kedro_graphql.backends.base import PipelineConflictError
+from kedro_graphql.backends.redis import RedisBackend
+from kedro_graphql.models import PipelineFilterInput, PipelineStatus, State, TagInput
+
+
+@pytest.fixture
+def redis_backend(mock_app):
+    backend = RedisBackend(uri=mock_app.config["KEDRO_GRAPHQL_BROKER"], prefix=f"test:{uuid.uuid4().hex}:",
+                           write_through=mock_app.backend)
+    yield backend
+    backend.client.delete(*backend.client.keys(backend.prefix + "*") or ["none"])
+    backend.client.close()
+
+
+def test_redis_backend_create(redis_backend, mock_app, mock_pipeline_no_task):
+    p = redis_backend.create(mock_pipeline_no_task)
+    r = redis_backend.read(id=p.id)
+    assert r.name == "example00"
+    assert r.version == 0
+    assert r.status[-1].state == State.READY
+    assert [t.key for t in r.tags] == ["author", "package"]
+    assert redis_backend.read(id=p.id, projection={"name": 1}).tags is None
+    # written through to the durable backend with the same id
+    assert str(mock_app.backend.read(id=p.id).id) == p.id
+    assert [r.id if r else None for r in redis_backend.read_many(["missing", p.id])] == [None, p.id]
+
+
+def test_redis_backend_status(redis_backend, mock_app, mock_pipeline_no_task):
+    p = redis_backend.create(mock_pipeline_no_task)
+    stale = redis_backend.read(id=p.id)
+    redis_backend.update_status(id=p.id, fields={"task_id": "task00", "state": State.STARTED})
+    assert redis_backend.read(task_id="task00").status[-1].state == State.STARTED
+    assert redis_backend.count(filter=PipelineFilterInput(state=State.STARTED)) == 1
+    assert redis_backend.count(filter=PipelineFilterInput(state=State.READY)) == 0
+
+    p = redis_backend.append_status(id=p.id, status=PipelineStatus(state=State.SUCCESS, session=None),
+                                    return_pipeline=True)
+    assert p.version == 2
+    assert [s.state for s in p.status] == [State.STARTED, State.SUCCESS]
+    assert mock_app.backend.read(id=p.id).version == 2
+    with pytest.raises(PipelineConflictError):
+        redis_backend.update(stale)
+    with pytest.raises(ValueError):
+        redis_backend.update_status(id=p.id, fields={"state": State.FAILURE}, index=-3)
+    assert redis_backend.read(id=p.id).version == 2
+
+
+def test_redis_backend_list(redis_backend, mock_pipeline_no_task):
+    created_at = datetime(2021, 1, 1)
+    expected = []
+    for i in range(7):
+        mock_pipeline_no_task.name = "example00" if i % 2 else "example01"
+        mock_pipeline_no_task.created_at = created_at.replace(day=1 + i // 2)
+        expected.append(redis_backend.create(mock_pipeline_no_task).id)
+
+    for sort in ["", "[('created_at', -1)]", "[('created_at', 1)]"]:
+        seen = []
+        cursor = None
+        while True:
+            page = redis_backend.list(cursor=cursor, limit=3, sort=sort)
+            seen.extend(p.id for p in page)
+            if len(page) < 3:
+                break
+            cursor = {"created_at": page[-1].created_at.isoformat(), "_id": page[-1].id}
+        assert sorted(seen) == sorted(expected)
+    assert seen == sorted(expected, key=lambda id: (redis_backend.read(id=id).created_at, id))
+
+    listed = redis_backend.list(filter=PipelineFilterInput(name="example00"), sort="[('created_at', -1)]")
+    assert [p.id for p in listed] == [expected[5], expected[3], expected[1]]
+    where = PipelineFilterInput(tags=[TagInput(key="author", value="opensean")],
+                                created_after=datetime(2021, 1, 2), created_before=datetime(2021, 1, 4))
+    assert [p.id for p in redis_backend.list(filter=where)] == expected[2:6]
+    assert redis_backend.count(filter='{"name": "example01"}') == 4
+    with pytest.raises(ValueError):
+        redis_backend.list(sort="[('name', 1)]")
+
+
+def test_redis_backend_list_children(redis_backend, mock_pipeline_no_task):
+    parent = redis_backend.create(mock_pipeline_no_task).id
+    mock_pipeline_no_task.parent = parent
+    children = sorted(redis_backend.create(mock_pipeline_no_task).id for _ in range(3))
+
+    listed = redis_backend.list_children([parent, children[0]], limit=2, projection={"name": 1})
+    assert [[c.id for c in group] for group in listed] == [children[:2], []]
+
+
+def test_redis_backend_archive(redis_backend, mock_app, mock_pipeline_no_task):
+    mock_pipeline_no_task.created_at = datetime(2020, 1, 1)
+    mock_pipeline_no_task.status[-1].state = State.SUCCESS
+    p = redis_backend.create(mock_pipeline_no_task)
+    mock_pipeline_no_task.status[-1].state = State.STARTED
+    running = redis_backend.create(mock_pipeline_no_task)
+
+    assert redis_backend.archive(older_than_days=365) == 1
+    assert redis_backend.read(id=p.id) is None
+    assert str(redis_backend.read(id=p.id, archived=True).id) == p.id
+    assert [r.id for r in redis_backend.list()] == [running.id]
+
+    redis_backend.delete(id=running.id)
+    assert redis_backend.read(id=running.id) is None
+    assert mock_app.backend.read(id=running.id) is None
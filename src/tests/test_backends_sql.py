@@ -0,0 +1,180 @@
+from datetime import datetime
+
+import pytest
+
+from kedro_graphql.backends import init_async_backend, init_backend
+from kedro_graphql.backends.base import AsyncBackendAdapter, PipelineConflictError
+from kedro_graphql.models import Node, PipelineFilterInput, PipelineStatus, State, TagInput
+
+pytest.importorskip("sqlalchemy")
+
+from kedro_graphql.backends.sql import SQLBackend  # noqa: E402
+
+
+@pytest.fixture
+def sql_backend(tmp_path):
+    backend = SQLBackend(uri=f"sqlite:///{tmp_path / 'pipelines.db'}")
+    backend.startup()
+    yield backend
+    backend.shutdown()
+
+
+def test_sql_backend_create(sql_backend, mock_pipeline_no_task):
+    mock_pipeline_no_task.describe = "example description"
+    mock_pipeline_no_task.nodes = [Node(name="n0", inputs=["text_in"], outputs=["text_out"], tags=[])]
+    p = sql_backend.create(mock_pipeline_no_task)
+    assert p.id is not None
+    assert p.version == 0
+
+    r = sql_backend.read(id=p.id)
+    assert r.name == "example00"
+    assert r.status[-1].state == State.READY
+    assert [t.key for t in r.tags] == ["author", "package"]
+    assert r.describe == "example description"
+    assert r.nodes[0].name == "n0"
+    assert sql_backend.read(id=p.id, projection={"name": 1}).describe is None
+
+
+def test_sql_backend_wal(sql_backend):
+    with sql_backend.engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+
+
+def test_sql_backend_update_version(sql_backend, mock_pipeline_no_task):
+    p = sql_backend.create(mock_pipeline_no_task)
+    stale = sql_backend.read(id=p.id)
+    p.name = "example01"
+    p = sql_backend.update(p)
+    assert p.version == 1
+    assert p.name == "example01"
+    with pytest.raises(PipelineConflictError):
+        sql_backend.update(stale)
+
+
+def test_sql_backend_status(sql_backend, mock_pipeline_no_task):
+    p = sql_backend.create(mock_pipeline_no_task)
+    sql_backend.update_status(id=p.id, fields={"task_id": "task00", "state": State.STARTED})
+    p = sql_backend.read(task_id="task00")
+    assert p.status[-1].state == State.STARTED
+    assert p.version == 1
+
+    p = sql_backend.append_status(id=p.id, status=PipelineStatus(state=State.SUCCESS, session=None, task_id="task01"),
+                                  return_pipeline=True)
+    assert [s.state for s in p.status] == [State.STARTED, State.SUCCESS]
+    assert sql_backend.read(task_id="task01").id == p.id
+    with pytest.raises(PipelineConflictError):
+        sql_backend.update_status(id=p.id, fields={"state": State.FAILURE}, index=0, version=0)
+    assert sql_backend.list(filter=PipelineFilterInput(state=State.SUCCESS))[0].id == p.id
+    assert sql_backend.list(projection={"status": {"$slice": -1}})[0].status[0].state == State.SUCCESS
+
+    # an index without a status raises and does not bump the version
+    for index in (2, -3):
+        with pytest.raises(ValueError):
+            sql_backend.update_status(id=p.id, fields={"state": State.FAILURE}, index=index)
+    assert sql_backend.read(id=p.id).version == 2
+
+
+def test_sql_backend_list(sql_backend, mock_pipeline_no_task):
+    created_at = datetime(2021, 1, 1)
+    expected = []
+    for i in range(7):
+        mock_pipeline_no_task.name = "example00" if i % 2 else "example01"
+        mock_pipeline_no_task.parent = "parent00" if i < 3 else None
+        mock_pipeline_no_task.created_at = created_at.replace(day=1 + i // 2)
+        expected.append(sql_backend.create(mock_pipeline_no_task).id)
+
+    sort = "[('name', 1), ('created_at', -1)]"
+    seen = []
+    cursor = None
+    while True:
+        page = sql_backend.list(cursor=cursor, limit=3, sort=sort)
+        seen.extend(p.id for p in page)
+        if len(page) < 3:
+            break
+        cursor = {"name": page[-1].name, "created_at": page[-1].created_at.isoformat(), "_id": page[-1].id}
+    assert sorted(seen) == sorted(expected)
+    assert seen == [p.id for p in sql_backend.list(limit=10, sort=sort)]
+
+    assert sql_backend.count(filter=PipelineFilterInput(parent="parent00")) == 3
+    assert sql_backend.count(filter='{"name": "example00"}') == 3
+    assert sql_backend.count(filter=PipelineFilterInput(tags=[TagInput(key="author", value="opensean")])) == 7
+    assert sql_backend.count(filter=PipelineFilterInput(created_before=datetime(2021, 1, 2))) == 2
+    with pytest.raises(ValueError):
+        sql_backend.list(filter='{"tags.key": "author"}')
+    with pytest.raises(ValueError):
+        sql_backend.list(sort="[('status.state', 1)]")
+
+
+def test_sql_backend_archive(sql_backend, mock_pipeline_no_task):
+    mock_pipeline_no_task.created_at = datetime(2020, 1, 1)
+    mock_pipeline_no_task.status[-1].state = State.SUCCESS
+    p = sql_backend.create(mock_pipeline_no_task)
+    mock_pipeline_no_task.status[-1].state = State.STARTED
+    running = sql_backend.create(mock_pipeline_no_task)
+
+    assert sql_backend.archive(older_than_days=365) == 1
+    assert sql_backend.read(id=p.id) is None
+    assert sql_backend.read(id=p.id, archived=True).id == p.id
+    assert [r.id for r in sql_backend.list()] == [running.id]
+    assert sql_backend.count(archived=True) == 2
+    assert sql_backend.archive(older_than_days=365) == 0
+
+
+def test_sql_backend_delete(sql_backend, mock_pipeline_no_task):
+    p = sql_backend.create(mock_pipeline_no_task)
+    sql_backend.delete(id=p.id)
+    assert sql_backend.read(id=p.id) is None
+    assert sql_backend.count() == 0
+
+
+def test_sql_backend_many(sql_backend, mock_pipeline_no_task):
+    ids = [p.id for p in sql_backend.create_many([mock_pipeline_no_task] * 3)]
+    read = sql_backend.read_many([ids[2], "missing", ids[0]])
+    assert [p.id if p else None for p in read] == [ids[2], None, ids[0]]
+    assert read[0].tags[0].key == "author"
+    sql_backend.delete_many(ids[:2])
+    assert [p.id if p else None for p in sql_backend.read_many(ids)] == [None, None, ids[2]]
+    assert sql_backend.count() == 1
+
+
+def test_sql_backend_lineage(sql_backend, mock_pipeline_no_task):
+    ids = {}
+    for name, parent in [("root", None), ("a", "root"), ("b", "root"), ("a1", "a"), ("a11", "a1")]:
+        mock_pipeline_no_task.parent = ids.get(parent)
+        ids[name] = sql_backend.create(mock_pipeline_no_task).id
+
+    lineage = sql_backend.lineage(id=ids["a11"])
+    assert [(e.depth, e.pipeline.id) for e in lineage] == [(1, ids["a1"]), (2, ids["a"]), (3, ids["root"])]
+    lineage = sql_backend.lineage(id=ids["root"], direction="descendants", max_depth=2)
+    assert [(e.depth, e.pipeline.id) for e in lineage] == [(1, min(ids["a"], ids["b"])), (1, max(ids["a"], ids["b"])),
+                                                           (2, ids["a1"])]
+    assert lineage[0].pipeline.status[-1].state == State.READY
+
+    children = sql_backend.list_children([ids["root"], ids["a11"], ids["a"]], limit=1)
+    assert [[c.id for c in group] for group in children] == [[min(ids["a"], ids["b"])], [], [ids["a1"]]]
+
+
+@pytest.mark.asyncio
+async def test_sql_backend_init(tmp_path, mock_pipeline_no_task):
+    config = {"KEDRO_GRAPHQL_BACKEND": "kedro_graphql.backends.sql.SQLBackend",
+              "MONGO_URI": "mongodb://localhost:27017/",
+              "MONGO_DB_NAME": "pipelines",
+              "KEDRO_GRAPHQL_BACKEND_KWARGS": f'{{"uri": "sqlite:///{tmp_path / "init.db"}"}}'}
+    backend = AsyncBackendAdapter(backend=init_backend(config))
+    await backend.startup()
+    p = await backend.create(mock_pipeline_no_task)
+    assert (await backend.read(id=p.id)).name == "example00"
+    await backend.shutdown()
+
+
+def test_sql_backend_init_async(tmp_path):
+    config = {"KEDRO_GRAPHQL_BACKEND": "kedro_graphql.backends.sql.SQLBackend",
+              "KEDRO_GRAPHQL_ASYNC_BACKEND": None,
+              "MONGO_URI": "mongodb://localhost:27017/",
+              "MONGO_DB_NAME": "pipelines",
+              "KEDRO_GRAPHQL_BACKEND_KWARGS": f'{{"uri": "sqlite:///{tmp_path / "init.db"}"}}'}
+    backend = init_backend(config)
+    async_backend = init_async_backend(config, backend)
+    assert isinstance(async_backend, AsyncBackendAdapter)
+    assert isinstance(async_backend.backend, SQLBackend)
+    assert async_backend.backend is backend
@@ -1,8 +1,11 @@
+import asyncio
+import time
+
 import pytest
 from celery.result import AsyncResult
 from celery.states import ALL_STATES
 
-from kedro_graphql.events import PipelineEventMonitor
+from kedro_graphql.events import PipelineChangePublisher, PipelineChangeWatcher, PipelineEventMonitor
 
 
 @pytest.mark.usefixtures('mock_celery_session_app')
@@ -60,3 +63,46 @@ class TestPipelineEventMonitor:
         async for e in PipelineEventMonitor(app=mock_celery_session_app, task_id=mock_pipeline.status[-1].task_id).start():
             print(e)
             assert e["status"] in ALL_STATES
+
+
+class TestPipelineChangeWatcher:
+
+    @pytest.mark.asyncio
+    async def test_watch(self, mock_app):
+        """
+        Requires Redis to run.
+        """
+        watcher = PipelineChangeWatcher(broker_url=mock_app.config["KEDRO_GRAPHQL_BROKER"], fallback_interval=10)
+        publisher = PipelineChangePublisher(broker_url=mock_app.config["KEDRO_GRAPHQL_BROKER"])
+        try:
+            async with watcher.watch("abc") as first, watcher.watch("abc") as second, watcher.watch("def") as other:
+                await asyncio.sleep(0.5)  # let the listener subscribe
+                publisher.publish("abc", ["task_id"])
+                start = time.time()
+                await asyncio.gather(first.wait(), second.wait())
+                assert time.time() - start < 5
+                assert not other.is_set()
+            assert watcher._waiters == {}
+        finally:
+            publisher.close()
+            await watcher.close()
+
+    @pytest.mark.asyncio
+    async def test_watch_on_change(self, mock_app):
+        """
+        Requires Redis to run.
+        """
+        changed_ids = []
+        watcher = PipelineChangeWatcher(broker_url=mock_app.config["KEDRO_GRAPHQL_BROKER"], fallback_interval=10,
+                                        on_change=changed_ids.append)
+        publisher = PipelineChangePublisher(broker_url=mock_app.config["KEDRO_GRAPHQL_BROKER"])
+        try:
+            async with watcher.watch("abc") as changed:
+                await asyncio.sleep(0.5)  # let the listener subscribe
+                publisher.publish("abc", ["task_id"])
+                await changed.wait()
+                # the callback runs before the waiters are woken up
+                assert changed_ids == ["abc"]
+        finally:
+            publisher.close()
+            await watcher.close()
@@ -1,9 +1,22 @@
 import json
+from datetime import datetime
 
 import pytest
+from fastapi.encoders import jsonable_encoder
 from omegaconf import OmegaConf
 
-from kedro_graphql.models import DataSet, Parameter
+from kedro_graphql.models import (
+    DataSet,
+    LazyPipeline,
+    Node,
+    Parameter,
+    ParameterType,
+    Pipeline,
+    PipelineTemplates,
+    State,
+    Tag,
+)
+from kedro_graphql.utils import parse_s3_filepath
 
 
 class TestDataSet:
@@ -63,6 +76,45 @@ class TestDataSet:
         d = DataSet(**params)
         assert d.exists() == False
 
+    def test_parsed_config(self, mocker):
+        d = DataSet(name="text_in", config='{"type": "text.TextDataset", "filepath": "s3://bucket/text_in.txt"}')
+        loads = mocker.spy(json, "loads")
+        assert d.serialize() == {"text_in": {"type": "text.TextDataset", "filepath": "s3://bucket/text_in.txt"}}
+        assert d.parsed_config() == d.serialize()["text_in"]
+        assert parse_s3_filepath(d.parsed_config()) == ("bucket", "text_in.txt")
+        assert loads.call_count == 1
+
+        # replacing the config parses the new one
+        d.config = '{"type": "text.TextDataset", "filepath": "/tmp/text_in.txt"}'
+        assert d.parsed_config()["filepath"] == "/tmp/text_in.txt"
+        assert loads.call_count == 2
+
+    def test_from_config(self, mocker):
+        config = {"type": "text.TextDataset", "filepath": "/tmp/text_in.txt"}
+        d = DataSet.from_config("text_in", config)
+        assert json.loads(d.config) == config
+        loads = mocker.spy(json, "loads")
+        assert d.serialize() == {"text_in": config}
+        assert loads.call_count == 0
+        assert d == DataSet(name="text_in", config=d.config)
+
+        # the caller's dict is copied
+        config["filepath"] = "/tmp/text_out.txt"
+        assert d.parsed_config()["filepath"] == "/tmp/text_in.txt"
+
+    def test_parsed_config_read_only(self):
+        d = DataSet.from_config("text_in", {"type": "text.TextDataset", "filepath": "/tmp/text_in.txt",
+                                            "load_args": {"encoding": "utf-8"}})
+        with pytest.raises(TypeError):
+            d.parsed_config()["filepath"] = "/tmp/text_out.txt"
+        # each serialize returns a copy, modifying it does not change later calls
+        serial = d.serialize()
+        serial["text_in"]["filepath"] = "/tmp/text_out.txt"
+        serial["text_in"]["load_args"]["encoding"] = "latin-1"
+        assert d.serialize()["text_in"] == {"type": "text.TextDataset", "filepath": "/tmp/text_in.txt",
+                                            "load_args": {"encoding": "utf-8"}}
+        assert json.loads(d.config) == d.serialize()["text_in"]
+
 
 class TestParameter:
 
@@ -267,3 +319,93 @@ class TestParameter:
                 'step_size': 123123
             }
         }
+
+
+class TestPipeline:
+
+    def test_encode_decode(self, mock_pipeline_no_task):
+        mock_pipeline_no_task.id = "65f0c7b1d1e4b5a3c2a1b0c9"
+        mock_pipeline_no_task.nodes = [Node(name="n", inputs=["text_in"], outputs=["text_out"], tags=[])]
+        mock_pipeline_no_task.parameters.append(Parameter(name="duration", value="1.5", type=ParameterType.FLOAT))
+        mock_pipeline_no_task.status[-1].finished_at = datetime(2025, 3, 1, 12, 30)
+        encoded = mock_pipeline_no_task.encode()
+
+        # the same document as the generic encoder, without the resolver fields of DataSet
+        legacy = jsonable_encoder(mock_pipeline_no_task, exclude={"parent_pipeline", "children"})
+        for d in legacy["data_catalog"]:
+            for field in ("exists", "pre_signed_url_create", "pre_signed_url_read"):
+                d.pop(field)
+        assert encoded == legacy
+        assert encoded["status"][-1]["state"] == "READY"
+        assert encoded["status"][-1]["finished_at"] == "2025-03-01T12:30:00"
+        assert encoded["parameters"][-1]["type"] == "float"
+
+        decoded = Pipeline.decode_dict(encoded)
+        assert decoded == mock_pipeline_no_task
+        assert decoded.encode() == encoded
+
+    def test_decode_partial(self):
+        p = Pipeline.decode_dict({"name": "example00", "status": [{"state": "STARTED"}]})
+        assert p.status[-1].state == State.STARTED
+        assert p.status[-1].started_at is None
+        assert p.created_at is None
+
+
+class TestLazyPipeline:
+
+    def test_lazy_decode(self, mock_pipeline_no_task):
+        mock_pipeline_no_task.id = "65f0c7b1d1e4b5a3c2a1b0c9"
+        p = LazyPipeline(mock_pipeline_no_task.encode())
+        assert p.name == "example00"
+        assert "status" not in p.__dict__ and "data_catalog" not in p.__dict__
+
+        assert p.status[-1].state == State.READY
+        assert p.status is p.status
+        assert "data_catalog" not in p.__dict__
+
+        p.tags = [Tag(key="author", value="someone")]
+        assert p.tags[0].value == "someone"
+        assert p != mock_pipeline_no_task
+        p.tags = mock_pipeline_no_task.tags
+        assert p == mock_pipeline_no_task
+        assert mock_pipeline_no_task == p
+        assert p.encode() == mock_pipeline_no_task.encode()
+
+
+class TestPipelineTemplates:
+
+    def test_metadata_precomputed(self, mocker, mock_app):
+        index = PipelineTemplates._build_pipeline_index(mock_app.kedro_pipelines, mock_app.kedro_catalog,
+                                                        mock_app.kedro_parameters)
+        template = next(t for t in index if t.name == "example00")
+        assert template.metadata is not None
+
+        describe = mocker.spy(mock_app.kedro_pipelines["example00"], "describe")
+        assert template.describe() == mock_app.kedro_pipelines["example00"].describe()
+        assert describe.call_count == 1
+        assert template.parameters() is template.parameters()
+        assert "example" in [p.name for p in template.parameters()]
+        assert "text_in" in [d.name for d in template.inputs()]
+        # the same values, in the same order, as computed from the kedro pipeline
+        kedro_pipeline = mock_app.kedro_pipelines["example00"]
+        assert [d.name for d in template.outputs()] == list(kedro_pipeline.all_outputs())
+        assert [n.tags for n in template.nodes()] == [list(n.tags) for n in kedro_pipeline.nodes]
+
+    def test_metadata_errors(self, mock_app):
+        index = PipelineTemplates._build_pipeline_index(mock_app.kedro_pipelines, {}, {})
+        template = next(t for t in index if t.name == "example00")
+        assert template.describe() == mock_app.kedro_pipelines["example00"].describe()
+        # a dataset or a parameter missing from the project raises when resolved
+        with pytest.raises(KeyError):
+            template.inputs()
+        with pytest.raises(KeyError):
+            template.parameters()
+
+    def test_index_refresh(self, monkeypatch, mock_app):
+        index = mock_app.kedro_pipelines_index
+        monkeypatch.setattr(mock_app, "kedro_pipelines", {"example00": mock_app.kedro_pipelines["example00"]})
+        assert mock_app.kedro_pipelines_index is index
+        mock_app.refresh_pipelines_index()
+        assert [t.name for t in mock_app.kedro_pipelines_index] == ["example00"]
+        monkeypatch.undo()
+        mock_app.refresh_pipelines_index()
@@ -3,6 +3,8 @@ import time
 
 import pytest
 
+from kedro_graphql.models import PipelineTemplateIndex, State
+
 IN_DEV = True
 
 
@@ -241,6 +243,24 @@ class TestSchemaMutations:
         assert create_pipeline_resp.errors is None
         assert pipeline_state == "STAGED"
 
+        read_pipeline_resp = await mock_app.schema.execute("""
+            query TestQuery($id: String!) {
+              readPipeline(id: $id) {
+                describe
+                nodes {
+                  name
+                  inputs
+                  outputs
+                }
+              }
+            }
+            """, variable_values={"id": create_pipeline_resp.data["createPipeline"]["id"]})
+        assert read_pipeline_resp.errors is None
+        assert read_pipeline_resp.data["readPipeline"]["describe"] == create_pipeline_resp.data["createPipeline"]["describe"]
+        assert [n["name"] for n in read_pipeline_resp.data["readPipeline"]["nodes"]] == \
+            [n["name"] for n in create_pipeline_resp.data["createPipeline"]["nodes"]]
+        assert len(read_pipeline_resp.data["readPipeline"]["nodes"]) > 0
+
     @pytest.mark.usefixtures('mock_celery_session_app')
     @pytest.mark.usefixtures('celery_session_worker')
     @pytest.mark.usefixtures('depends_on_current_app')
@@ -324,6 +344,34 @@ class TestSchemaMutations:
         assert update_pipeline_resp.data["updatePipeline"]["tags"][0] == {"key": "author", "value": "opensean"}
         assert update_pipeline_resp.data["updatePipeline"]["tags"][1] == {"key": "package", "value": "kedro-graphql"}
 
+    @pytest.mark.usefixtures('mock_celery_session_app')
+    @pytest.mark.usefixtures('celery_session_worker')
+    @pytest.mark.usefixtures('depends_on_current_app')
+    @pytest.mark.asyncio
+    async def test_update_pipeline_stale_version(self, mock_app, mock_info_context):
+
+        create_pipeline_resp = await mock_app.schema.execute(self.create_pipeline_mutation,
+                                                             variable_values={"pipeline": {
+                                                                 "name": "example00",
+                                                                 "state": "STAGED",
+                                                             }})
+
+        pipeline_id = create_pipeline_resp.data["createPipeline"]["id"]
+        pipeline = {"name": "example00",
+                    "tags": [{"key": "author", "value": "opensean"}],
+                    "state": "STAGED",
+                    "version": 0}
+
+        update_pipeline_resp = await mock_app.schema.execute(self.update_pipeline_mutation,
+                                                             variable_values={"id": pipeline_id, "pipeline": pipeline})
+        assert update_pipeline_resp.errors is None
+
+        # a second update based on the same version must not overwrite the first one
+        update_pipeline_resp = await mock_app.schema.execute(self.update_pipeline_mutation,
+                                                             variable_values={"id": pipeline_id, "pipeline": pipeline})
+        assert update_pipeline_resp.errors is not None
+        assert "was modified since version 0" in update_pipeline_resp.errors[0].message
+
     @pytest.mark.usefixtures('mock_celery_session_app')
     @pytest.mark.usefixtures('celery_session_worker')
     @pytest.mark.usefixtures('depends_on_current_app')
@@ -348,6 +396,134 @@ class TestSchemaMutations:
 
         assert delete_pipeline_resp.errors is None
 
+    @pytest.mark.usefixtures('mock_celery_session_app')
+    @pytest.mark.usefixtures('celery_session_worker')
+    @pytest.mark.usefixtures('depends_on_current_app')
+    @pytest.mark.asyncio
+    async def test_create_delete_pipelines(self, mock_app, mock_info_context, mock_text_in, mock_text_out):
+
+        pipeline = {"name": "example00",
+                    "dataCatalog": [{"name": "text_in", "config": json.dumps({"type": "text.TextDataset", "filepath": str(mock_text_in)})},
+                                    {"name": "text_out", "config": json.dumps({"type": "text.TextDataset", "filepath": str(mock_text_out)})}
+                                    ],
+                    "parameters": [{"name": "example", "value": "hello"},
+                                   {"name": "duration", "value": "0.1", "type": "FLOAT"}],
+                    "state": "STAGED",
+                    "tags": [{"key": "author", "value": "opensean"}]}
+
+        create_pipelines_resp = await mock_app.schema.execute("""
+            mutation TestMutation($pipelines: [PipelineInput!]!) {
+              createPipelines(pipelines: $pipelines) {
+                id
+                status {
+                  state
+                }
+              }
+            }
+            """, variable_values={"pipelines": [pipeline, {**pipeline, "state": "READY"}]})
+
+        assert create_pipelines_resp.errors is None
+        created = create_pipelines_resp.data["createPipelines"]
+        assert [p["status"][0]["state"] for p in created] == ["STAGED", "READY"]
+
+        ids = [p["id"] for p in created]
+        delete_pipelines_resp = await mock_app.schema.execute("""
+            mutation TestMutation($ids: [String!]!) {
+              deletePipelines(ids: $ids) {
+                id
+              }
+            }
+            """, variable_values={"ids": ids + ["0" * 24]})
+
+        assert delete_pipelines_resp.errors is None
+        assert delete_pipelines_resp.data["deletePipelines"] == [{"id": ids[0]}, {"id": ids[1]}, None]
+        assert mock_app.backend.read_many(ids) == [None, None]
+
+    @pytest.mark.usefixtures('mock_celery_session_app')
+    @pytest.mark.usefixtures('celery_session_worker')
+    @pytest.mark.usefixtures('depends_on_current_app')
+    @pytest.mark.asyncio
+    async def test_create_parameter_sweep(self, mock_app, mock_info_context, mock_text_in, mock_text_out):
+
+        sweep_resp = await mock_app.schema.execute("""
+            mutation TestMutation($base: PipelineInput!, $grid: [ParameterGridInput!]!) {
+              createParameterSweep(name: "sweep00", base: $base, grid: $grid, maxConcurrency: 2) {
+                id
+                name
+                total
+                stateCounts
+              }
+            }
+            """, variable_values={"base": {
+                "name": "example00",
+                "dataCatalog": [{"name": "text_in", "config": json.dumps({"type": "text.TextDataset", "filepath": str(mock_text_in)})},
+                                {"name": "text_out", "config": json.dumps({"type": "text.TextDataset", "filepath": str(mock_text_out)})}
+                                ],
+                "parameters": [{"name": "example", "value": "hello"},
+                               {"name": "duration", "value": "0.1", "type": "FLOAT"}]},
+                "grid": [{"name": "example", "values": ["a", "b", "c"]},
+                         {"name": "duration", "values": ["0.1", "0.2"], "type": "FLOAT"}]})
+
+        assert sweep_resp.errors is None
+        sweep = sweep_resp.data["createParameterSweep"]
+        assert sweep["name"] == "sweep00"
+        assert sweep["total"] == 6
+        # the worker may already have started the first children
+        assert sum(sweep["stateCounts"].values()) == 6
+        assert sweep["stateCounts"]["STAGED"] == 4
+        children = mock_app.backend.list(limit=10, filter=f'{{"parent": "{sweep["id"]}"}}', sort="[('_id', 1)]")
+        assert [{p.name: p.value for p in c.parameters} for c in children[:2]] == \
+            [{"example": "a", "duration": "0.1"}, {"example": "a", "duration": "0.2"}]
+
+        # the parent is a handle of the sweep that cannot be run
+        assert mock_app.backend.read(id=sweep["id"]).status[-1].state == State.PENDING
+        run_parent_resp = await mock_app.schema.execute(self.update_pipeline_mutation, variable_values={
+            "id": sweep["id"], "pipeline": {"name": "example00", "state": "READY"}})
+        assert run_parent_resp.errors is not None
+
+        # each finished child starts the next staged one
+        query = """
+            query TestQuery($id: String!) {
+              parameterSweep(id: $id) {
+                finished
+                progress
+              }
+            }
+            """
+        for _ in range(120):
+            progress_resp = await mock_app.schema.execute(query, variable_values={"id": sweep["id"]})
+            assert progress_resp.errors is None
+            if progress_resp.data["parameterSweep"]["finished"] == 6:
+                break
+            time.sleep(0.5)
+        assert progress_resp.data["parameterSweep"]["progress"] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_create_pipelines_invalid_name(self, mock_app, mock_info_context):
+
+        resp = await mock_app.schema.execute("""
+            mutation TestMutation($pipelines: [PipelineInput!]!) {
+              createPipelines(pipelines: $pipelines) {
+                id
+              }
+            }
+            """, variable_values={"pipelines": [{"name": "example00", "state": "STAGED"},
+                                                {"name": "example98", "state": "STAGED"},
+                                                {"name": "example99", "state": "STAGED"}]})
+
+        assert "example98, example99 do not exist" in resp.errors[0].message
+        # inputs are validated before any pipeline is saved
+        assert mock_app.backend.count() == 0
+
+    @pytest.mark.asyncio
+    async def test_create_pipeline_missing_template(self, monkeypatch, mock_app, mock_info_context):
+        # the index, not the pipeline registry, decides which pipelines exist
+        index = PipelineTemplateIndex([t for t in mock_app.kedro_pipelines_index if t.name != "example00"])
+        monkeypatch.setattr(mock_app, "_kedro_pipelines_index", index)
+        resp = await mock_app.schema.execute(self.create_pipeline_mutation,
+                                             variable_values={"pipeline": {"name": "example00", "state": "STAGED"}})
+        assert resp.errors[0].message == "Pipeline example00 does not exist in the project."
+
     @pytest.mark.usefixtures('mock_celery_session_app')
     @pytest.mark.usefixtures('celery_session_worker')
     @pytest.mark.usefixtures('depends_on_current_app')
@@ -1,5 +1,9 @@
+from datetime import datetime, timedelta
+
 import pytest
 
+from kedro_graphql.models import State
+
 
 class TestSchemaQuery:
 
@@ -16,6 +20,106 @@ class TestSchemaQuery:
         resp = await mock_app.schema.execute(query, variable_values={"id": str(mock_pipeline.id)})
         assert resp.errors is None
 
+    @pytest.mark.asyncio
+    async def test_pipelines_by_ids(self, mock_app, mock_info_context, mock_pipeline):
+
+        query = """
+        query TestQuery($ids: [String!]!) {
+          pipelinesByIds(ids: $ids){
+            id
+            name
+          }
+        }
+        """
+        missing = "0" * 24
+        resp = await mock_app.schema.execute(query, variable_values={"ids": [missing, str(mock_pipeline.id)]})
+        assert resp.errors is None
+        assert resp.data["pipelinesByIds"] == [None, {"id": str(mock_pipeline.id), "name": mock_pipeline.name}]
+
+    @pytest.mark.asyncio
+    async def test_pipeline_relations(self, mocker, mock_app, mock_info_context, mock_pipeline_no_task):
+        parent = mock_app.backend.create(mock_pipeline_no_task)
+        mock_pipeline_no_task.parent = str(parent.id)
+        children = mock_app.backend.create_many([mock_pipeline_no_task] * 20)
+        read_many = mocker.spy(mock_app.async_backend, "read_many")
+        list_ = mocker.spy(mock_app.async_backend, "list")
+
+        query = """
+        query TestQuery($limit: Int!, $parent: String!) {
+          readPipelines(limit: $limit, where: {parent: $parent}) {
+            pipelines {
+              id
+              parentPipeline {
+                id
+                name
+              }
+            }
+          }
+        }
+        """
+        resp = await mock_app.schema.execute(query, variable_values={"limit": 50, "parent": str(parent.id)})
+        assert resp.errors is None
+        pipelines = resp.data["readPipelines"]["pipelines"]
+        assert len(pipelines) == 20
+        assert {p["parentPipeline"]["id"] for p in pipelines} == {str(parent.id)}
+        # one list of the children and one read of their parent
+        assert list_.call_count == 1
+        assert read_many.call_count == 1
+
+        query = """
+        query TestQuery($id: String!) {
+          readPipeline(id: $id) {
+            parentPipeline {
+              id
+            }
+            children(limit: 5) {
+              id
+              children {
+                id
+              }
+            }
+          }
+        }
+        """
+        list_children = mocker.spy(mock_app.async_backend, "list_children")
+        resp = await mock_app.schema.execute(query, variable_values={"id": str(parent.id)})
+        assert resp.errors is None
+        assert resp.data["readPipeline"]["parentPipeline"] is None
+        assert [c["id"] for c in resp.data["readPipeline"]["children"]] == [str(c.id) for c in children[:5]]
+        assert resp.data["readPipeline"]["children"][0]["children"] == []
+        # one list of the children of each level, the second one for all 5 children
+        assert list_children.call_count == 2
+        assert len(list_children.call_args.args[0]) == 5
+
+    @pytest.mark.asyncio
+    async def test_pipeline_lineage(self, mock_app, mock_info_context, mock_pipeline_no_task):
+        ids = []
+        for _ in range(3):
+            mock_pipeline_no_task.parent = ids[-1] if ids else None
+            ids.append(str(mock_app.backend.create(mock_pipeline_no_task).id))
+
+        query = """
+        query TestQuery($id: String!, $direction: LineageDirection!, $maxDepth: Int) {
+          pipelineLineage(id: $id, direction: $direction, maxDepth: $maxDepth) {
+            depth
+            pipeline {
+              id
+              parent
+            }
+          }
+        }
+        """
+        resp = await mock_app.schema.execute(query, variable_values={"id": ids[2], "direction": "ANCESTORS"})
+        assert resp.errors is None
+        assert resp.data["pipelineLineage"] == [{"depth": 1, "pipeline": {"id": ids[1], "parent": ids[0]}},
+                                                {"depth": 2, "pipeline": {"id": ids[0], "parent": None}}]
+        resp = await mock_app.schema.execute(query, variable_values={"id": ids[0], "direction": "DESCENDANTS",
+                                                                     "maxDepth": 1})
+        assert [e["pipeline"]["id"] for e in resp.data["pipelineLineage"]] == [ids[1]]
+        resp = await mock_app.schema.execute(query, variable_values={"id": ids[0], "direction": "DESCENDANTS",
+                                                                     "maxDepth": 0})
+        assert resp.errors is not None
+
     @pytest.mark.asyncio
     async def test_pipelines(self, mock_app, mock_info_context, mock_pipeline):
 
@@ -34,6 +138,200 @@ class TestSchemaQuery:
         resp = await mock_app.schema.execute(query, variable_values={"limit": 3, "filter": "{\"tags\": {\"key\": \"author\", \"value\": \"opensean\"}}"})
         assert resp.errors is None
 
+        resp = await mock_app.schema.execute(query, variable_values={"limit": 0, "filter": ""})
+        assert resp.errors is not None
+
+    @pytest.mark.asyncio
+    async def test_pipeline_partial_selection(self, mock_app, mock_info_context, mock_pipeline):
+
+        query = """
+        query TestQuery($id: String!) {
+          readPipeline(id: $id){
+            id
+            ...statusFields
+          }
+        }
+        fragment statusFields on Pipeline {
+          status {
+            state
+          }
+        }
+        """
+        resp = await mock_app.schema.execute(query, variable_values={"id": str(mock_pipeline.id)})
+        assert resp.errors is None
+        assert resp.data["readPipeline"]["id"] == str(mock_pipeline.id)
+        assert resp.data["readPipeline"]["status"][-1]["state"] is not None
+
+    @pytest.mark.asyncio
+    async def test_pipeline_status_blobs(self, mock_app, mock_info_context, mock_pipeline_no_task):
+        p = mock_app.backend.create(mock_pipeline_no_task)
+        mock_app.backend.update_status(id=p.id, fields={"task_einfo": "Traceback" + "." * 4096})
+
+        query = """
+        query TestQuery($id: String!) {
+          readPipeline(id: $id){
+            status {
+              state
+              taskEinfo
+            }
+          }
+        }
+        """
+        resp = await mock_app.schema.execute(query, variable_values={"id": str(p.id)})
+        assert resp.errors is None
+        assert resp.data["readPipeline"]["status"][-1]["taskEinfo"] == "Traceback" + "." * 4096
+
+    @pytest.mark.asyncio
+    async def test_pipelines_status_limit(self, mock_app, mock_info_context, mock_pipeline):
+
+        query = """
+        query TestQuery($limit: Int!) {
+          readPipelines(limit: $limit, statusLimit: 1) {
+            pipelines {
+              id
+              name
+              status {
+                state
+                taskId
+              }
+            }
+          }
+        }
+        """
+        resp = await mock_app.schema.execute(query, variable_values={"limit": 3})
+        assert resp.errors is None
+        assert resp.data["readPipelines"]["pipelines"][0]["name"] == "example00"
+        assert len(resp.data["readPipelines"]["pipelines"][0]["status"]) == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("sort", ["", "[('created_at', -1)]", "[('name', 1), ('created_at', 1)]"])
+    async def test_pipelines_pagination(self, mock_app, mock_info_context, mock_pipeline_no_task, sort):
+        created_at = datetime.now()
+        expected = []
+        for i in range(7):
+            mock_pipeline_no_task.name = "example00" if i % 2 else "example01"
+            # duplicate timestamps must not produce overlapping pages
+            mock_pipeline_no_task.created_at = created_at + timedelta(seconds=i // 2)
+            expected.append(str(mock_app.backend.create(mock_pipeline_no_task).id))
+
+        query = """
+        query TestQuery($limit: Int!, $cursor: String, $sort: String) {
+          readPipelines(limit: $limit, cursor: $cursor, sort: $sort) {
+            pageMeta {
+              nextCursor
+              hasPrevious
+              totalCount
+            }
+            pipelines {
+              id
+            }
+          }
+        }
+        """
+        seen = []
+        cursor = None
+        while True:
+            resp = await mock_app.schema.execute(query, variable_values={"limit": 3, "cursor": cursor, "sort": sort})
+            assert resp.errors is None
+            page = resp.data["readPipelines"]
+            assert page["pageMeta"]["totalCount"] == 7
+            assert page["pageMeta"]["hasPrevious"] == (cursor is not None)
+            seen.extend([p["id"] for p in page["pipelines"]])
+            cursor = page["pageMeta"]["nextCursor"]
+            if cursor is None:
+                break
+
+        assert sorted(seen) == sorted(expected)
+        assert seen == [str(p.id) for p in mock_app.backend.list(limit=10, filter="", sort=sort)]
+
+    @pytest.mark.asyncio
+    async def test_pipeline_archived(self, mock_app, mock_info_context, mock_pipeline_no_task):
+
+        mock_pipeline_no_task.created_at = datetime(2020, 1, 1)
+        mock_pipeline_no_task.status[-1].state = State.SUCCESS
+        p = mock_app.backend.create(mock_pipeline_no_task)
+        mock_app.backend.archive(older_than_days=365)
+
+        query = """
+        query TestQuery($id: String!, $archived: Boolean!) {
+          readPipeline(id: $id, archived: $archived){
+            id
+          }
+        }
+        """
+        resp = await mock_app.schema.execute(query, variable_values={"id": str(p.id), "archived": False})
+        assert resp.errors is not None
+        resp = await mock_app.schema.execute(query, variable_values={"id": str(p.id), "archived": True})
+        assert resp.errors is None
+        assert resp.data["readPipeline"]["id"] == str(p.id)
+
+    @pytest.mark.asyncio
+    async def test_pipelines_where(self, mock_app, mock_info_context, mock_pipeline):
+
+        query = """
+        query TestQuery($limit: Int!, $where: PipelineFilterInput, $filter: String) {
+          readPipelines(limit: $limit, where: $where, filter: $filter) {
+            pageMeta {
+              totalCount
+            }
+            pipelines {
+              id
+            }
+          }
+        }
+        """
+        where = {"name": mock_pipeline.name, "tags": [{"key": "author", "value": "opensean"}]}
+        resp = await mock_app.schema.execute(query, variable_values={"limit": 3, "where": where})
+        assert resp.errors is None
+        assert str(mock_pipeline.id) in [p["id"] for p in resp.data["readPipelines"]["pipelines"]]
+
+        resp = await mock_app.schema.execute(query, variable_values={"limit": 3, "where": where,
+                                                                     "filter": "{\"name\": \"example00\"}"})
+        assert resp.errors is not None
+
+    @pytest.mark.asyncio
+    async def test_explain_pipelines_query(self, mocker, mock_app, mock_info_context):
+
+        mocker.patch.object(mock_app.async_backend.backend.db, "command", return_value={
+            "queryPlanner": {"winningPlan": {"stage": "COLLSCAN"}},
+            "executionStats": {"nReturned": 0, "totalKeysExamined": 0, "totalDocsExamined": 5}})
+        query = """
+        query TestQuery($where: PipelineFilterInput) {
+          explainPipelinesQuery(limit: 3, where: $where) {
+            query
+            indexes
+            docsExamined
+          }
+        }
+        """
+        resp = await mock_app.schema.execute(query, variable_values={"where": {"parent": "p00"}})
+        assert resp.errors is None
+        assert resp.data["explainPipelinesQuery"] == {"query": {"parent": "p00"}, "indexes": [], "docsExamined": 5}
+
+    @pytest.mark.asyncio
+    async def test_pipeline_stats(self, mock_app, mock_info_context, mock_pipeline_no_task):
+
+        mock_pipeline_no_task.name = "stats_query00"
+        mock_app.backend.create(mock_pipeline_no_task)
+        query = """
+        query TestQuery($filter: String!) {
+          pipelineStats(filter: $filter, groupBy: [NAME, STATE]) {
+            group
+            count
+            stateCounts
+            failureRate
+            durationP50
+          }
+        }
+        """
+        resp = await mock_app.schema.execute(query, variable_values={"filter": "{\"name\": \"stats_query00\"}"})
+        assert resp.errors is None
+        assert resp.data["pipelineStats"] == [{"group": {"name": "stats_query00", "state": "READY"},
+                                               "count": 1,
+                                               "stateCounts": {"READY": 1},
+                                               "failureRate": None,
+                                               "durationP50": None}]
+
     @pytest.mark.asyncio
     async def test_pipeline_templates(self, mock_app, mock_info_context):
 
@@ -69,3 +367,50 @@ class TestSchemaQuery:
         resp = await mock_app.schema.execute(query, variable_values={"limit": 5})
 
         assert resp.errors is None
+
+    @pytest.mark.asyncio
+    async def test_pipeline_template(self, mock_app, mock_info_context):
+        template = mock_app.kedro_pipelines_index.get(name="example00")
+        query = """
+        query TestQuery($id: String, $name: String) {
+          pipelineTemplate(id: $id, name: $name) {
+            id
+            name
+          }
+        }
+        """
+        resp = await mock_app.schema.execute(query, variable_values={"name": "example00"})
+        assert resp.errors is None
+        assert resp.data["pipelineTemplate"] == {"id": str(template.id), "name": "example00"}
+        resp = await mock_app.schema.execute(query, variable_values={"id": str(template.id)})
+        assert resp.data["pipelineTemplate"]["name"] == "example00"
+        resp = await mock_app.schema.execute(query, variable_values={"name": "missing"})
+        assert "does not exist" in resp.errors[0].message
+        resp = await mock_app.schema.execute(query, variable_values={})
+        assert resp.errors is not None
+
+    @pytest.mark.asyncio
+    async def test_pipeline_templates_pagination(self, mock_app, mock_info_context):
+        query = """
+        query TestQuery($limit: Int!, $cursor: String) {
+          pipelineTemplates(limit: $limit, cursor: $cursor) {
+            pageMeta {
+              nextCursor
+            }
+            pipelineTemplates {
+              name
+            }
+          }
+        }
+        """
+        names = []
+        cursor = None
+        while True:
+            resp = await mock_app.schema.execute(query, variable_values={"limit": 1, "cursor": cursor})
+            assert resp.errors is None
+            names.extend(t["name"] for t in resp.data["pipelineTemplates"]["pipelineTemplates"])
+            cursor = resp.data["pipelineTemplates"]["pageMeta"]["nextCursor"]
+            if cursor is None:
+                break
+        assert names == [t.name for t in mock_app.kedro_pipelines_index]
+        assert len(names) == len(mock_app.kedro_pipelines) > 1
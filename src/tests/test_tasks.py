@@ -1,4 +1,5 @@
 import json
+import logging
 
 import pytest
 
@@ -51,3 +52,28 @@ async def test_run_pipeline(mock_app, mock_text_in, mock_text_out):
         runner="kedro.runner.SequentialRunner"
     )
     result = result.wait(timeout=None, interval=0.5)
+
+
+def test_before_start_conflict(mocker, mock_app, mock_pipeline_no_task):
+    mocker.patch.object(run_pipeline, "_db", mock_app.backend)
+    # drop the log handlers before_start adds when the test ends
+    kedro_logger = logging.getLogger("kedro")
+    mocker.patch.object(kedro_logger, "handlers", list(kedro_logger.handlers))
+    p = mock_app.backend.create(mock_pipeline_no_task)
+    update = mock_app.backend.update
+
+    def concurrent_update(pipeline):
+        # an updatePipeline mutation writes the pipeline between the read and the update
+        if not concurrent_update.called:
+            concurrent_update.called = True
+            mock_app.backend.update_status(id=p.id, fields={"task_name": "concurrent"})
+        return update(pipeline)
+
+    concurrent_update.called = False
+    mocker.patch.object(mock_app.backend, "update", side_effect=concurrent_update)
+    run_pipeline.before_start("conflict00", [], {"id": str(p.id)})
+
+    p = mock_app.backend.read(id=p.id)
+    assert [d.name for d in p.data_catalog][-2:] == ["gql_meta", "gql_logs"]
+    assert p.status[-1].task_name == "concurrent"
+    assert p.status[-1].task_id == "conflict00"